@@ -87,7 +87,7 @@ def generate_test_audio(duration_sec: float = 3.0, sample_rate: int = 16000) ->
     return audio
 
 
-def benchmark_vad(iterations: int = 10) -> BenchmarkResult:
+def benchmark_vad(iterations: int = 10, warmup: int = 2) -> BenchmarkResult:
     """Benchmark del servicio VAD."""
     from v2m.infrastructure.vad_service import VADService
 
@@ -104,8 +104,8 @@ def benchmark_vad(iterations: int = 10) -> BenchmarkResult:
 
     print(f"  Backend VAD: {vad._backend}")
 
-    # Benchmark
-    for i in range(iterations):
+    # Benchmark (las primeras `warmup` iteraciones se descartan: sesión ONNX en frío)
+    for i in range(warmup + iterations):
         # Reset estados para medición limpia
         if vad._backend == 'onnx':
             vad._reset_onnx_states()
@@ -113,12 +113,13 @@ def benchmark_vad(iterations: int = 10) -> BenchmarkResult:
         start = time.perf_counter()
         _ = vad.process(audio.copy())
         elapsed_ms = (time.perf_counter() - start) * 1000
-        result.times_ms.append(elapsed_ms)
+        if i >= warmup:
+            result.times_ms.append(elapsed_ms)
 
     return result
 
 
-def benchmark_whisper(iterations: int = 5) -> BenchmarkResult:
+def benchmark_whisper(iterations: int = 5, warmup: int = 2) -> BenchmarkResult:
     """Benchmark de transcripción Whisper."""
     from v2m.infrastructure.whisper_transcription_service import WhisperTranscriptionService
     from v2m.infrastructure.vad_service import VADService
@@ -141,8 +142,9 @@ def benchmark_whisper(iterations: int = 5) -> BenchmarkResult:
     load_time = (time.perf_counter() - start_load) * 1000
     print(f"  Modelo cargado en {load_time:.0f}ms")
 
-    # Benchmark (solo inferencia, sin grabación)
-    for i in range(iterations):
+    # Benchmark (solo inferencia, sin grabación). Las primeras `warmup` iteraciones
+    # se descartan: incluyen la inicialización de kernels CUDA y del allocator
+    for i in range(warmup + iterations):
         start = time.perf_counter()
 
         # Simular transcripción directa del audio
@@ -157,7 +159,8 @@ def benchmark_whisper(iterations: int = 5) -> BenchmarkResult:
         text = " ".join([s.text for s in segments])
 
         elapsed_ms = (time.perf_counter() - start) * 1000
-        result.times_ms.append(elapsed_ms)
+        if i >= warmup:
+            result.times_ms.append(elapsed_ms)
 
     return result
 
@@ -181,7 +184,7 @@ def benchmark_audio_buffer(iterations: int = 20) -> BenchmarkResult:
         recorder._recording = True
         test_audio = np.random.randn(total_samples).astype(np.float32) * 0.1
 
-        # Escribir en chunks como haría el callback
+        # Escribir en chunks como haría el hilo de drenado
         for j in range(0, len(test_audio), chunk_size):
             chunk = test_audio[j:j+chunk_size]
             end_pos = recorder._write_pos + len(chunk)
@@ -253,12 +256,14 @@ def main():
     parser = argparse.ArgumentParser(description="Benchmark de latencia v2m")
     parser.add_argument("--iterations", "-n", type=int, default=10,
                         help="Número de iteraciones por benchmark")
+    parser.add_argument("--warmup", type=int, default=2,
+                        help="Iteraciones iniciales descartadas (VAD y Whisper)")
     parser.add_argument("--skip-whisper", action="store_true",
                         help="Omitir benchmark de Whisper (lento)")
     args = parser.parse_args()
 
     print("🚀 Iniciando benchmark de latencia voice2machine")
-    print(f"   Iteraciones: {args.iterations}")
+    print(f"   Iteraciones: {args.iterations} (+{args.warmup} de calentamiento)")
     print()
 
     results = []
@@ -273,12 +278,12 @@ def main():
 
     # 3. VAD
     print("3️⃣  Benchmark: VAD...")
-    results.append(benchmark_vad(iterations=args.iterations))
+    results.append(benchmark_vad(iterations=args.iterations, warmup=args.warmup))
 
     # 4. Whisper
     if not args.skip_whisper:
         print("4️⃣  Benchmark: Whisper Transcription...")
-        results.append(benchmark_whisper(iterations=min(args.iterations, 5)))
+        results.append(benchmark_whisper(iterations=min(args.iterations, 5), warmup=args.warmup))
 
     # Resultados
     print_results(results)
@@ -3,6 +3,7 @@
 from v2m.api.schemas import (
     HealthResponse,
     LLMResponse,
+    MetricsResponse,
     ProcessTextRequest,
     StatusResponse,
     ToggleResponse,
@@ -12,6 +13,7 @@ from v2m.api.schemas import (
 __all__ = [
     "HealthResponse",
     "LLMResponse",
+    "MetricsResponse",
     "ProcessTextRequest",
     "StatusResponse",
     "ToggleResponse",
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import json
 from contextlib import asynccontextmanager
 from typing import Any
 
@@ -41,12 +42,15 @@ class DaemonState:
         if not self._websocket_clients:
             return
 
-        message = {"event": event_type, "data": data}
+        # Serializar una sola vez para todos los clientes (send_json re-serializa por
+        # socket); mismo formato que send_json de Starlette
+        message = json.dumps({"event": event_type, "data": data}, separators=(",", ":"), ensure_ascii=False)
         disconnected: list[WebSocket] = []
 
-        for ws in self._websocket_clients:
+        # Iterar una instantánea: un cliente puede conectarse mientras se espera un send
+        for ws in tuple(self._websocket_clients):
             try:
-                await ws.send_json(message)
+                await ws.send_text(message)
             except Exception:
                 disconnected.append(ws)
 
@@ -60,13 +64,17 @@ state = DaemonState()
 _background_tasks: set[asyncio.Task[None]] = set()
 
 
+async def _warmup() -> None:
+    await asyncio.gather(state.recording.warmup(), state.llm.warmup())
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Gestión del ciclo de vida de la aplicación."""
     logger.info("🚀 Iniciando V2M API Server (Feature-Based Architecture)...")
 
-    # Warmup en background
-    task = asyncio.create_task(state.recording.warmup())
+    # Warmup en background: Whisper y el modelo LLM cargan en paralelo
+    task = asyncio.create_task(_warmup())
     _background_tasks.add(task)
     task.add_done_callback(_background_tasks.discard)
 
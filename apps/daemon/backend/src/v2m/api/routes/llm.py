@@ -1,4 +1,5 @@
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 
 from v2m.api.app import state
 from v2m.api.schemas import LLMResponse, ProcessTextRequest, TranslateTextRequest
@@ -12,6 +13,12 @@ async def process_text(request: ProcessTextRequest) -> LLMResponse:
     return await state.llm.process_text(request.text)
 
 
+@router.post("/process/stream")
+async def process_text_stream(request: ProcessTextRequest) -> StreamingResponse:
+    """Procesa texto con el LLM emitiendo los fragmentos como Server-Sent Events."""
+    return StreamingResponse(state.llm.process_text_stream(request.text), media_type="text/event-stream")
+
+
 @router.post("/translate", response_model=LLMResponse)
 async def translate_text(request: TranslateTextRequest) -> LLMResponse:
     """Traduce texto al idioma destino especificado."""
@@ -1,7 +1,9 @@
 from fastapi import APIRouter
 
 from v2m.api.app import state
-from v2m.api.schemas import HealthResponse, StatusResponse
+from v2m.api.schemas import HealthResponse, MetricsResponse, StatusResponse
+from v2m.features.llm.cache import get_llm_cache
+from v2m.features.llm.semantic_cache import get_semantic_cache
 
 router = APIRouter()
 
@@ -12,6 +14,22 @@ async def get_status() -> StatusResponse:
     return state.recording.get_status()
 
 
+@router.get("/metrics", response_model=MetricsResponse)
+async def get_metrics() -> MetricsResponse:
+    """Obtiene contadores de rendimiento (cachés de respuestas LLM)."""
+    cache = get_llm_cache()
+    semantic_cache = get_semantic_cache()
+    return MetricsResponse(
+        llm_cache_enabled=cache.enabled,
+        llm_cache_hits=cache.hits,
+        llm_cache_misses=cache.misses,
+        llm_cache_size=len(cache),
+        llm_semantic_cache_enabled=semantic_cache.enabled,
+        llm_semantic_cache_hits=semantic_cache.hits,
+        llm_semantic_cache_misses=semantic_cache.misses,
+    )
+
+
 @router.get("/health", response_model=HealthResponse)
 async def health_check() -> HealthResponse:
     """Verifica la salud del servicio API."""
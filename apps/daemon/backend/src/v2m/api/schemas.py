@@ -39,6 +39,18 @@ class LLMResponse(BaseModel):
     backend: str = Field(description="Backend usado: 'gemini', 'ollama', 'local'")
 
 
+class MetricsResponse(BaseModel):
+    """Respuesta del endpoint /metrics."""
+
+    llm_cache_enabled: bool = Field(description="True si la caché de respuestas LLM está activa")
+    llm_cache_hits: int = Field(description="Llamadas LLM resueltas desde la caché")
+    llm_cache_misses: int = Field(description="Llamadas LLM cacheables que llegaron al backend")
+    llm_cache_size: int = Field(description="Respuestas retenidas actualmente")
+    llm_semantic_cache_enabled: bool = Field(description="True si la caché semántica está activa")
+    llm_semantic_cache_hits: int = Field(description="Refinamientos servidos por similitud")
+    llm_semantic_cache_misses: int = Field(description="Consultas semánticas bajo el umbral")
+
+
 class HealthResponse(BaseModel):
     """Respuesta del endpoint /health."""
 
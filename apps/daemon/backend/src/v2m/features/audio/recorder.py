@@ -1,4 +1,5 @@
 import asyncio
+import contextlib
 import threading
 import wave
 from multiprocessing import shared_memory
@@ -12,12 +13,19 @@ try:
 except OSError:
     sd = None
 
+# libsndfile (opcional): escribe WAV desde float32 con la cuantización en C
+try:
+    import soundfile as sf
+except (ImportError, OSError):
+    sf = None
+
 from v2m.shared.errors import RecordingError
 from v2m.shared.logging import logger
 
 # Intenta importar el motor de audio Rust
 try:
     from v2m_engine import AudioRecorder as RustAudioRecorder
+    from v2m_engine import RustEngineStartError, RustEngineStopError
     from v2m_engine import ZeroCopyAudioRecorder as RustZeroCopyRecorder
 
     HAS_RUST_ENGINE = True
@@ -26,6 +34,8 @@ try:
 except ImportError:
     HAS_RUST_ENGINE = False
     HAS_ZERO_COPY = False
+    # Las excepciones del motor heredan de RuntimeError; sin motor nunca se lanzan
+    RustEngineStartError = RustEngineStopError = RuntimeError
     logger.warning("⚠️ motor de audio rust no disponible usando fallback python")
 
 # Alias para compatibilidad
@@ -53,18 +63,26 @@ class AudioRecorder:
 
     3. **Motor Python (sounddevice)** - [Fallback]
        - Se activa automáticamente si falla Rust (ej. hardware no soportado o error de driver).
-       - Utiliza `sounddevice` (PortAudio wrapper) con buffers pre-allocados.
+       - Utiliza `sounddevice.RawInputStream` sin callback: un hilo dedicado drena el
+         ringbuffer de PortAudio, por lo que el hilo de audio nunca ejecuta Python.
        - Uso: `mode="fallback"` o detección automática.
 
     Optimizaciones:
-    - Buffer pre-allocado en modo fallback para evitar reallocaciones O(n) -> O(1).
+    - Buffer creciente en modo fallback: arranca con `INITIAL_BUFFER_SEC` y duplica su
+      capacidad (con tope en `max_samples`), así las grabaciones cortas no reservan
+      los ~38 MB de la duración máxima y el crecimiento es O(1) amortizado.
     - Arquitectura resiliente: si Rust falla, el usuario no nota interrupción.
     - Zero-copy: `read_chunk_zero_copy()` retorna vista directa a /dev/shm sin copias.
+    - `stop()` sin copia en fallback: retorna una vista del buffer y el siguiente `start()`
+      reserva uno nuevo, así la vista no se corrompe con la próxima grabación.
     """
 
     # Tamaño del chunk en samples (coincide con sounddevice default ~1024)
     CHUNK_SIZE = 1024
 
+    # Capacidad inicial del buffer fallback en segundos (crece por duplicación)
+    INITIAL_BUFFER_SEC = 30
+
     def __init__(
         self,
         sample_rate: int = 16000,
@@ -87,6 +105,9 @@ class AudioRecorder:
         """
         self.sample_rate = sample_rate
         self.channels = channels
+        # Forma de un sample: () en mono, (channels,) en multicanal. Se resuelve una vez
+        # aquí para que los helpers de buffer no ramifiquen en cada llamada.
+        self._sample_shape: tuple[int, ...] = (channels,) if channels > 1 else ()
         self.device_index = device_index
         self._recording = False
         self._mode = mode
@@ -98,12 +119,18 @@ class AudioRecorder:
         self._shm_name: str | None = None
 
         # Estado para el motor Python (fallback)
-        self._stream: sd.InputStream | None = None
+        self._stream: sd.RawInputStream | None = None
+        self._drain_thread: threading.Thread | None = None
         self._lock = threading.Lock()
         self._buffer: np.ndarray | None = None
+        self._buffer_exported = False  # stop() cedió el buffer al caller; start() reserva otro
         self._write_pos = 0
         self._last_read_pos = 0  # Para streaming con fallback Python
+        # (loop, evento) de wait_for_data: el hilo de drenado lo activa tras cada bloque
+        self._data_waiter: tuple[asyncio.AbstractEventLoop, asyncio.Event] | None = None
+        self._int16_scratch: np.ndarray | None = None  # Reutilizado por _save_wav entre grabaciones
         self.max_samples = max_duration_sec * sample_rate
+        self._initial_capacity = min(self.INITIAL_BUFFER_SEC * sample_rate, self.max_samples)
 
         # Selección de motor según modo solicitado
         if mode == "zero_copy" and HAS_ZERO_COPY and device_index is None:
@@ -126,49 +153,81 @@ class AudioRecorder:
         if sd is None:
             logger.warning("sounddevice no está disponible (PortAudio no encontrado)")
 
-        # Inicialización del fallback Python (buffer pre-allocado)
+        # Inicialización del fallback Python (buffer inicial acotado)
         self._buffer = self._allocate_buffer()
 
-    def _allocate_buffer(self) -> np.ndarray:
-        """Asigna un buffer pre-allocado basado en la configuración de canales."""
-        if self.channels > 1:
-            return np.zeros((self.max_samples, self.channels), dtype=np.float32)
-        return np.zeros(self.max_samples, dtype=np.float32)
+    def _allocate_buffer(self, capacity: int | None = None) -> np.ndarray:
+        """Asigna un buffer basado en la configuración de canales.
+
+        Args:
+            capacity: Número de samples a reservar. Por defecto la capacidad inicial
+                (`INITIAL_BUFFER_SEC`), acotada por `max_samples`.
+        """
+        if capacity is None:
+            capacity = self._initial_capacity
+        return np.zeros((capacity, *self._sample_shape), dtype=np.float32)
+
+    def _grow_buffer(self, required: int) -> None:
+        """Duplica la capacidad del buffer hasta cubrir `required` samples (tope `max_samples`).
+
+        Solo la llama el hilo escritor (ver `_write_samples`). Copia solo los
+        samples ya escritos, antes de publicar el nuevo buffer.
+        """
+        capacity = len(self._buffer)
+        while capacity < required:
+            capacity *= 2
+        new_buffer = self._allocate_buffer(min(capacity, self.max_samples))
+        new_buffer[: self._write_pos] = self._buffer[: self._write_pos]
+        self._buffer = new_buffer
 
     def _empty_audio_array(self) -> np.ndarray:
         """Retorna un array de audio vacío con la forma correcta."""
-        if self.channels > 1:
-            return np.array([], dtype=np.float32).reshape(0, self.channels)
-        return np.array([], dtype=np.float32)
+        return np.empty((0, *self._sample_shape), dtype=np.float32)
 
     def supports_streaming(self) -> bool:
         """Indica si el modo actual soporta streaming eficiente.
 
-        El motor Rust soporta wait_for_data() asíncrono sin polling.
-        El motor Python utiliza polling cada ~50ms (menos eficiente pero funcional).
+        El motor Rust soporta wait_for_data() asíncrono sin polling; el motor Python
+        despierta al consumidor desde el hilo de drenado tras cada bloque escrito.
 
         Returns:
-            bool: True si streaming está disponible (siempre True con fallback polling).
+            bool: True si streaming está disponible (siempre True).
         """
-        return True  # Todos los modos soportan streaming (Rust: async, Python: polling)
+        return True  # Todos los modos soportan streaming (Rust: async, Python: evento)
 
     def is_using_rust_engine(self) -> bool:
         """Indica si está usando el motor Rust (streaming nativo sin polling)."""
         return self._rust_recorder is not None or self._zero_copy_recorder is not None
 
     def _save_wav(self, audio_data: np.ndarray, save_path: Path):
-        """Guarda los datos de audio en un archivo WAV."""
-        audio_int16 = (audio_data * 32767).astype(np.int16)
+        """Guarda los datos de audio en un archivo WAV (PCM 16-bit).
+
+        Con `soundfile` disponible, libsndfile convierte el float32 a int16 por
+        bloques en C sin copia completa. Si no, se usa `wave` cuantizando en un
+        buffer scratch que se conserva entre grabaciones (solo crece si la
+        grabación es más larga que la anterior), así `stop()` no reserva ni
+        libera un array temporal por llamada.
+        """
+        if sf is not None:
+            sf.write(str(save_path), audio_data, self.sample_rate, subtype="PCM_16")
+            return
+
+        num_values = audio_data.size
+        if self._int16_scratch is None or len(self._int16_scratch) < num_values:
+            self._int16_scratch = np.empty(num_values, dtype=np.int16)
+        audio_int16 = self._int16_scratch[:num_values]
+        # Una sola pasada: el buffer es C-contiguo, así que reshape(-1) ya entrega los
+        # canales intercalados como espera WAV y el producto escribe directo en int16
+        np.multiply(audio_data.reshape(-1), 32767, out=audio_int16, casting="unsafe")
+
         with wave.open(str(save_path), "wb") as wf:
             wf.setnchannels(self.channels)
             wf.setsampwidth(2)
             wf.setframerate(self.sample_rate)
-            wf.writeframes(audio_int16.tobytes())
+            wf.writeframes(audio_int16)  # buffer protocol: sin copia intermedia a bytes
 
     def _get_audio_slice(self, num_samples: int) -> np.ndarray:
-        """Extrae un segmento de audio del buffer."""
-        if self.channels > 1:
-            return self._buffer[:num_samples, :]
+        """Extrae un segmento de audio del buffer (vista, válida para mono y multicanal)."""
         return self._buffer[:num_samples]
 
     def start(self):
@@ -188,9 +247,9 @@ class AudioRecorder:
                 self._zero_copy_recorder.start()
                 # Conectar a la memoria compartida para lecturas zero-copy
                 self._shm = shared_memory.SharedMemory(name=self._shm_name)
-                logger.info(f"grabación iniciada (zero-copy engine, shm={self._shm_name})")
+                logger.info("grabación iniciada (zero-copy engine, shm=%s)", self._shm_name)
                 return
-            except Exception as e:
+            except (RustEngineStartError, OSError) as e:
                 logger.error(f"fallo en motor zero-copy, intentando standard: {e}")
                 self._zero_copy_recorder = None
                 self._shm = None
@@ -201,54 +260,38 @@ class AudioRecorder:
                 self._rust_recorder.start()
                 logger.info("grabación iniciada (rust engine)")
                 return
-            except Exception as e:
+            except RustEngineStartError as e:
                 logger.error(f"fallo en motor rust, intentando fallback a python: {e}")
                 # No lanzamos error aquí, permitimos que continúe al fallback Python
                 # pero primero debemos resetear el estado de grabación si rust lo dejó sucio
                 self._rust_recorder = None  # Deshabilitamos rust para esta instancia
 
         # --- CAMINO DE EJECUCIÓN PYTHON (FALLBACK) ---
-        # Aseguramos que _buffer está inicializado si falló rust
-        if self._buffer is None:
+        # Aseguramos que _buffer está inicializado si falló rust, y reservamos uno nuevo si
+        # el anterior se entregó en stop() (la vista del caller sigue viva por refcount) o
+        # si una grabación larga anterior lo hizo crecer
+        if self._buffer is None or self._buffer_exported or len(self._buffer) > self._initial_capacity:
             self._buffer = self._allocate_buffer()
+            self._buffer_exported = False
 
         self._write_pos = 0  # reiniciar posición del buffer
         self._last_read_pos = 0  # reiniciar posición de lectura para streaming
 
-        def callback(indata: np.ndarray, frames: int, time, status):
-            if status:
-                logger.warning(f"estado de la grabación de audio {status}")
-
-            with self._lock:
-                if not self._recording:
-                    return
-
-                # calcular cuántos samples podemos escribir
-                samples_to_write = min(frames, self.max_samples - self._write_pos)
-
-                if samples_to_write > 0:
-                    # escritura zero-copy al buffer pre-allocado flatten inline
-                    end_pos = self._write_pos + samples_to_write
-
-                    if self.channels > 1:
-                        self._buffer[self._write_pos : end_pos, :] = indata[:samples_to_write, :]
-                    else:
-                        self._buffer[self._write_pos : end_pos] = indata[:samples_to_write, 0]
-
-                    self._write_pos = end_pos
-
         try:
             if sd is None:
                 raise OSError("PortAudio library not found")
-            self._stream = sd.InputStream(
+            # Sin callback: PortAudio acumula en su ringbuffer interno y un hilo dedicado
+            # lo drena con lecturas bloqueantes, así el hilo de audio nunca ejecuta Python
+            self._stream = sd.RawInputStream(
                 samplerate=self.sample_rate,
                 channels=self.channels,
-                callback=callback,
                 dtype="float32",
                 device=self.device_index,
                 blocksize=self.CHUNK_SIZE,
             )
             self._stream.start()
+            self._drain_thread = threading.Thread(target=self._drain_loop, name="audio-drain", daemon=True)
+            self._drain_thread.start()
             logger.info("grabación de audio iniciada (python fallback)")
         except Exception as e:
             self._recording = False
@@ -257,13 +300,80 @@ class AudioRecorder:
                 self._stream = None
             raise RecordingError(f"falló al iniciar la grabación {e}") from e
 
+    def _drain_loop(self) -> None:
+        """Hilo de drenado del stream PortAudio (fallback Python).
+
+        Lee bloques de `CHUNK_SIZE` frames con `RawInputStream.read()` (libera el GIL
+        mientras espera) y los copia al buffer mediante una vista `np.frombuffer`
+        sobre el buffer de PortAudio, sin arrays intermedios.
+
+        En mono el bloque crudo ya es 1-D contiguo y se usa tal cual; solo en
+        multicanal se reinterpreta como `(frames, channels)`.
+        """
+        stream = self._stream
+        frame_shape = (-1, *self._sample_shape) if self._sample_shape else None
+        while self._recording:
+            try:
+                data, overflowed = stream.read(self.CHUNK_SIZE)
+            except Exception as e:
+                if self._recording:
+                    logger.error(f"error leyendo del stream de audio: {e}")
+                return
+
+            if overflowed:
+                logger.warning("desbordamiento del buffer de entrada de audio")
+
+            samples = np.frombuffer(data, dtype=np.float32)
+            if frame_shape is not None:
+                samples = samples.reshape(frame_shape)
+            self._write_samples(samples)
+
+    def _write_samples(self, samples: np.ndarray) -> None:
+        """Copia un bloque de samples al buffer, creciendo si es necesario.
+
+        Camino sin lock: hay un único escritor (el hilo de drenado) y `_recording`
+        es la señal de parada que `stop()` publica con una asignación simple. Los
+        samples se copian antes de publicar `_write_pos`, y los lectores leen
+        `_write_pos` antes que `_buffer`, así que nunca ven posiciones sin datos
+        (el GIL ordena las asignaciones de atributos entre hilos).
+
+        Args:
+            samples: Bloque de audio float32 (1-D en mono, `(frames, channels)` en multicanal).
+        """
+        if not self._recording:
+            return
+
+        # calcular cuántos samples podemos escribir
+        write_pos = self._write_pos
+        samples_to_write = min(len(samples), self.max_samples - write_pos)
+
+        if samples_to_write > 0:
+            if write_pos + samples_to_write > len(self._buffer):
+                self._grow_buffer(write_pos + samples_to_write)
+
+            end_pos = write_pos + samples_to_write
+            self._buffer[write_pos:end_pos] = samples[:samples_to_write]
+            self._write_pos = end_pos
+            self._notify_data()
+
+    def _notify_data(self) -> None:
+        """Despierta a `wait_for_data` desde cualquier hilo (no-op si nadie espera)."""
+        waiter = self._data_waiter
+        if waiter is not None and not waiter[1].is_set():
+            with contextlib.suppress(RuntimeError):  # loop ya cerrado
+                waiter[0].call_soon_threadsafe(waiter[1].set)
+
     def stop(self, save_path: Path | None = None, return_data: bool = True, copy_data: bool = True) -> np.ndarray:
         """Detiene la grabación y devuelve el audio capturado.
 
         Args:
             save_path: Ruta opcional para guardar el audio como archivo WAV.
             return_data: Si es True retorna el audio grabado.
-            copy_data: Si es True retorna una copia del buffer (seguro).
+            copy_data: Si es True retorna una copia del audio (solo motor zero-copy, cuyo
+                array puede apuntar a memoria compartida). El motor Rust standard ya
+                entrega un array nuevo, y el fallback Python retorna una vista sin copia:
+                el buffer se cede al caller y el siguiente `start()` reserva uno nuevo,
+                así que la vista nunca se solapa con otra grabación.
 
         Returns:
             np.ndarray: El audio grabado como un array de numpy float32.
@@ -272,6 +382,7 @@ class AudioRecorder:
             raise RecordingError("no hay grabación en curso")
 
         self._recording = False
+        self._notify_data()  # wait_for_data (fallback) ve el fin de la grabación
 
         # --- CAMINO DE EJECUCIÓN ZERO-COPY ---
         if self._zero_copy_recorder:
@@ -284,7 +395,7 @@ class AudioRecorder:
                 # El método stop de Rust devuelve el numpy array re-muestreado
                 audio_view = self._zero_copy_recorder.stop()
                 recorded_samples = len(audio_view)
-                logger.info(f"grabación detenida (zero-copy engine): {recorded_samples} samples")
+                logger.info("grabación detenida (zero-copy engine): %d samples", recorded_samples)
 
                 if save_path:
                     self._save_wav(audio_view, save_path)
@@ -296,7 +407,7 @@ class AudioRecorder:
                     return audio_view.copy()
 
                 return audio_view
-            except Exception as e:
+            except (RustEngineStopError, BufferError, OSError) as e:
                 logger.error(f"error deteniendo grabación zero-copy: {e}")
                 raise RecordingError(f"error deteniendo zero-copy: {e}") from e
 
@@ -306,7 +417,7 @@ class AudioRecorder:
                 # El método stop de Rust devuelve directamente el numpy array
                 audio_view = self._rust_recorder.stop()
                 recorded_samples = len(audio_view)
-                logger.info(f"grabación detenida (rust engine): {recorded_samples} samples")
+                logger.info("grabación detenida (rust engine): %d samples", recorded_samples)
 
                 # Manejo de guardado a disco
                 if save_path:
@@ -315,26 +426,37 @@ class AudioRecorder:
                 if not return_data:
                     return self._empty_audio_array()
 
-                # Rust devuelve un nuevo array (ya es una copia/nueva ref),
-                # pero si el usuario pidió copy_data=True explícitamente y queremos ser paranoicos
-                if copy_data:
-                    return audio_view.copy()
-
+                # Rust devuelve un array nuevo que pertenece al caller: copiarlo no protege nada
                 return audio_view
-            except Exception as e:
+            except RustEngineStopError as e:
                 logger.error(f"error deteniendo grabación rust: {e}")
                 raise RecordingError(f"error deteniendo rust: {e}") from e
 
         # --- CAMINO DE EJECUCIÓN PYTHON ---
+        # El hilo de drenado sale tras completar como mucho un bloque más
+        drain_alive = False
+        if self._drain_thread is not None:
+            self._drain_thread.join(timeout=1.0)
+            if self._drain_thread.is_alive() and self._stream:
+                # read() sigue bloqueado (dispositivo colgado): abort() lo desbloquea
+                self._stream.abort()
+                self._drain_thread.join(timeout=1.0)
+            drain_alive = self._drain_thread.is_alive()
+            self._drain_thread = None
+
         with self._lock:
             recorded_samples = self._write_pos
 
         if self._stream:
-            self._stream.stop()
-            self._stream.close()
+            if drain_alive:
+                # Cerrar el stream con un read() en curso libera memoria que PortAudio aún usa
+                logger.warning("el hilo de drenado no terminó; se omite cerrar el stream de audio")
+            else:
+                self._stream.stop()
+                self._stream.close()
             self._stream = None
 
-        logger.info(f"grabación detenida (python): {recorded_samples} samples")
+        logger.info("grabación detenida (python): %d samples", recorded_samples)
 
         if recorded_samples == 0:
             return self._empty_audio_array()
@@ -347,23 +469,19 @@ class AudioRecorder:
         if not return_data:
             return self._empty_audio_array()
 
-        if copy_data:
-            return audio_view.copy()
-
+        self._buffer_exported = True
         return audio_view
 
     # =========================================================================
-    # STREAMING METHODS (Rust: async notify, Python: polling fallback)
+    # STREAMING METHODS (Rust: async notify, Python: event set by the drain thread)
     # =========================================================================
 
-    async def wait_for_data(self, poll_interval: float = 0.05) -> None:
+    async def wait_for_data(self) -> None:
         """Wait asynchronously for new audio data to be available.
 
         For Rust engine: Uses tokio::Notify for efficient async waiting.
-        For Python fallback: Polls buffer write position every poll_interval.
-
-        Args:
-            poll_interval: Seconds between polls for Python fallback (default 50ms).
+        For Python fallback: Awaits an `asyncio.Event` that the drain thread sets
+        (via `call_soon_threadsafe`) after each block, and `stop()` sets on exit.
 
         Raises:
             RuntimeError: If not recording.
@@ -379,13 +497,20 @@ class AudioRecorder:
             await self._rust_recorder.wait_for_data()
             return
 
-        # --- PYTHON FALLBACK: polling-based streaming ---
-        # Esperamos hasta que haya nuevos datos en el buffer
+        # --- PYTHON FALLBACK: espera por evento ---
+        # Sin polling: el consumidor despierta en cuanto el hilo de drenado publica un
+        # bloque, no hasta 50 ms después
+        loop = asyncio.get_running_loop()
+        if self._data_waiter is None or self._data_waiter[0] is not loop:
+            self._data_waiter = (loop, asyncio.Event())
+        event = self._data_waiter[1]
         while self._recording:
+            # clear() antes de comprobar: un bloque publicado después vuelve a activar el evento
+            event.clear()
             with self._lock:
                 if self._write_pos > self._last_read_pos:
                     return  # Hay datos nuevos disponibles
-            await asyncio.sleep(poll_interval)
+            await event.wait()
 
     def read_chunk(self) -> "np.ndarray":
         """Read available audio data from the ring buffer.
@@ -414,11 +539,41 @@ class AudioRecorder:
             start = self._last_read_pos
             end = self._write_pos
             self._last_read_pos = end
-
-            if self.channels > 1:
-                return self._buffer[start:end, :].copy()
             return self._buffer[start:end].copy()
 
+    def read_chunk_into(self, out: np.ndarray) -> int:
+        """Read available audio data into a caller-provided buffer.
+
+        Batched alternative to `read_chunk()`: the caller pre-allocates `out` once
+        and reuses it across polls, so each call is a single copy from the ring
+        buffer with no per-call array allocation.
+
+        Args:
+            out: Pre-allocated 1-D float32 array; the Rust engines only accept
+                `PyArray1<f32>`, so multichannel layouts are not supported here.
+
+        Returns:
+            int: Number of samples written at the start of `out` (at most `len(out)`).
+        """
+        if not self._recording:
+            return 0
+
+        if self._zero_copy_recorder:
+            return self._zero_copy_recorder.read_chunk_into(out)
+
+        if self._rust_recorder:
+            return self._rust_recorder.read_chunk_into(out)
+
+        # --- PYTHON FALLBACK: lectura incremental del buffer ---
+        with self._lock:
+            start = self._last_read_pos
+            n = min(len(out), self._write_pos - start)
+            if n <= 0:
+                return 0
+            out[:n] = self._buffer[start : start + n]
+            self._last_read_pos = start + n
+            return n
+
     # =========================================================================
     # ZERO-COPY METHODS (SOTA 2026 - direct /dev/shm access)
     # =========================================================================
@@ -2,36 +2,32 @@
 
 Este módulo implementa un sistema de transcripción streaming basado en segmentos que:
 1. Desacopla la ingesta de audio (Producer) del procesamiento VAD/Whisper (Consumer)
-2. Usa asyncio.Queue para amortiguar la latencia de inferencia sin perder audio
+2. Usa una cola SPSC (deque + evento) para amortiguar la latencia de inferencia sin perder audio
 3. Usa VAD Silero para detectar límites de habla/silencio
 4. Hace commit de segmentos en 800ms de silencio (seguro para prosodia española)
 5. Inyecta ventana de contexto de 200 caracteres para continuidad
+
+El audio viaja como float32 de punta a punta: es el formato que entregan los motores
+de grabación y el que consumen Silero y Whisper. Pasarlo a int16 en el camino obligaría
+a reconvertir el segmento completo en cada inferencia provisional.
 """
 
 import asyncio
+import importlib.util
 import logging
 import re
 import time
 from collections import deque
+from pathlib import Path
+from types import MappingProxyType
 
 import numpy as np
 
-# Importar torch a nivel de módulo para evitar overhead en hot-path
-try:
-    import torch
-
-    _TORCH_AVAILABLE = True
-except ImportError:
-    torch = None
-    _TORCH_AVAILABLE = False
-
+# Silero VAD se ejecuta directamente sobre onnxruntime: sin torch ni el wrapper de silero_vad
 try:
-    from silero_vad import load_silero_vad
-
-    _SILERO_AVAILABLE = True
+    import onnxruntime as ort
 except ImportError:
-    load_silero_vad = None
-    _SILERO_AVAILABLE = False
+    ort = None
 
 from v2m.features.audio.recorder import AudioRecorder
 from v2m.features.transcription.persistent_model import PersistentWhisperWorker
@@ -43,11 +39,140 @@ logger = logging.getLogger(__name__)
 # Constantes de configuración de streaming
 CONTEXT_WINDOW_CHARS = 200  # Ventana deslizante para inyección de prompt
 PROVISIONAL_INTERVAL = 0.5  # Intervalo entre inferencias provisionales (segundos)
+PROVISIONAL_WINDOW_SEC = 2.0  # Audio máximo re-decodificado por inferencia provisional
 PRE_ROLL_CHUNKS = 3  # Mantener últimos 3 chunks (~300ms) para no cortar palabras
 MIN_SEGMENT_DURATION = 0.3  # Segundos de habla requeridos para commit
+SAMPLE_RATE = 16000  # Frecuencia de muestreo del stream (Hz)
+INV_SR = 1.0 / SAMPLE_RATE  # Segundos por sample (multiplicar en vez de dividir)
+MIN_SEGMENT_SAMPLES = int(MIN_SEGMENT_DURATION * SAMPLE_RATE)  # MIN_SEGMENT_DURATION en samples
+WHISPER_WINDOW_SAMPLES = 30 * SAMPLE_RATE  # Ventana nativa de Whisper; más allá decodifica por tramos
+MAX_SEGMENT_SAMPLES = 60 * SAMPLE_RATE  # Capacidad inicial del buffer de segmento (crece si hace falta)
+PROVISIONAL_WINDOW_SAMPLES = int(PROVISIONAL_WINDOW_SEC * SAMPLE_RATE)  # PROVISIONAL_WINDOW_SEC en samples
 DEFAULT_SILENCE_COMMIT_MS = 1000  # Duración de silencio por defecto para trigger commit
 CONTEXT_RESET_MS = 3000  # Resetear contexto si silencio excede esto (previene alucinaciones)
 HEARTBEAT_INTERVAL = 2.0  # Intervalo de heartbeat en segundos
+READ_BATCH_CHUNKS = 8  # Periodos de audio drenados por llamada a read_chunk_into
+READ_SLAB_BATCHES = 16  # Lotes de lectura que caben en cada slab del Producer
+VAD_BATCH = 8  # Máximo de chunks de la cola evaluados por vuelta del Consumer
+ENERGY_SPEECH_THRESHOLD = 0.01  # RMS mínimo para considerar habla en el fallback de energía
+DEFAULT_SILENCE_FLOOR = 0.003  # Amplitud pico bajo la cual se omite Silero (silencio seguro)
+VAD_WINDOW_SAMPLES = 512  # Silero v5 a 16kHz solo acepta ventanas de exactamente 512 samples
+VAD_CONTEXT_SAMPLES = 64  # Cola de la ventana previa que Silero v5 antepone a cada entrada
+
+# Patrones comunes de alucinación en Whisper, compilados una sola vez
+_HALLUCINATION_PATTERNS = tuple(
+    re.compile(pattern)
+    for pattern in (
+        r"(.{5,})\1{3,}",  # Frases repetidas 3+ veces
+        r"^[\.\,\!\?\s]+$",  # Solo puntuación
+        r"(?i)subtítulos|subtitles|thanks for watching",  # Artefactos de YouTube
+        r"(?i)gracias por ver|suscríbete|like and subscribe",  # Más artefactos
+        r"(?i)música|♪|♫",  # Indicadores de música sin habla
+    )
+)
+
+# Campos de `vad_parameters` que solo usa el VAD del streaming (no se pasan a faster-whisper)
+_STREAMING_VAD_FIELDS = frozenset({"execution_provider", "silence_floor"})
+
+# Proveedores de onnxruntime por valor de `vad_parameters.execution_provider`
+_VAD_PROVIDERS = {
+    "auto": ("CUDAExecutionProvider", "CoreMLExecutionProvider"),
+    "cuda": ("CUDAExecutionProvider",),
+    "coreml": ("CoreMLExecutionProvider",),
+    "cpu": (),
+}
+
+
+def _find_silero_model() -> str | None:
+    """Ubica `silero_vad.onnx` dentro del paquete silero-vad sin importarlo.
+
+    Importar `silero_vad` carga torch; `find_spec` solo resuelve la ruta del paquete.
+
+    Returns:
+        Ruta al modelo ONNX, o None si silero-vad no está instalado.
+    """
+    spec = importlib.util.find_spec("silero_vad")
+    if spec is None or not spec.submodule_search_locations:
+        return None
+    model_path = Path(next(iter(spec.submodule_search_locations))) / "data" / "silero_vad.onnx"
+    return str(model_path) if model_path.is_file() else None
+
+
+class _AudioChunkRing:
+    """Cola SPSC Producer → Consumer sobre el mismo event loop.
+
+    Un `deque` (ring de bloques implementado en C, append/popleft O(1)) más un único
+    `asyncio.Event` que el Producer activa solo al pasar de vacío a no vacío. A
+    diferencia de `asyncio.Queue`, `put`/`pop` no crean futures de espera por chunk:
+    el Consumer solo espera el evento cuando drenó todo.
+    """
+
+    __slots__ = ("_chunks", "_not_empty")
+
+    def __init__(self) -> None:
+        self._chunks: deque[np.ndarray] = deque()
+        self._not_empty = asyncio.Event()
+
+    def put_nowait(self, chunk: np.ndarray) -> None:
+        """Encola un chunk (nunca bloquea; la cola no tiene límite)."""
+        self._chunks.append(chunk)
+        if len(self._chunks) == 1:
+            self._not_empty.set()
+
+    def pop_batch(self, max_items: int) -> list[np.ndarray]:
+        """Saca hasta `max_items` chunks en orden, sin esperar."""
+        chunks = self._chunks
+        count = min(max_items, len(chunks))
+        return [chunks.popleft() for _ in range(count)]
+
+    async def wait(self) -> None:
+        """Espera hasta que haya al menos un chunk encolado."""
+        if self._chunks:
+            return
+        self._not_empty.clear()
+        await self._not_empty.wait()
+
+    def empty(self) -> bool:
+        """True si no hay chunks pendientes."""
+        return not self._chunks
+
+    def qsize(self) -> int:
+        """Número de chunks pendientes."""
+        return len(self._chunks)
+
+    def clear(self) -> None:
+        """Descarta los chunks pendientes."""
+        self._chunks.clear()
+
+
+class _PreRollBuffer:
+    """Últimos `maxlen` chunks vistos, con su total de samples mantenido al insertar.
+
+    Al inicio de habla el segmento reserva `samples_total` de una vez en lugar de
+    recorrer el deque para medirlo.
+    """
+
+    __slots__ = ("_chunks", "samples_total")
+
+    def __init__(self, maxlen: int) -> None:
+        self._chunks: deque[np.ndarray] = deque(maxlen=maxlen)
+        self.samples_total = 0
+
+    def append(self, chunk: np.ndarray) -> None:
+        """Agrega un chunk, descontando el que el deque expulsa si estaba lleno."""
+        chunks = self._chunks
+        if len(chunks) == chunks.maxlen:
+            self.samples_total -= chunks[0].size
+        self.samples_total += chunk.size
+        chunks.append(chunk)
+
+    def __iter__(self):
+        return iter(self._chunks)
+
+    def clear(self) -> None:
+        """Descarta los chunks retenidos."""
+        self._chunks.clear()
+        self.samples_total = 0
 
 
 class StreamingTranscriber:
@@ -81,33 +206,142 @@ class StreamingTranscriber:
         self._consumer_task: asyncio.Task | None = None
 
         # Cola de audio (Producer → Consumer)
-        # maxsize=0 significa infinita - el Consumer se pondrá al día
-        self._audio_queue: asyncio.Queue[np.ndarray] = asyncio.Queue()
+        # Sin límite - el Consumer se pondrá al día
+        self._audio_queue = _AudioChunkRing()
+
+        # Slab de lectura del Producer: cada lectura escribe en el siguiente tramo libre y
+        # se encola esa vista tal cual (sin copia). Los tramos nunca se reutilizan; al
+        # agotarse se reserva un slab nuevo y el anterior vive mientras haya vistas vivas
+        self._read_batch_samples = AudioRecorder.CHUNK_SIZE * READ_BATCH_CHUNKS
+        self._read_slab = np.empty(self._read_batch_samples * READ_SLAB_BATCHES, dtype=np.float32)
+        self._read_pos = 0
+
+        # Segmento activo en un buffer preasignado con cursor de escritura: Whisper recibe
+        # la vista `buf[:cursor]` en lugar de concatenar todos los chunks en cada inferencia
+        self._seg_buf = np.empty(MAX_SEGMENT_SAMPLES, dtype=np.float32)
+        self._seg_cursor = 0
 
         # Buffer de pre-roll (captura inicio de habla)
-        self._pre_roll_buffer: deque[np.ndarray] = deque(maxlen=PRE_ROLL_CHUNKS)
+        self._pre_roll_buffer = _PreRollBuffer(PRE_ROLL_CHUNKS)
+
+        # Contexto deslizante para continuidad: los últimos CONTEXT_WINDOW_CHARS caracteres
+        # (el deque descarta los antiguos al insertar) y el prompt materializado en caché
+        self._ctx_chars: deque[str] = deque(maxlen=CONTEXT_WINDOW_CHARS)
+        self._ctx_cached: str | None = None
+
+        # Inferencias provisionales en vuelo (no bloquean al Consumer) y su estado por
+        # segmento: último texto emitido, prefijo congelado y sample donde empieza la
+        # ventana abierta
+        self._prov_tasks: set[asyncio.Task] = set()
+        self._prov_text = ""
+        self._prov_prefix = ""
+        self._prov_offset = 0
+
+        # kwargs de transcribe() por modo, resueltos una vez (la config no se recarga en
+        # caliente): cada inferencia solo añade el audio y el initial_prompt. Son de solo
+        # lectura porque se comparten entre todas las llamadas
+        whisper_config = config.transcription.whisper
+        language = None if whisper_config.language == "auto" else whisper_config.language
+        self._prov_kw = MappingProxyType(
+            {
+                "language": language,
+                "task": "transcribe",
+                "beam_size": 1,  # Greedy for speed
+                "best_of": 1,
+                "temperature": 0.0,
+                "condition_on_previous_text": False,  # Avoid conflict with manual prompt
+                "word_timestamps": False,  # Only segment text is used; skips the alignment pass
+                "vad_filter": True,
+            }
+        )
+        self._final_kw = MappingProxyType(
+            {
+                "language": language,
+                "task": "transcribe",
+                "beam_size": whisper_config.beam_size,
+                "best_of": whisper_config.best_of,
+                "temperature": whisper_config.temperature,
+                "condition_on_previous_text": False,  # Avoid conflict with manual prompt
+                "word_timestamps": False,  # Only segment text is used; skips the alignment pass
+                "vad_filter": whisper_config.vad_filter,
+                "vad_parameters": (
+                    whisper_config.vad_parameters.model_dump(exclude=_STREAMING_VAD_FIELDS)
+                    if whisper_config.vad_filter
+                    else None
+                ),
+                # Parámetros de calidad para reducir alucinaciones
+                "no_speech_threshold": getattr(whisper_config, "no_speech_threshold", 0.6),
+                "compression_ratio_threshold": getattr(whisper_config, "compression_ratio_threshold", 2.4),
+                "log_prob_threshold": getattr(whisper_config, "log_prob_threshold", -1.0),
+            }
+        )
 
-        # Contexto deslizante para continuidad
-        self._context_window: str = ""
+        # Segmentos más largos que una ventana de Whisper se decodifican por lotes
+        # (BatchedInferencePipeline del worker); el pipeline necesita VAD para trocearlos
+        self._batch_long_finals = whisper_config.batch_size > 1 and whisper_config.vad_filter
 
         # Parámetros de VAD desde config
-        vad_config = config.transcription.whisper.vad_parameters
+        vad_config = whisper_config.vad_parameters
         self._silence_commit_ms = getattr(vad_config, "min_silence_duration_ms", DEFAULT_SILENCE_COMMIT_MS)
         self._speech_threshold = vad_config.threshold
+        self._silence_floor = getattr(vad_config, "silence_floor", DEFAULT_SILENCE_FLOOR)
 
         # Rate limiting para errores de VAD
-        self._last_vad_error_time = 0.0
+        self._last_vad_error_time = float("-inf")
+
+        # Buffers de Silero preasignados: entrada (contexto + ventana), estado recurrente
+        # y sample rate. Se reutilizan en cada ventana, sin tensores intermedios
+        self._vad_input = np.zeros((1, VAD_CONTEXT_SAMPLES + VAD_WINDOW_SAMPLES), dtype=np.float32)
+        self._vad_state = np.zeros((2, 1, 128), dtype=np.float32)
+        self._vad_sr = np.array(SAMPLE_RATE, dtype=np.int64)
+        # Samples sobrantes (< 512) que se anteponen al siguiente chunk para Silero
+        self._vad_carry = np.empty(0, dtype=np.float32)
+        # True mientras Silero no procesó audio desde el último reinicio (prefiltro)
+        self._vad_idle = True
 
         # Cargar modelo Silero VAD (SOTA 2026)
-        self._vad_model = None
-        if _SILERO_AVAILABLE:
+        self._vad_session = None
+        model_path = _find_silero_model() if ort is not None else None
+        if model_path:
             try:
-                self._vad_model = load_silero_vad(onnx=True)
-                logger.info("✅ Silero VAD (ONNX) cargado para segmentación de alta precisión")
+                self._vad_session = self._create_vad_session(
+                    model_path, getattr(vad_config, "execution_provider", "auto")
+                )
+                logger.info(
+                    "✅ Silero VAD (ONNX) cargado para segmentación de alta precisión (%s)",
+                    self._vad_session.get_providers()[0],
+                )
             except Exception as e:
                 logger.warning(f"⚠️ Error cargando Silero VAD: {e}. Usando fallback de energía.")
         else:
-            logger.warning("⚠️ silero-vad no disponible. Usando fallback de energía.")
+            logger.warning("⚠️ silero-vad/onnxruntime no disponible. Usando fallback de energía.")
+
+    @staticmethod
+    def _create_vad_session(model_path: str, execution_provider: str = "auto") -> "ort.InferenceSession":
+        """Crea la sesión ONNX de Silero (un hilo: el modelo es diminuto y secuencial).
+
+        Args:
+            model_path: Ruta a `silero_vad.onnx`.
+            execution_provider: Preferencia de `vad_parameters.execution_provider`. Los
+                proveedores acelerados solo se usan si onnxruntime los expone; CPU
+                queda siempre como último recurso.
+        """
+        available = ort.get_available_providers()
+        preferred = _VAD_PROVIDERS.get(execution_provider, ())
+        providers = [p for p in preferred if p in available] + ["CPUExecutionProvider"]
+
+        opts = ort.SessionOptions()
+        opts.intra_op_num_threads = 1
+        opts.inter_op_num_threads = 1
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        return ort.InferenceSession(model_path, sess_options=opts, providers=providers)
+
+    def _reset_vad_state(self) -> None:
+        """Reinicia el estado recurrente, el contexto y el sobrante de Silero."""
+        self._vad_input.fill(0.0)
+        self._vad_state.fill(0.0)
+        self._vad_carry = np.empty(0, dtype=np.float32)
+        self._vad_idle = True
 
     async def start(self) -> None:
         """Inicia el loop de transcripción streaming (Producer-Consumer)."""
@@ -121,14 +355,14 @@ class StreamingTranscriber:
 
         self.recorder.start()
         self._stop_event.clear()
-        self._context_window = ""
+        self._reset_context_window()
+        self._reset_vad_state()
+        self._seg_cursor = 0
+        self._pre_roll_buffer.clear()
+        self._reset_provisional()
 
         # Limpiar cola por si hay datos residuales
-        while not self._audio_queue.empty():
-            try:
-                self._audio_queue.get_nowait()
-            except asyncio.QueueEmpty:
-                break
+        self._audio_queue.clear()
 
         # Lanzar tareas Producer y Consumer en paralelo
         self._producer_task = asyncio.create_task(self._audio_producer_loop(), name="audio-producer")
@@ -192,13 +426,12 @@ class StreamingTranscriber:
         try:
             while not self._stop_event.is_set():
                 try:
+                    # Leer primero lo ya disponible y esperar solo cuando el recorder quedó
+                    # vacío: no se paga un round-trip de wait_for_data si hay audio pendiente
+                    self._drain_recorder()
+
                     # Rust maneja el bloqueo eficiente (Wait-Free via tokio::Notify)
                     await self.recorder.wait_for_data()
-                    chunk = self.recorder.read_chunk()
-
-                    if len(chunk) > 0:
-                        # Encolar sin bloquear (O(1))
-                        self._audio_queue.put_nowait(chunk)
 
                 except asyncio.CancelledError:
                     break
@@ -211,6 +444,33 @@ class StreamingTranscriber:
         finally:
             logger.debug("Producer terminado")
 
+    def _drain_recorder(self) -> None:
+        """Encola todo el audio disponible en el recorder, sin esperar.
+
+        Lee en lotes de hasta READ_BATCH_CHUNKS periodos directamente sobre el slab:
+        una llamada FFI por lote y ninguna copia en Python. Termina con la primera
+        lectura incompleta (el recorder quedó vacío).
+        """
+        while True:
+            out = self._next_read_window()
+            n = self.recorder.read_chunk_into(out)
+            if n == 0:
+                return
+            self._read_pos += n
+            # Encolar sin bloquear (O(1)); la vista es exclusiva de este chunk
+            self._audio_queue.put_nowait(out[:n])
+            if n < len(out):
+                return
+
+    def _next_read_window(self) -> np.ndarray:
+        """Tramo libre del slab de lectura para el próximo lote (reserva otro slab si no cabe)."""
+        end = self._read_pos + self._read_batch_samples
+        if end > len(self._read_slab):
+            self._read_slab = np.empty_like(self._read_slab)
+            self._read_pos = 0
+            end = self._read_batch_samples
+        return self._read_slab[self._read_pos : end]
+
     # =========================================================================
     # CONSUMER: Procesa VAD y Whisper a su propio ritmo
     # =========================================================================
@@ -222,109 +482,111 @@ class StreamingTranscriber:
         la cola crece pero el audio NO se pierde.
         """
         all_final_text: list[str] = []
-        current_segment: list[np.ndarray] = []
-        segment_duration = 0.0
-        last_provisional_time = time.time()
-        provisional_text = ""
+        # Todas las marcas son monotónicas: solo se usan como deltas y no deben saltar con
+        # ajustes del reloj del sistema (NTP). El heartbeat envía la hora de pared aparte
+        last_provisional_time = time.monotonic()
         silence_start: float | None = None
-        last_heartbeat_time = time.time()
+        last_heartbeat_time = time.monotonic()
 
         try:
             while not self._stop_event.is_set() or not self._audio_queue.empty():
-                # Obtener chunk con timeout para revisar stop_event
+                # Esperar audio solo si la cola quedó vacía, con timeout para revisar stop_event
                 try:
-                    chunk = await asyncio.wait_for(self._audio_queue.get(), timeout=0.1)
+                    if self._audio_queue.empty():
+                        await asyncio.wait_for(self._audio_queue.wait(), timeout=0.1)
                 except TimeoutError:
                     # Revisar heartbeat aunque no haya audio
-                    now = time.time()
+                    now = time.monotonic()
                     if now - last_heartbeat_time > HEARTBEAT_INTERVAL:
-                        await self.session_manager.emit_event("heartbeat", {"timestamp": now, "state": "recording"})
+                        await self.session_manager.emit_event(
+                            "heartbeat", {"timestamp": time.time(), "state": "recording"}
+                        )
                         last_heartbeat_time = now
                     continue
 
-                if len(chunk) == 0:
+                # Drenar lo que ya esté encolado (hasta VAD_BATCH chunks) para evaluar el
+                # VAD de todo el lote en una pasada; el orden de los chunks se conserva
+                batch = self._drain_audio_batch()
+                if not batch:
                     continue
 
-                now = time.time()
+                # Una sola lectura del reloj por lote: los chunks ya llegaron juntos
+                now = time.monotonic()
 
                 # Heartbeat
                 if now - last_heartbeat_time > HEARTBEAT_INTERVAL:
-                    await self.session_manager.emit_event("heartbeat", {"timestamp": now, "state": "recording"})
+                    await self.session_manager.emit_event("heartbeat", {"timestamp": time.time(), "state": "recording"})
                     last_heartbeat_time = now
 
-                # Mantener pre-roll buffer
-                self._pre_roll_buffer.append(chunk)
-
-                # Detección VAD
-                is_speech = self._detect_speech(chunk)
-
-                # Reset de contexto si silencio muy largo (anti-alucinación)
-                if silence_start:
-                    silence_ms = (now - silence_start) * 1000
-                    if silence_ms > CONTEXT_RESET_MS and self._context_window:
-                        self._context_window = ""
-
-                # Lógica de acumulación de segmentos
-                if is_speech and not current_segment:
-                    # Inicio de habla - incluir pre-roll buffer
-                    current_segment.extend(self._pre_roll_buffer)
-                    segment_duration = sum(len(c) / 16000 for c in current_segment)
-                    silence_start = None
-
-                elif is_speech:
-                    # Continuando habla
-                    current_segment.append(chunk)
-                    segment_duration += len(chunk) / 16000
-                    silence_start = None
-
-                elif current_segment:
-                    # Silencio con segmento activo - seguir acumulando
-                    current_segment.append(chunk)
-                    segment_duration += len(chunk) / 16000
-
-                    if silence_start is None:
-                        silence_start = now
-
-                # Inferencia provisional durante habla
-                if (
-                    is_speech
-                    and segment_duration > MIN_SEGMENT_DURATION
-                    and now - last_provisional_time > PROVISIONAL_INTERVAL
-                ):
-                    last_provisional_time = now
-                    text = await self._infer_provisional(current_segment)
-                    if text and text != provisional_text:
-                        provisional_text = text
-                        await self.session_manager.emit_event(
-                            "transcription_update",
-                            {"text": text, "final": False},
-                        )
+                for chunk, is_speech in zip(batch, self._detect_speech_batch(batch), strict=True):
+                    # Mantener pre-roll buffer
+                    self._pre_roll_buffer.append(chunk)
 
-                # COMMIT si silencio > threshold Y tenemos suficiente audio
-                if silence_start and current_segment and segment_duration > MIN_SEGMENT_DURATION:
-                    silence_ms = (now - silence_start) * 1000
-                    if silence_ms > self._silence_commit_ms:
-                        logger.debug(f"Commit segmento: {segment_duration:.2f}s (silencio: {silence_ms:.0f}ms)")
-
-                        final_text = await self._infer_final(current_segment)
-                        if final_text:
-                            all_final_text.append(final_text)
-                            self._update_context_window(final_text)
-                            await self.session_manager.emit_event(
-                                "transcription_update",
-                                {"text": final_text, "final": True},
-                            )
+                    # Reset de contexto si silencio muy largo (anti-alucinación)
+                    if silence_start:
+                        silence_ms = (now - silence_start) * 1000
+                        if silence_ms > CONTEXT_RESET_MS and self._ctx_chars:
+                            self._reset_context_window()
+
+                    # Lógica de acumulación de segmentos
+                    if is_speech and not self._seg_cursor:
+                        # Inicio de habla - incluir pre-roll buffer
+                        self._append_pre_roll()
+                        silence_start = None
 
-                        # FLUSH - limpiar buffers
-                        current_segment.clear()
-                        segment_duration = 0.0
-                        provisional_text = ""
+                    elif is_speech:
+                        # Continuando habla
+                        self._append_to_segment(chunk)
                         silence_start = None
 
+                    elif self._seg_cursor:
+                        # Silencio con segmento activo - seguir acumulando
+                        self._append_to_segment(chunk)
+
+                        if silence_start is None:
+                            silence_start = now
+
+                    # Inferencia provisional durante habla
+                    if (
+                        is_speech
+                        and self._seg_cursor > MIN_SEGMENT_SAMPLES
+                        and now - last_provisional_time > PROVISIONAL_INTERVAL
+                    ):
+                        last_provisional_time = now
+                        self._submit_provisional()
+
+                    # COMMIT si silencio > threshold Y tenemos suficiente audio
+                    if silence_start and self._seg_cursor > MIN_SEGMENT_SAMPLES:
+                        silence_ms = (now - silence_start) * 1000
+                        if silence_ms > self._silence_commit_ms:
+                            logger.debug(
+                                f"Commit segmento: {self._seg_cursor * INV_SR:.2f}s (silencio: {silence_ms:.0f}ms)"
+                            )
+
+                            # Las provisionales del segmento ya no sirven: cancelarlas evita que
+                            # lleguen tarde a la UI y descarta las que aún esperan el lock del
+                            # worker. Una decodificación ya en curso no se interrumpe y sigue
+                            # retrasando al final (su trabajo va antes en la cola FIFO del hilo)
+                            self._cancel_provisionals()
+                            final_text = await self._infer_final(self._segment_audio())
+                            if final_text:
+                                all_final_text.append(final_text)
+                                self._update_context_window(final_text)
+                                await self.session_manager.emit_event(
+                                    "transcription_update",
+                                    {"text": final_text, "final": True},
+                                )
+
+                            # FLUSH - limpiar buffers
+                            self._seg_cursor = 0
+                            self._reset_provisional()
+                            silence_start = None
+
             # Commit final al detener (si queda audio)
-            if current_segment and segment_duration > MIN_SEGMENT_DURATION:
-                logger.debug(f"Commit final al detener: {segment_duration:.2f}s")
-                final_text = await self._infer_final(current_segment)
+            self._cancel_provisionals()
+            if self._seg_cursor > MIN_SEGMENT_SAMPLES:
+                logger.debug(f"Commit final al detener: {self._seg_cursor * INV_SR:.2f}s")
+                final_text = await self._infer_final(self._segment_audio())
                 if final_text:
                     all_final_text.append(final_text)
                     self._update_context_window(final_text)
@@ -337,9 +599,10 @@ class StreamingTranscriber:
 
         except asyncio.CancelledError:
             # Intentar commit de emergencia
-            if current_segment and segment_duration > MIN_SEGMENT_DURATION:
+            self._cancel_provisionals()
+            if self._seg_cursor > MIN_SEGMENT_SAMPLES:
                 try:
-                    final_text = await self._infer_final(current_segment)
+                    final_text = await self._infer_final(self._segment_audio())
                     if final_text:
                         all_final_text.append(final_text)
                 except Exception:
@@ -348,66 +611,205 @@ class StreamingTranscriber:
 
         except Exception as e:
             logger.error(f"Consumer loop error: {e}")
+            self._cancel_provisionals()
             return " ".join(all_final_text) if all_final_text else ""
 
+    # =========================================================================
+    # PROVISIONALES: inferencia en segundo plano sobre la ventana abierta
+    # =========================================================================
+
+    def _submit_provisional(self) -> None:
+        """Lanza la inferencia provisional de la ventana abierta sin bloquear al Consumer.
+
+        Solo se decodifica el audio desde `_prov_offset`: el costo por tick queda acotado
+        en vez de crecer con el segmento. La ventana se copia (≤ PROVISIONAL_WINDOW_SEC)
+        porque el buffer de segmento se reutiliza tras el commit mientras Whisper podría
+        seguir leyéndola.
+        """
+        cursor = self._seg_cursor
+        window = self._seg_buf[self._prov_offset : cursor].copy()
+        task = asyncio.create_task(self._run_provisional(window, self._prov_prefix, cursor))
+        self._prov_tasks.add(task)
+        task.add_done_callback(self._prov_tasks.discard)
+
+    async def _run_provisional(self, window: np.ndarray, prefix: str, cursor: int) -> None:
+        """Transcribe `window`, emite `prefix + texto` y congela el prefijo si la ventana se llenó.
+
+        Al alcanzar PROVISIONAL_WINDOW_SAMPLES el texto de la ventana pasa a ser prefijo y
+        la siguiente ventana arranca en `cursor`; el commit sigue decodificando el segmento
+        completo.
+        """
+        tail_text = await self._infer_provisional(window, prefix)
+        if tail_text is None:
+            return  # Reemplazada por una provisional más reciente antes de ejecutarse
+
+        text = f"{prefix} {tail_text}".strip()
+        if len(window) >= PROVISIONAL_WINDOW_SAMPLES:
+            self._prov_prefix = text
+            self._prov_offset = cursor
+        if text and text != self._prov_text:
+            self._prov_text = text
+            await self.session_manager.emit_event(
+                "transcription_update",
+                {"text": text, "final": False},
+            )
+
+    def _cancel_provisionals(self) -> None:
+        """Cancela las provisionales en vuelo (su resultado ya no corresponde al segmento).
+
+        Solo se descartan las que aún no empezaron (esperando `worker._lock`). Una que ya
+        pasó al hilo de inferencia sigue decodificando: cancelar su tarea suelta el lock,
+        pero el trabajo del final se encola detrás del suyo y lo espera igualmente.
+        """
+        for task in self._prov_tasks:
+            task.cancel()
+
+    def _reset_provisional(self) -> None:
+        """Reinicia el estado provisional al empezar un segmento nuevo."""
+        self._prov_text = ""
+        self._prov_prefix = ""
+        self._prov_offset = 0
+
+    def _append_to_segment(self, chunk: np.ndarray) -> None:
+        """Copia `chunk` al final del segmento activo, duplicando el buffer si no cabe."""
+        end = self._seg_cursor + chunk.size
+        self._reserve_segment(end)
+        self._seg_buf[self._seg_cursor : end] = chunk
+        self._seg_cursor = end
+
+    def _append_pre_roll(self) -> None:
+        """Copia el pre-roll completo al segmento con una sola reserva de capacidad."""
+        pos = self._seg_cursor
+        end = pos + self._pre_roll_buffer.samples_total
+        self._reserve_segment(end)
+        seg_buf = self._seg_buf
+        for chunk in self._pre_roll_buffer:
+            seg_buf[pos : pos + chunk.size] = chunk
+            pos += chunk.size
+        self._seg_cursor = end
+
+    def _reserve_segment(self, end: int) -> None:
+        """Garantiza capacidad para `end` samples, duplicando el buffer si no alcanza."""
+        if end > len(self._seg_buf):
+            grown = np.empty(max(end, 2 * len(self._seg_buf)), dtype=np.float32)
+            grown[: self._seg_cursor] = self._seg_buf[: self._seg_cursor]
+            self._seg_buf = grown
+
+    def _segment_audio(self) -> np.ndarray:
+        """Vista (sin copia) del audio acumulado en el segmento activo."""
+        return self._seg_buf[: self._seg_cursor]
+
+    def _drain_audio_batch(self) -> list[np.ndarray]:
+        """Saca de la cola hasta `VAD_BATCH` chunks encolados, descartando los vacíos.
+
+        No espera: solo toma lo disponible.
+        """
+        return [chunk for chunk in self._audio_queue.pop_batch(VAD_BATCH) if len(chunk)]
+
     # =========================================================================
     # VAD (Voice Activity Detection)
     # =========================================================================
 
+    def _detect_speech_batch(self, chunks: list[np.ndarray]) -> list[bool]:
+        """Evalúa el VAD de varios chunks consecutivos, en orden.
+
+        Silero es recurrente (su estado avanza ventana a ventana), así que las ventanas
+        de un mismo stream no se pueden apilar como batch independiente; se evalúan en
+        secuencia dentro de una sola llamada por lote del Consumer.
+
+        Sin Silero (y sin logging DEBUG, que registra cada chunk) el fallback de energía
+        se resuelve en una sola comprensión: suma de cuadrados con `np.dot` contra el
+        umbral al cuadrado, sin pasar por el dispatch por chunk.
+        """
+        if self._vad_session is None and not logger.isEnabledFor(logging.DEBUG):
+            # Los chunks del Producer son vistas 1-D float32
+            limit = ENERGY_SPEECH_THRESHOLD * ENERGY_SPEECH_THRESHOLD
+            return [float(np.dot(chunk, chunk)) > limit * chunk.size for chunk in chunks]
+        return [self._detect_speech(chunk) for chunk in chunks]
+
     def _detect_speech(self, chunk: np.ndarray) -> bool:
         """Detecta habla usando Silero VAD con fallback a energía.
 
         Silero VAD es SOTA 2026 - ignora respiraciones, tecleo, etc.
-        El fallback de energía es menos preciso pero funciona sin torch.
+        El fallback de energía es menos preciso pero funciona sin onnxruntime.
         """
-        if self._vad_model is not None and _TORCH_AVAILABLE:
+        if self._vad_session is not None:
+            # Prefiltro de amplitud: un chunk cuyo pico no alcanza el piso es silencio seguro
+            # y dos reducciones (sin temporales) cuestan mucho menos que un forward de Silero.
+            # Tras un tramo omitido el stream de Silero ya no es contiguo: se reinicia una vez
+            floor = self._silence_floor
+            if chunk.max() < floor and chunk.min() > -floor:
+                if not self._vad_idle:
+                    self._reset_vad_state()
+                return False
+            self._vad_idle = False
             return self._detect_speech_silero(chunk)
         return self._detect_speech_energy(chunk)
 
     def _detect_speech_silero(self, chunk: np.ndarray) -> bool:
-        """Detección de habla con Silero VAD (ONNX)."""
+        """Detección de habla con Silero VAD (ONNX).
+
+        El chunk se parte en ventanas de `VAD_WINDOW_SAMPLES`; los samples que no
+        completan una ventana se guardan y se anteponen al siguiente chunk. El chunk
+        es habla si alguna de sus ventanas supera el umbral.
+        """
         try:
             # Normalizar input
             if chunk.ndim > 1:
                 chunk = chunk.flatten()
 
-            # Mínimo 512 muestras para detección confiable
-            if len(chunk) < 512:
-                return self._detect_speech_energy(chunk)
-
             # Asegurar float32 para ONNX
             if chunk.dtype != np.float32:
                 chunk = chunk.astype(np.float32)
 
-            # Silero requiere tensor torch incluso en modo ONNX
-            chunk_tensor = torch.from_numpy(chunk)
+            samples = np.concatenate((self._vad_carry, chunk)) if len(self._vad_carry) else chunk
+            num_windows = len(samples) // VAD_WINDOW_SAMPLES
+            used = num_windows * VAD_WINDOW_SAMPLES
+            self._vad_carry = samples[used:].copy()
 
-            speech_prob = self._vad_model(chunk_tensor, 16000)
+            # Menos de una ventana completa: no hay inferencia posible todavía
+            if num_windows == 0:
+                return self._detect_speech_energy(chunk)
 
-            # Manejar retorno tensor o escalar
-            val = speech_prob.item() if hasattr(speech_prob, "item") else float(speech_prob)
+            # Llamada directa a la sesión ONNX: la entrada es [contexto | ventana] y tras
+            # cada ventana su cola pasa a ser el contexto de la siguiente
+            vad_input = self._vad_input
+            val = 0.0
+            for start in range(0, used, VAD_WINDOW_SAMPLES):
+                vad_input[0, VAD_CONTEXT_SAMPLES:] = samples[start : start + VAD_WINDOW_SAMPLES]
+                prob, self._vad_state = self._vad_session.run(
+                    None, {"input": vad_input, "state": self._vad_state, "sr": self._vad_sr}
+                )
+                vad_input[0, :VAD_CONTEXT_SAMPLES] = vad_input[0, -VAD_CONTEXT_SAMPLES:]
+                val = max(val, float(prob[0, 0]))
 
             is_speech = val > self._speech_threshold
-            if is_speech:
+            # Por chunk con habla: sin DEBUG no se formatea el mensaje
+            if is_speech and logger.isEnabledFor(logging.DEBUG):
                 logger.debug(f"VAD Silero: speech_prob={val:.4f} > {self._speech_threshold}")
 
             return is_speech
 
         except Exception as e:
-            now = time.time()
+            now = time.monotonic()
             if now - self._last_vad_error_time > 5.0:
                 logger.warning(f"Silero VAD error: {e} (throttled)")
                 self._last_vad_error_time = now
             return self._detect_speech_energy(chunk)
 
-    def _detect_speech_energy(self, chunk: np.ndarray, threshold: float = 0.01) -> bool:
-        """Fallback: detección basada en energía RMS."""
+    def _detect_speech_energy(self, chunk: np.ndarray, threshold: float = ENERGY_SPEECH_THRESHOLD) -> bool:
+        """Fallback: detección basada en energía RMS.
+
+        Una sola pasada con `np.dot` (suma de cuadrados vía BLAS, sin el array
+        intermedio de `chunk**2`) y comparación contra `threshold² · n`, sin raíz.
+        """
         if len(chunk) == 0:
             return False
-        rms = np.sqrt(np.mean(chunk**2))
-        is_speech = rms > threshold
-        if is_speech:
-            logger.debug(f"VAD Energy: rms={rms:.4f} > {threshold}")
+        samples = chunk.ravel()
+        sum_squares = float(np.dot(samples, samples))
+        is_speech = sum_squares > threshold * threshold * samples.size
+        if is_speech and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"VAD Energy: rms={(sum_squares / samples.size) ** 0.5:.4f} > {threshold}")
         return is_speech
 
     # =========================================================================
@@ -431,18 +833,9 @@ class StreamingTranscriber:
         if not text or len(text) < 20:
             return False
 
-        # Patrones de alucinación comunes en Whisper
-        patterns = [
-            r"(.{5,})\1{3,}",  # Frases repetidas 3+ veces
-            r"^[\.\,\!\?\s]+$",  # Solo puntuación
-            r"(?i)subtítulos|subtitles|thanks for watching",  # Artefactos de YouTube
-            r"(?i)gracias por ver|suscríbete|like and subscribe",  # Más artefactos
-            r"(?i)música|♪|♫",  # Indicadores de música sin habla
-        ]
-
-        for pattern in patterns:
-            if re.search(pattern, text):
-                logger.warning(f"Alucinación detectada (patrón: {pattern[:20]}...): {text[:50]}...")
+        for pattern in _HALLUCINATION_PATTERNS:
+            if pattern.search(text):
+                logger.warning(f"Alucinación detectada (patrón: {pattern.pattern[:20]}...): {text[:50]}...")
                 return True
 
         return False
@@ -455,96 +848,96 @@ class StreamingTranscriber:
         """Build context prompt from sliding window.
 
         Uses last 200 chars to avoid Whisper's 224-token limit
-        which can cause looping hallucinations.
+        which can cause looping hallucinations. The joined string is cached
+        until the window changes, so repeated inferences reuse it.
         """
-        if not self._context_window:
-            return ""
-        return self._context_window[-CONTEXT_WINDOW_CHARS:]
+        if self._ctx_cached is None:
+            self._ctx_cached = "".join(self._ctx_chars)
+        return self._ctx_cached
 
     def _update_context_window(self, text: str) -> None:
         """Append to context window, keeping last 200 chars."""
         clean_text = text.strip()
         if clean_text:
-            self._context_window = (self._context_window + " " + clean_text)[-CONTEXT_WINDOW_CHARS:]
+            self._ctx_chars.append(" ")
+            self._ctx_chars.extend(clean_text)
+            self._ctx_cached = None
+
+    def _reset_context_window(self) -> None:
+        """Clear the context window (new session or long silence)."""
+        self._ctx_chars.clear()
+        self._ctx_cached = ""
 
-    async def _infer_provisional(self, audio_chunks: list[np.ndarray]) -> str:
+    async def _infer_provisional(self, full_audio: np.ndarray, prefix: str = "") -> str | None:
         """Fast provisional inference for real-time feedback.
 
-        Uses greedy decoding (beam_size=1) for speed.
+        Uses greedy decoding (beam_size=1) for speed. Submitted through
+        ``worker.submit_latest`` so a provisional still waiting behind a slow
+        inference is dropped (returns None) when a newer one arrives.
+
+        Args:
+            full_audio: Open provisional window of the segment (a private copy,
+                see ``_submit_provisional``).
+            prefix: Provisional text already frozen for earlier audio of the same
+                segment; appended to the prompt so the window continues it.
         """
-        if not audio_chunks:
+        if not len(full_audio):
             return ""
 
-        full_audio = np.concatenate(audio_chunks)
-        whisper_config = config.transcription.whisper
         context_prompt = self._build_context_prompt()
+        if prefix:
+            # Mantener el prompt dentro de CONTEXT_WINDOW_CHARS (límite de tokens de Whisper)
+            context_prompt = f"{context_prompt} {prefix}".strip()[-CONTEXT_WINDOW_CHARS:]
 
         def _inference_func(model):
             segments, _ = model.transcribe(
-                full_audio,
-                language=whisper_config.language if whisper_config.language != "auto" else None,
-                task="transcribe",
-                beam_size=1,  # Greedy for speed
-                best_of=1,
-                temperature=0.0,
-                initial_prompt=context_prompt if context_prompt else None,
-                condition_on_previous_text=False,  # Avoid conflict with manual prompt
-                vad_filter=True,
+                full_audio, initial_prompt=context_prompt if context_prompt else None, **self._prov_kw
             )
             return list(segments)
 
         try:
-            segments = await self.worker.run_inference(_inference_func)
+            segments = await self.worker.submit_latest(_inference_func)
+            if segments is None:
+                return None
             text = " ".join(s.text.strip() for s in segments if s.text)
             return text
         except Exception as e:
             logger.debug(f"Provisional inference error: {e}")
             return ""
 
-    async def _infer_final(self, audio_chunks: list[np.ndarray]) -> str:
+    async def _infer_final(self, full_audio: np.ndarray) -> str:
         """High-quality final inference for committed segments.
 
         Uses configured beam search, VAD parameters, and quality filters
         (no_speech_threshold, compression_ratio_threshold) to reduce hallucinations.
+
+        Args:
+            full_audio: Segment audio (a view of the segment buffer, not copied).
         """
-        if not audio_chunks:
+        if not len(full_audio):
             return ""
 
-        full_audio = np.concatenate(audio_chunks)
-        audio_duration = len(full_audio) / 16000  # Duración en segundos
-        whisper_config = config.transcription.whisper
+        audio_duration = len(full_audio) * INV_SR  # Duración en segundos
         context_prompt = self._build_context_prompt()
 
         def _inference_func(model):
-            vad_params = None
-            if whisper_config.vad_filter:
-                vad_params = whisper_config.vad_parameters.model_dump()
-
             segments, info = model.transcribe(
-                full_audio,
-                language=whisper_config.language if whisper_config.language != "auto" else None,
-                task="transcribe",
-                beam_size=whisper_config.beam_size,
-                best_of=whisper_config.best_of,
-                temperature=whisper_config.temperature,
-                initial_prompt=context_prompt if context_prompt else None,
-                condition_on_previous_text=False,  # Avoid conflict with manual prompt
-                vad_filter=whisper_config.vad_filter,
-                vad_parameters=vad_params,
-                # Parámetros de calidad para reducir alucinaciones
-                no_speech_threshold=getattr(whisper_config, "no_speech_threshold", 0.6),
-                compression_ratio_threshold=getattr(whisper_config, "compression_ratio_threshold", 2.4),
-                log_prob_threshold=getattr(whisper_config, "log_prob_threshold", -1.0),
+                full_audio, initial_prompt=context_prompt if context_prompt else None, **self._final_kw
             )
             return list(segments), info
 
         try:
-            segments, info = await self.worker.run_inference(_inference_func)
+            if self._batch_long_finals and len(full_audio) > WHISPER_WINDOW_SAMPLES:
+                segments, info = await self.worker.transcribe(
+                    full_audio, initial_prompt=context_prompt if context_prompt else None, **self._final_kw
+                )
+            else:
+                segments, info = await self.worker.run_inference(_inference_func)
             text = " ".join(s.text.strip() for s in segments if s.text)
 
             # Diagnóstico de transcripción vacía
             if not text:
-                rms_energy = np.sqrt(np.mean(full_audio**2))
+                rms_energy = (float(np.dot(full_audio, full_audio)) / len(full_audio)) ** 0.5
                 logger.warning(
                     f"Transcripción vacía: duration={audio_duration:.2f}s, "
                     f"rms={rms_energy:.4f}, language_prob={getattr(info, 'language_probability', 'N/A')}"
@@ -0,0 +1,123 @@
+"""Caché de respuestas exactas para llamadas LLM deterministas.
+
+Con temperatura 0 la misma combinación (modelo, prompt de sistema, texto, límites de
+generación) produce la misma salida, así que repetir la llamada solo agrega latencia
+de red o de inferencia. Esta caché guarda esas respuestas en memoria del proceso y
+las devuelve sin tocar el backend.
+
+Es opt-in (`[llm.cache] enabled = true`). Las llamadas con temperatura > 0 nunca se
+cachean: su salida no es reproducible.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+
+from v2m.shared.config import config
+
+
+class LLMCache:
+    """Caché LRU con expiración (TTL) de respuestas LLM, indexada por hash exacto.
+
+    Vive en el event loop del daemon: las operaciones son síncronas y O(1), sin
+    locks. `build_key` devuelve None cuando la llamada no debe cachearse; `get` y
+    `set` aceptan ese None y no hacen nada, de modo que los servicios no necesitan
+    ramas propias.
+
+    Atributos:
+        hits: Número de consultas resueltas desde la caché.
+        misses: Número de consultas cacheables que no estaban (o habían expirado).
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, enabled: bool = True) -> None:
+        """Inicializa la caché.
+
+        Args:
+            max_entries: Máximo de respuestas retenidas; se expulsa la menos usada.
+            ttl_seconds: Vida de cada entrada en segundos.
+            enabled: Si es False, `build_key` siempre devuelve None.
+        """
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def build_key(
+        self,
+        model: str,
+        system_instruction: str,
+        text: str,
+        temperature: float,
+        max_tokens: int | None = None,
+    ) -> str | None:
+        """Calcula la clave de una llamada, o None si no es cacheable.
+
+        Args:
+            model: Identificador del modelo.
+            system_instruction: Prompt de sistema (incluye el idioma en traducciones).
+            text: Texto del usuario.
+            temperature: Temperatura de generación; > 0 desactiva la caché.
+            max_tokens: Límite de tokens generados, si el backend lo usa.
+
+        Returns:
+            str | None: SHA-256 hexadecimal de la llamada, o None.
+        """
+        if not self.enabled or temperature > 0:
+            return None
+        raw = "\x1f".join((model, system_instruction, text, repr(temperature), repr(max_tokens)))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str | None) -> str | None:
+        """Devuelve la respuesta cacheada para `key`, o None si no está o expiró."""
+        if key is None:
+            return None
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: str | None, value: str) -> None:
+        """Guarda `value` bajo `key` (no hace nada si `key` es None)."""
+        if key is None:
+            return
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        """Número de respuestas retenidas (incluye expiradas aún no consultadas)."""
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Vacía la caché (los contadores se conservan)."""
+        self._entries.clear()
+
+
+_llm_cache: LLMCache | None = None
+
+
+def get_llm_cache() -> LLMCache:
+    """Devuelve la caché compartida por todos los servicios LLM del proceso.
+
+    Se construye en el primer uso a partir de `config.llm.cache`; deshabilitada,
+    sigue existiendo (para las métricas) pero nunca genera claves.
+    """
+    global _llm_cache
+    if _llm_cache is None:
+        cache_config = config.llm.cache
+        _llm_cache = LLMCache(
+            max_entries=cache_config.max_entries,
+            ttl_seconds=cache_config.ttl_seconds,
+            enabled=cache_config.enabled,
+        )
+    return _llm_cache
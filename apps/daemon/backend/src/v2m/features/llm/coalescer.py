@@ -0,0 +1,59 @@
+"""Unión de llamadas LLM idénticas concurrentes (single-flight).
+
+Si llega una solicitud igual a otra que todavía está en vuelo (mismo método, texto e
+idioma destino) no se abre una segunda llamada al backend: ambas esperan el mismo
+resultado. Ocurre, por ejemplo, con un atajo pulsado dos veces o con varios clientes
+pidiendo el refinamiento de la misma transcripción.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from v2m.features.llm.service import LLMService
+
+
+class CoalescingLLMService:
+    """Decorador de `LLMService` que comparte las llamadas idénticas en vuelo.
+
+    Expone el mismo protocolo que el servicio envuelto; cualquier otro atributo
+    (ej. `loaded()` del servicio local) se delega sin cambios.
+    """
+
+    def __init__(self, inner: LLMService) -> None:
+        """Inicializa el decorador.
+
+        Args:
+            inner: Servicio LLM real (Gemini, Ollama o Local).
+        """
+        self._inner = inner
+        self._inflight: dict[tuple[str, ...], asyncio.Task[str]] = {}
+
+    async def process_text(self, text: str) -> str:
+        """Refina `text`, reutilizando una llamada idéntica en vuelo si existe."""
+        return await self._coalesce(("process", text), lambda: self._inner.process_text(text))
+
+    async def translate_text(self, text: str, target_lang: str) -> str:
+        """Traduce `text`, reutilizando una llamada idéntica en vuelo si existe."""
+        return await self._coalesce(
+            ("translate", text, target_lang), lambda: self._inner.translate_text(text, target_lang)
+        )
+
+    async def _coalesce(self, key: tuple[str, ...], call: Callable[[], Awaitable[str]]) -> str:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        # shield: si un llamador se cancela, la llamada sigue para los demás
+        return await asyncio.shield(task)
+
+    def _forget(self, key: tuple[str, ...], task: asyncio.Task[str]) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def __getattr__(self, name: str) -> Any:
+        """Delega al servicio envuelto los atributos que el decorador no define."""
+        return getattr(self._inner, name)
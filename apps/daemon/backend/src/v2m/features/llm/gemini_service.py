@@ -7,15 +7,20 @@ para resiliencia ante fallos transitorios.
 """
 
 import os
+from collections.abc import AsyncIterator
 
-import httpx
 from google import genai
-from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 
+from v2m.features.llm.cache import get_llm_cache
+from v2m.features.llm.semantic_cache import get_semantic_cache
 from v2m.features.llm.service import LLMService
-from v2m.shared.config import BASE_DIR, config
+from v2m.shared.circuit_breaker import AsyncCircuitBreaker
+from v2m.shared.config import config
 from v2m.shared.errors import LLMError
+from v2m.shared.http import TRANSIENT_HTTP_ERRORS, llm_http_client_args
 from v2m.shared.logging import logger
+from v2m.shared.prompts import load_prompt
 
 
 class GeminiLLMService(LLMService):
@@ -46,37 +51,69 @@ class GeminiLLMService(LLMService):
         # --- Inicialización del cliente de la API ---
         # La librería de Google utiliza `GOOGLE_API_KEY` por defecto
         os.environ["GOOGLE_API_KEY"] = api_key
-        self.client = genai.Client(api_key=api_key)
+        self.client = genai.Client(api_key=api_key, http_options=self._http_options())
         self.model = gemini_config.model
         self.temperature = gemini_config.temperature
         self.max_tokens = gemini_config.max_tokens
+        self.translation_temperature = gemini_config.translation_temperature
+        self._cache = get_llm_cache()
+        self._semantic_cache = get_semantic_cache()
+        self._breaker = AsyncCircuitBreaker("gemini", error_type=LLMError, **config.llm.circuit_breaker.model_dump())
 
-        # Cargar prompt del sistema
-        prompt_path = BASE_DIR / "prompts" / "refine_system.txt"
+        # Cargar prompt del sistema (leído una vez por proceso)
+        self.system_instruction = load_prompt("refine_system") or "Eres un editor de texto experto."
+        # Configuración de generación del refinamiento: constante, se arma una vez
+        self._refine_config = {
+            "temperature": self.temperature,
+            "max_output_tokens": self.max_tokens,
+            "system_instruction": self.system_instruction,
+        }
+        # La traducción solo varía en el prompt de sistema (depende del idioma destino)
+        self._translate_config_base = {
+            "temperature": self.translation_temperature,
+            "max_output_tokens": self.max_tokens,
+        }
+
+    @staticmethod
+    def _http_options() -> genai.types.HttpOptions | None:
+        """Opciones HTTP con el pool compartido de clientes LLM.
+
+        El timeout lo gestiona el SDK (`request_timeout`, en milisegundos). Versiones de
+        google-genai sin `async_client_args` usan su cliente por defecto.
+        """
         try:
-            with open(prompt_path, encoding="utf-8") as f:
-                self.system_instruction = f.read()
-        except FileNotFoundError:
-            logger.warning("prompt del sistema no encontrado, usando valor por defecto")
-            self.system_instruction = "Eres un editor de texto experto."
-
-    # Estrategia de reintentos para errores transitorios de red (rate-limit, timeout).
-    # Tiempos reducidos para baja latencia: 0.5s, 1s, 2s (máx 3.5s total).
+            return genai.types.HttpOptions(
+                timeout=config.gemini.request_timeout * 1000,
+                async_client_args=llm_http_client_args(include_timeout=False),
+            )
+        except (TypeError, ValueError) as e:
+            logger.debug(f"google-genai sin async_client_args, usando cliente por defecto: {e}")
+            return None
+
+    # Estrategia de reintentos para errores transitorios de red (timeout, conexión).
+    # Espera aleatoria (full jitter) acotada a 1.5s: los reintentos de solicitudes
+    # concurrentes no se sincronizan. Con el backend caído corta el circuit breaker.
     @retry(
         stop=stop_after_attempt(config.gemini.retry_attempts),
-        wait=wait_exponential(
-            multiplier=0.5,
-            min=0.5,
-            max=2,
-        ),
-        retry=retry_if_exception_type((httpx.TimeoutException, httpx.NetworkError, ConnectionError)),
+        wait=wait_random_exponential(multiplier=0.3, max=1.5),
+        retry=retry_if_exception_type(TRANSIENT_HTTP_ERRORS),
         reraise=True,  # Re-lanzar la excepción si se agotan los intentos
     )
+    async def _generate(self, contents: list[dict], generation_config: dict) -> genai.types.GenerateContentResponse:
+        """Llama a `generate_content` reintentando solo errores de red transitorios.
+
+        Las excepciones salen sin envolver para que `tenacity` las reconozca; quien
+        llama las traduce a `LLMError` una vez agotados los reintentos, dentro de un
+        único `guard()` del breaker (una solicitud reintentada cuenta como un fallo).
+        """
+        return await self.client.aio.models.generate_content(
+            model=self.model, contents=contents, config=generation_config
+        )
+
     async def process_text(self, text: str) -> str:
         """Procesa un texto utilizando el modelo de Google Gemini.
 
-        Implementa una estrategia de reintentos con `tenacity` para manejar
-        errores transitorios de red o de la API de forma resiliente.
+        Los errores transitorios de red se reintentan con `tenacity` (ver `_generate`).
 
         Args:
             text: El texto a procesar.
@@ -87,47 +124,108 @@ class GeminiLLMService(LLMService):
         Raises:
             LLMError: Si la comunicación con la API falla después de todos los reintentos.
         """
-        try:
-            logger.info("procesando texto con gemini...")
-            generation_config = {
-                "temperature": self.temperature,
-                "max_output_tokens": self.max_tokens,
-                "system_instruction": self.system_instruction,
-            }
-
-            # --- Construcción del payload para la API ---
-            contents = [genai.types.Content(role="user", parts=[genai.types.Part(text=text)])]
-
-            response = await self.client.aio.models.generate_content(
-                model=self.model, contents=contents, config=generation_config
-            )
-            logger.info("procesamiento con gemini completado")
-            if response.text:
-                return response.text.strip()
-            else:
-                raise LLMError("respuesta vacía de gemini")
-        except Exception as e:
-            # --- Manejo de errores ---
-            # Se captura cualquier excepción de la librería de Google o de red
-            # y se relanza como un error de dominio para no filtrar detalles
-            # de la infraestructura a la capa de aplicación.
-            error_msg = str(e)
-            if "API key not valid" in error_msg:
-                logger.critical("GEMINI_API_KEY inválida o expirada")
-                raise LLMError("API Key de Gemini inválida, revisa tu archivo .env") from e
-
-            logger.error(f"error procesando texto con gemini: {e}")
-            raise LLMError("falló el procesamiento de texto con gemini") from e
+        cache_key = self._cache.build_key(self.model, self.system_instruction, text, self.temperature, self.max_tokens)
+        if (cached := self._cache.get(cache_key)) is not None:
+            logger.info("respuesta de gemini servida desde caché")
+            return cached
+
+        namespace = f"{self.model}\x1f{self.system_instruction}"
+        embedding = await self._semantic_cache.embed(text)
+        if (cached := self._semantic_cache.lookup(namespace, embedding)) is not None:
+            logger.info("respuesta de gemini servida desde caché semántica")
+            return cached
+
+        logger.info("procesando texto con gemini...")
+
+        # --- Construcción del payload para la API ---
+        # Forma dict: el SDK la normaliza sin construir objetos Content/Part en Python
+        contents = [{"role": "user", "parts": [{"text": text}]}]
+
+        # El breaker solo vigila el transporte: validar la respuesta queda fuera
+        async with self._breaker.guard():
+            try:
+                response = await self._generate(contents, self._refine_config)
+            except Exception as e:
+                # --- Manejo de errores ---
+                # Se captura cualquier excepción de la librería de Google o de red
+                # y se relanza como un error de dominio para no filtrar detalles
+                # de la infraestructura a la capa de aplicación.
+                error_msg = str(e)
+                if "API key not valid" in error_msg:
+                    logger.critical("GEMINI_API_KEY inválida o expirada")
+                    raise LLMError("API Key de Gemini inválida, revisa tu archivo .env") from e
+
+                logger.error(f"error procesando texto con gemini: {e}")
+                raise LLMError("falló el procesamiento de texto con gemini") from e
+
+        # Una respuesta vacía (p. ej. bloqueada por seguridad) no indica un backend caído
+        if not response.text:
+            raise LLMError("respuesta vacía de gemini")
+        logger.info("procesamiento con gemini completado")
+        result = response.text.strip()
+        self._cache.set(cache_key, result)
+        self._semantic_cache.add(namespace, embedding, result)
+        return result
+
+    async def process_text_stream(self, text: str) -> AsyncIterator[str]:
+        """Refina un texto con Gemini emitiendo fragmentos con `generate_content_stream`.
+
+        Sin reintentos: una vez emitido un fragmento no se puede repetir la llamada
+        sin duplicar texto en el consumidor. Los aciertos de caché se emiten en un
+        único fragmento y la respuesta completa se guarda al terminar el stream.
+
+        Args:
+            text: El texto a procesar.
+
+        Yields:
+            str: Fragmentos del texto refinado.
+
+        Raises:
+            LLMError: Si la API falla o la respuesta está vacía.
+        """
+        cache_key = self._cache.build_key(self.model, self.system_instruction, text, self.temperature, self.max_tokens)
+        namespace = f"{self.model}\x1f{self.system_instruction}"
+        embedding = None
+        if (cached := self._cache.get(cache_key)) is None:
+            embedding = await self._semantic_cache.embed(text)
+            cached = self._semantic_cache.lookup(namespace, embedding)
+        if cached is not None:
+            logger.info("respuesta de gemini servida desde caché")
+            yield cached
+            return
+
+        parts: list[str] = []
+        async with self._breaker.guard():
+            try:
+                logger.info("procesando texto con gemini (stream)...")
+                contents = [{"role": "user", "parts": [{"text": text}]}]
+
+                stream = await self.client.aio.models.generate_content_stream(
+                    model=self.model, contents=contents, config=self._refine_config
+                )
+                async for chunk in stream:
+                    if chunk.text:
+                        parts.append(chunk.text)
+                        yield chunk.text
+            except Exception as e:
+                if "API key not valid" in str(e):
+                    logger.critical("GEMINI_API_KEY inválida o expirada")
+                    raise LLMError("API Key de Gemini inválida, revisa tu archivo .env") from e
+                logger.error(f"error procesando texto con gemini: {e}")
+                raise LLMError("falló el procesamiento de texto con gemini") from e
+
+        result = "".join(parts).strip()
+        if not result:
+            raise LLMError("respuesta vacía de gemini")
+        logger.info("procesamiento con gemini completado")
+        self._cache.set(cache_key, result)
+        self._semantic_cache.add(namespace, embedding, result)
 
-    @retry(
-        stop=stop_after_attempt(config.gemini.retry_attempts),
-        wait=wait_exponential(multiplier=0.5, min=0.5, max=2),
-        retry=retry_if_exception_type((httpx.TimeoutException, httpx.NetworkError, ConnectionError)),
-        reraise=True,
-    )
     async def translate_text(self, text: str, target_lang: str) -> str:
         """Traduce un texto utilizando el modelo de Google Gemini.
 
+        Los errores transitorios de red se reintentan con `tenacity` (ver `_generate`).
+
         Args:
             text: El texto a traducir.
             target_lang: Idioma objetivo (ej. "es", "en", "fr").
@@ -135,36 +233,38 @@ class GeminiLLMService(LLMService):
         Returns:
             str: El texto traducido.
         """
-        try:
-            logger.info(f"traduciendo texto a {target_lang} con gemini...")
+        # Prompt de sistema específico para traducción
+        system_instruction = (
+            f"Eres un traductor experto. Traduce el siguiente texto al idioma '{target_lang}'. "
+            "Devuelve SOLO el texto traducido, sin explicaciones ni notas adicionales."
+        )
+        cache_key = self._cache.build_key(
+            self.model, system_instruction, text, self.translation_temperature, self.max_tokens
+        )
+        if (cached := self._cache.get(cache_key)) is not None:
+            logger.info("traducción de gemini servida desde caché")
+            return cached
 
-            # Prompt de sistema específico para traducción
-            system_instruction = (
-                f"Eres un traductor experto. Traduce el siguiente texto al idioma '{target_lang}'. "
-                "Devuelve SOLO el texto traducido, sin explicaciones ni notas adicionales."
-            )
+        logger.info(f"traduciendo texto a {target_lang} con gemini...")
 
-            generation_config = {
-                "temperature": config.gemini.translation_temperature,
-                "max_output_tokens": self.max_tokens,
-                "system_instruction": system_instruction,
-            }
+        generation_config = {**self._translate_config_base, "system_instruction": system_instruction}
+        contents = [{"role": "user", "parts": [{"text": text}]}]
 
-            contents = [genai.types.Content(role="user", parts=[genai.types.Part(text=text)])]
+        async with self._breaker.guard():
+            try:
+                response = await self._generate(contents, generation_config)
+            except Exception as e:
+                error_msg = str(e)
+                if "API key not valid" in error_msg:
+                    logger.critical("GEMINI_API_KEY inválida o expirada")
+                    raise LLMError("API Key de Gemini inválida") from e
 
-            response = await self.client.aio.models.generate_content(
-                model=self.model, contents=contents, config=generation_config
-            )
-            logger.info("traducción con gemini completada")
-            if response.text:
-                return response.text.strip()
-            else:
-                raise LLMError("respuesta vacía de gemini en traducción")
-        except Exception as e:
-            error_msg = str(e)
-            if "API key not valid" in error_msg:
-                logger.critical("GEMINI_API_KEY inválida o expirada")
-                raise LLMError("API Key de Gemini inválida") from e
-
-            logger.error(f"error traduciendo texto con gemini: {e}")
-            raise LLMError("falló la traducción con gemini") from e
+                logger.error(f"error traduciendo texto con gemini: {e}")
+                raise LLMError("falló la traducción con gemini") from e
+
+        if not response.text:
+            raise LLMError("respuesta vacía de gemini en traducción")
+        logger.info("traducción con gemini completada")
+        result = response.text.strip()
+        self._cache.set(cache_key, result)
+        return result
@@ -17,10 +17,14 @@ from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from typing import TYPE_CHECKING
 
+from v2m.features.llm.cache import get_llm_cache
+from v2m.features.llm.semantic_cache import get_semantic_cache
 from v2m.features.llm.service import LLMService
 from v2m.shared.config import BASE_DIR, config
 from v2m.shared.errors import LLMError
 from v2m.shared.logging import logger
+from v2m.shared.prompts import load_prompt
+from v2m.shared.utils.aio import iterate_in_thread
 
 if TYPE_CHECKING:
     from llama_cpp import Llama
@@ -55,14 +59,11 @@ class LocalLLMService(LLMService):
         self._model: Llama | None = None
         self._config = config.llm.local
         self._model_path = BASE_DIR / self._config.model_path
+        self._cache = get_llm_cache()
+        self._semantic_cache = get_semantic_cache()
 
-        # Cargar system prompt
-        prompt_path = BASE_DIR / "prompts" / "refine_system.txt"
-        try:
-            self.system_prompt = prompt_path.read_text(encoding="utf-8")
-        except FileNotFoundError:
-            logger.warning("prompt del sistema no encontrado, usando valor por defecto")
-            self.system_prompt = "Eres un editor de texto experto."
+        # Cargar system prompt (leído una vez por proceso)
+        self.system_prompt = load_prompt("refine_system") or "Eres un editor de texto experto."
 
     def _ensure_model_exists(self) -> None:
         """Verifica que el archivo del modelo existe en disco.
@@ -172,6 +173,20 @@ class LocalLLMService(LLMService):
         Raises:
             LLMError: Si el modelo no existe o hay errores de inferencia.
         """
+        # Un acierto de caché no necesita el modelo: se consulta antes del lazy loading
+        cache_key = self._cache.build_key(
+            str(self._model_path), self.system_prompt, text, self._config.temperature, self._config.max_tokens
+        )
+        if (cached := self._cache.get(cache_key)) is not None:
+            logger.info("respuesta del modelo local servida desde caché")
+            return cached
+
+        namespace = f"{self._model_path}\x1f{self.system_prompt}"
+        embedding = await self._semantic_cache.embed(text)
+        if (cached := self._semantic_cache.lookup(namespace, embedding)) is not None:
+            logger.info("respuesta del modelo local servida desde caché semántica")
+            return cached
+
         # Lazy loading si no está cargado
         if self._model is None:
             await asyncio.to_thread(self.load)
@@ -195,12 +210,76 @@ class LocalLLMService(LLMService):
 
             result = response["choices"][0]["message"]["content"].strip()
             logger.info("✅ procesamiento con modelo local completado")
+            self._cache.set(cache_key, result)
+            self._semantic_cache.add(namespace, embedding, result)
             return result
 
         except Exception as e:
             logger.error(f"error procesando texto con modelo local: {e}")
             raise LLMError(f"falló el procesamiento con modelo local: {e}") from e
 
+    async def process_text_stream(self, text: str) -> AsyncIterator[str]:
+        """Procesa texto con el modelo local emitiendo tokens a medida que se generan.
+
+        `create_chat_completion(stream=True)` es un generador bloqueante; se recorre
+        en un hilo con `iterate_in_thread` para no bloquear el event loop.
+
+        Args:
+            text: El texto a procesar/refinar.
+
+        Yields:
+            str: Fragmentos del texto procesado.
+
+        Raises:
+            LLMError: Si el modelo no existe o hay errores de inferencia.
+        """
+        cache_key = self._cache.build_key(
+            str(self._model_path), self.system_prompt, text, self._config.temperature, self._config.max_tokens
+        )
+        namespace = f"{self._model_path}\x1f{self.system_prompt}"
+        embedding = None
+        if (cached := self._cache.get(cache_key)) is None:
+            embedding = await self._semantic_cache.embed(text)
+            cached = self._semantic_cache.lookup(namespace, embedding)
+        if cached is not None:
+            logger.info("respuesta del modelo local servida desde caché")
+            yield cached
+            return
+
+        if self._model is None:
+            await asyncio.to_thread(self.load)
+
+        messages = [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": text},
+        ]
+
+        parts: list[str] = []
+        try:
+            logger.info("procesando texto con modelo local (stream)...")
+            chunks = iterate_in_thread(
+                lambda: self._model.create_chat_completion(  # type: ignore
+                    messages=messages,
+                    max_tokens=self._config.max_tokens,
+                    temperature=self._config.temperature,
+                    stream=True,
+                )
+            )
+            async for chunk in chunks:
+                if content := chunk["choices"][0]["delta"].get("content"):
+                    parts.append(content)
+                    yield content
+        except Exception as e:
+            logger.error(f"error procesando texto con modelo local: {e}")
+            raise LLMError(f"falló el procesamiento con modelo local: {e}") from e
+
+        result = "".join(parts).strip()
+        if not result:
+            raise LLMError("respuesta vacía del modelo local")
+        logger.info("✅ procesamiento con modelo local completado")
+        self._cache.set(cache_key, result)
+        self._semantic_cache.add(namespace, embedding, result)
+
     async def translate_text(self, text: str, target_lang: str) -> str:
         """Traduce texto usando el modelo local.
 
@@ -214,13 +293,23 @@ class LocalLLMService(LLMService):
         Raises:
             LLMError: Si falla la traducción.
         """
-        if self._model is None:
-            await asyncio.to_thread(self.load)
-
         system_instruction = (
             f"Eres un traductor experto. Traduce el siguiente texto al idioma '{target_lang}'. "
             "Devuelve SOLO el texto traducido, sin explicaciones ni notas adicionales."
         )
+        cache_key = self._cache.build_key(
+            str(self._model_path),
+            system_instruction,
+            text,
+            self._config.translation_temperature,
+            self._config.max_tokens,
+        )
+        if (cached := self._cache.get(cache_key)) is not None:
+            logger.info("traducción del modelo local servida desde caché")
+            return cached
+
+        if self._model is None:
+            await asyncio.to_thread(self.load)
 
         messages = [
             {"role": "system", "content": system_instruction},
@@ -239,6 +328,7 @@ class LocalLLMService(LLMService):
 
             result = response["choices"][0]["message"]["content"].strip()
             logger.info("✅ traducción con modelo local completada")
+            self._cache.set(cache_key, result)
             return result
 
         except Exception as e:
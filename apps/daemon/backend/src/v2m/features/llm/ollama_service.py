@@ -7,21 +7,34 @@ respuestas fiables y analizables para tareas de refinamiento de texto.
 Características clave:
 - `AsyncClient` para inferencia no bloqueante.
 - `format=JSON schema` fuerza respuestas estructuradas válidas.
+- `process_text_stream` emite texto plano token a token (`stream=True`).
 - `options.keep_alive` gestiona la carga de VRAM en GPUs de consumidor.
-- Reintentos con `tenacity` para resiliencia contra fallos transitorios.
+- `warmup()` carga el modelo al arrancar el daemon (generación de 1 token).
+- Reintentos con `tenacity` para resiliencia contra fallos de red transitorios.
 """
 
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING, Any
+
 import httpx
 from ollama import AsyncClient
-from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 
-from v2m.features.llm.schemas import CorrectionResult
+from v2m.features.llm.cache import get_llm_cache
+from v2m.features.llm.schemas import CORRECTION_RESULT_SCHEMA, parse_corrected_text
+from v2m.features.llm.semantic_cache import get_semantic_cache
 from v2m.features.llm.service import LLMService
-from v2m.shared.config import BASE_DIR, config
+from v2m.shared.circuit_breaker import AsyncCircuitBreaker
+from v2m.shared.config import config
 from v2m.shared.errors import LLMError
+from v2m.shared.http import TRANSIENT_HTTP_ERRORS, llm_http_client_args
 from v2m.shared.logging import logger
+from v2m.shared.prompts import load_prompt
+
+if TYPE_CHECKING:
+    from ollama import ChatResponse
 
 
 class OllamaLLMService(LLMService):
@@ -38,27 +51,61 @@ class OllamaLLMService(LLMService):
     def __init__(self) -> None:
         """Inicializa el servicio LLM de Ollama."""
         self._config = config.llm.ollama
-        self._client = AsyncClient(host=self._config.host)
+        # Pool y timeouts compartidos con el resto de clientes LLM (el default de
+        # ollama no tiene timeout)
+        self._client = AsyncClient(host=self._config.host, **llm_http_client_args())
+        self._cache = get_llm_cache()
+        self._semantic_cache = get_semantic_cache()
+        self._breaker = AsyncCircuitBreaker("ollama", error_type=LLMError, **config.llm.circuit_breaker.model_dump())
+
+        # Cargar prompt del sistema (leído una vez por proceso)
+        self.system_prompt = (
+            load_prompt("refine_system") or "Eres un editor experto. Corrige gramática y coherencia del texto."
+        )
+        # Opciones de generación del refinamiento: constantes, se arman una vez
+        self._refine_options = {"temperature": self._config.temperature, "keep_alive": self._config.keep_alive}
 
-        # Cargar prompt del sistema
-        prompt_path = BASE_DIR / "prompts" / "refine_system.txt"
+    async def warmup(self) -> None:
+        """Carga el modelo en Ollama con una generación de un solo token.
+
+        Sin esto la primera solicitud real paga la carga del modelo (segundos en un
+        7B). Un fallo solo se registra: Ollama puede no estar levantado todavía y la
+        primera solicitud volverá a intentarlo.
+        """
         try:
-            self.system_prompt = prompt_path.read_text(encoding="utf-8")
-        except FileNotFoundError:
-            logger.warning("prompt del sistema no encontrado, usando valor por defecto")
-            self.system_prompt = "Eres un editor experto. Corrige gramática y coherencia del texto."
+            await self._client.generate(
+                model=self._config.model,
+                prompt="ok",
+                options={"num_predict": 1},
+                keep_alive=self._config.keep_alive,
+            )
+            logger.info(f"✅ modelo de ollama precargado ({self._config.model})")
+        except Exception as e:
+            logger.warning(f"no se pudo precargar el modelo de ollama: {e}")
 
+    # Reintentos con espera aleatoria (full jitter) acotada a 1.5s; con el backend
+    # caído corta el circuit breaker
     @retry(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=0.5, min=0.5, max=2),
-        retry=retry_if_exception_type((httpx.TimeoutException, httpx.NetworkError, ConnectionError)),
+        wait=wait_random_exponential(multiplier=0.3, max=1.5),
+        retry=retry_if_exception_type(TRANSIENT_HTTP_ERRORS),
         reraise=True,
     )
+    async def _chat(self, **kwargs: Any) -> ChatResponse:
+        """Llama a `AsyncClient.chat` reintentando solo errores de red transitorios.
+
+        Las excepciones salen sin envolver para que `tenacity` las reconozca; quien
+        llama las traduce a `LLMError` una vez agotados los reintentos, dentro de un
+        único `guard()` del breaker (una solicitud reintentada cuenta como un fallo).
+        """
+        return await self._client.chat(model=self._config.model, **kwargs)
+
     async def process_text(self, text: str) -> str:
         """Procesa texto utilizando Ollama con Salidas Estructuradas.
 
         Utiliza el parámetro `format` con un esquema JSON derivado del modelo
-        Pydantic `CorrectionResult` para forzar respuestas estructuradas válidas.
+        Pydantic `CorrectionResult` para forzar respuestas estructuradas válidas,
+        y `parse_corrected_text` para validarlas.
 
         Args:
             text: El texto a procesar/refinar.
@@ -69,40 +116,105 @@ class OllamaLLMService(LLMService):
         Raises:
             LLMError: Si la conexión a Ollama falla o la respuesta es inválida.
         """
-        try:
-            logger.info(f"procesando texto con ollama ({self._config.model})...")
+        cache_key = self._cache.build_key(self._config.model, self.system_prompt, text, self._config.temperature)
+        if (cached := self._cache.get(cache_key)) is not None:
+            logger.info("respuesta de ollama servida desde caché")
+            return cached
 
-            response = await self._client.chat(
-                model=self._config.model,
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": text},
-                ],
-                format=CorrectionResult.model_json_schema(),
-                options={
-                    "temperature": self._config.temperature,
-                    "keep_alive": self._config.keep_alive,
-                },
-            )
+        namespace = f"{self._config.model}\x1f{self.system_prompt}"
+        embedding = await self._semantic_cache.embed(text)
+        if (cached := self._semantic_cache.lookup(namespace, embedding)) is not None:
+            logger.info("respuesta de ollama servida desde caché semántica")
+            return cached
 
-            # Parsear respuesta JSON estructurada
-            result = CorrectionResult.model_validate_json(response.message.content)
-            logger.info("✅ procesamiento con ollama completado")
-            return result.corrected_text
+        logger.info(f"procesando texto con ollama ({self._config.model})...")
+        # El breaker solo vigila el transporte: validar la respuesta queda fuera
+        async with self._breaker.guard():
+            try:
+                response = await self._chat(
+                    messages=[
+                        {"role": "system", "content": self.system_prompt},
+                        {"role": "user", "content": text},
+                    ],
+                    format=CORRECTION_RESULT_SCHEMA,
+                    options=self._refine_options,
+                )
+            except httpx.ConnectError as e:
+                logger.error(f"no se pudo conectar a ollama en {self._config.host}: {e}")
+                raise LLMError(f"Ollama no disponible en {self._config.host}") from e
+            except Exception as e:
+                logger.error(f"error procesando texto con ollama: {e}")
+                raise LLMError(f"falló el procesamiento con ollama: {e}") from e
 
-        except httpx.ConnectError as e:
-            logger.error(f"no se pudo conectar a ollama en {self._config.host}: {e}")
-            raise LLMError(f"Ollama no disponible en {self._config.host}") from e
-        except Exception as e:
-            logger.error(f"error procesando texto con ollama: {e}")
+        # Parsear respuesta JSON estructurada; una respuesta fuera de esquema no indica un backend caído
+        try:
+            corrected_text = parse_corrected_text(response.message.content)
+        except ValueError as e:
+            logger.error(f"respuesta de ollama fuera de esquema: {e}")
             raise LLMError(f"falló el procesamiento con ollama: {e}") from e
+        logger.info("✅ procesamiento con ollama completado")
+        self._cache.set(cache_key, corrected_text)
+        self._semantic_cache.add(namespace, embedding, corrected_text)
+        return corrected_text
+
+    async def process_text_stream(self, text: str) -> AsyncIterator[str]:
+        """Refina texto con Ollama emitiendo los fragmentos de `chat(stream=True)`.
+
+        No usa el esquema JSON de `process_text`: un objeto JSON parcial no se puede
+        validar ni mostrar al usuario, así que el stream pide texto plano con el
+        mismo prompt de sistema. Los aciertos de caché se emiten en un solo fragmento.
+
+        Args:
+            text: El texto a procesar/refinar.
+
+        Yields:
+            str: Fragmentos del texto corregido.
+
+        Raises:
+            LLMError: Si la conexión a Ollama falla durante el stream.
+        """
+        cache_key = self._cache.build_key(self._config.model, self.system_prompt, text, self._config.temperature)
+        namespace = f"{self._config.model}\x1f{self.system_prompt}"
+        embedding = None
+        if (cached := self._cache.get(cache_key)) is None:
+            embedding = await self._semantic_cache.embed(text)
+            cached = self._semantic_cache.lookup(namespace, embedding)
+        if cached is not None:
+            logger.info("respuesta de ollama servida desde caché")
+            yield cached
+            return
+
+        parts: list[str] = []
+        async with self._breaker.guard():
+            try:
+                logger.info(f"procesando texto con ollama ({self._config.model}, stream)...")
+                stream = await self._client.chat(
+                    model=self._config.model,
+                    messages=[
+                        {"role": "system", "content": self.system_prompt},
+                        {"role": "user", "content": text},
+                    ],
+                    stream=True,
+                    options=self._refine_options,
+                )
+                async for chunk in stream:
+                    if content := chunk.message.content:
+                        parts.append(content)
+                        yield content
+            except httpx.ConnectError as e:
+                logger.error(f"no se pudo conectar a ollama en {self._config.host}: {e}")
+                raise LLMError(f"Ollama no disponible en {self._config.host}") from e
+            except Exception as e:
+                logger.error(f"error procesando texto con ollama: {e}")
+                raise LLMError(f"falló el procesamiento con ollama: {e}") from e
+
+        result = "".join(parts).strip()
+        if not result:
+            raise LLMError("respuesta vacía de ollama")
+        logger.info("✅ procesamiento con ollama completado")
+        self._cache.set(cache_key, result)
+        self._semantic_cache.add(namespace, embedding, result)
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=0.5, min=0.5, max=2),
-        retry=retry_if_exception_type((httpx.TimeoutException, httpx.NetworkError, ConnectionError)),
-        reraise=True,
-    )
     async def translate_text(self, text: str, target_lang: str) -> str:
         """Traduce texto utilizando Ollama.
 
@@ -116,29 +228,35 @@ class OllamaLLMService(LLMService):
         Raises:
             LLMError: Si la traducción falla.
         """
-        try:
-            logger.info(f"traduciendo texto a {target_lang} con ollama...")
+        system_instruction = (
+            f"Eres un traductor experto. Traduce el siguiente texto al idioma '{target_lang}'. "
+            "Devuelve SOLO el texto traducido, sin explicaciones ni notas adicionales."
+        )
+        cache_key = self._cache.build_key(
+            self._config.model, system_instruction, text, self._config.translation_temperature
+        )
+        if (cached := self._cache.get(cache_key)) is not None:
+            logger.info("traducción de ollama servida desde caché")
+            return cached
 
-            system_instruction = (
-                f"Eres un traductor experto. Traduce el siguiente texto al idioma '{target_lang}'. "
-                "Devuelve SOLO el texto traducido, sin explicaciones ni notas adicionales."
-            )
+        logger.info(f"traduciendo texto a {target_lang} con ollama...")
+        async with self._breaker.guard():
+            try:
+                response = await self._chat(
+                    messages=[
+                        {"role": "system", "content": system_instruction},
+                        {"role": "user", "content": text},
+                    ],
+                    options={
+                        "temperature": self._config.translation_temperature,
+                        "keep_alive": self._config.keep_alive,
+                    },
+                )
+            except Exception as e:
+                logger.error(f"error traduciendo con ollama: {e}")
+                raise LLMError(f"falló la traducción con ollama: {e}") from e
 
-            response = await self._client.chat(
-                model=self._config.model,
-                messages=[
-                    {"role": "system", "content": system_instruction},
-                    {"role": "user", "content": text},
-                ],
-                options={
-                    "temperature": self._config.translation_temperature,
-                    "keep_alive": self._config.keep_alive,
-                },
-            )
-
-            logger.info("✅ traducción con ollama completada")
-            return response.message.content.strip()
-
-        except Exception as e:
-            logger.error(f"error traduciendo con ollama: {e}")
-            raise LLMError(f"falló la traducción con ollama: {e}") from e
+        logger.info("✅ traducción con ollama completada")
+        translated = response.message.content.strip()
+        self._cache.set(cache_key, translated)
+        return translated
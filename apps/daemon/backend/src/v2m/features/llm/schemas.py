@@ -2,6 +2,11 @@
 
 from pydantic import BaseModel, Field
 
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
 
 class CorrectionResult(BaseModel):
     """Modelo de salida estructurada para refinamiento de texto.
@@ -16,3 +21,41 @@ class CorrectionResult(BaseModel):
 
     corrected_text: str = Field(description="Texto corregido con gramática y coherencia mejoradas")
     explanation: str | None = Field(default=None, description="Cambios realizados al texto original")
+
+
+# JSON schema para el parámetro `format` de Ollama: se construye una vez al importar en
+# lugar de recorrer los campos del modelo en cada solicitud
+CORRECTION_RESULT_SCHEMA = CorrectionResult.model_json_schema()
+
+if msgspec is not None:
+
+    class _CorrectionResultStruct(msgspec.Struct, frozen=True):
+        """Espejo de `CorrectionResult` para decodificar respuestas con msgspec."""
+
+        corrected_text: str
+        explanation: str | None = None
+
+    _CORRECTION_DECODER = msgspec.json.Decoder(_CorrectionResultStruct)
+else:
+    _CORRECTION_DECODER = None
+
+
+def parse_corrected_text(raw: str | bytes) -> str:
+    """Extrae `corrected_text` de una respuesta JSON con la forma de `CorrectionResult`.
+
+    Usa el decodificador de msgspec (opcional) si está instalado: valida la misma
+    forma sin construir un modelo Pydantic por respuesta. Sin msgspec recurre a
+    `CorrectionResult.model_validate_json`.
+
+    Args:
+        raw: JSON devuelto por el LLM.
+
+    Returns:
+        str: El texto corregido.
+
+    Raises:
+        msgspec.ValidationError | pydantic.ValidationError: Si el JSON no cumple el esquema.
+    """
+    if _CORRECTION_DECODER is not None:
+        return _CORRECTION_DECODER.decode(raw).corrected_text
+    return CorrectionResult.model_validate_json(raw).corrected_text
@@ -0,0 +1,213 @@
+"""Caché semántica de refinamientos LLM para transcripciones casi idénticas.
+
+Los dictados se repiten con variaciones mínimas ("abre el navegador" / "abre el
+navegador por favor"). La caché exacta (`cache.py`) no los reconoce; esta capa compara
+embeddings de oraciones y, si la similitud coseno con un texto ya refinado supera el
+umbral, devuelve esa respuesta sin invocar al LLM.
+
+Es aproximada por definición: con un umbral bajo puede devolver el refinamiento de un
+texto distinto. Por eso es opt-in (`[llm.semantic_cache] enabled = true`) y requiere la
+dependencia opcional `sentence-transformers`.
+
+Diseño:
+    - Embeddings normalizados en una matriz contigua (N, dim) float32: la similitud de
+      una consulta contra todas las entradas es un único producto matriz-vector (BLAS).
+    - Inserción FIFO sobre un ring (puntero de escritura): O(dim) por inserción, sin
+      desplazar la matriz.
+    - Cada entrada pertenece a un espacio de nombres (modelo + prompt de sistema), así
+      una respuesta solo se reutiliza para la misma tarea.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import hashlib
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from v2m.shared.config import config
+from v2m.shared.logging import logger
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+
+class SemanticCache:
+    """Caché de respuestas indexada por similitud coseno de embeddings.
+
+    El modelo de embeddings se carga en `warmup()` al arrancar o, si no, en el primer
+    uso (siempre fuera del event loop y una sola vez). Si
+    `sentence-transformers` no está instalado la caché se desactiva sola: `embed`
+    devuelve None y `lookup`/`add` ignoran ese None, igual que `LLMCache` con claves.
+
+    Atributos:
+        hits: Consultas resueltas desde la caché.
+        misses: Consultas que no superaron el umbral.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        threshold: float,
+        max_entries: int,
+        persist_path: Path | None = None,
+        enabled: bool = True,
+    ) -> None:
+        """Inicializa la caché (sin cargar todavía el modelo de embeddings).
+
+        Args:
+            model_name: Modelo de sentence-transformers (ej. 'all-MiniLM-L6-v2').
+            threshold: Similitud coseno mínima para reutilizar una respuesta.
+            max_entries: Capacidad; al llenarse se reemplaza la entrada más antigua.
+            persist_path: Archivo `.npz` donde se guarda la caché al salir, o None.
+            enabled: Si es False, `embed` siempre devuelve None.
+        """
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._model_name = model_name
+        self._threshold = threshold
+        self._max_entries = max_entries
+        self._persist_path = persist_path
+        self._model = None
+        # Serializa la carga perezosa: `embed` corre en hilos de `asyncio.to_thread`
+        self._model_lock = threading.Lock()
+        # Se dimensionan al conocer la dimensión del modelo
+        self._embeddings: np.ndarray | None = None
+        self._namespaces = np.zeros(max_entries, dtype=np.int64)
+        self._responses: list[str] = [""] * max_entries
+        self._size = 0
+        self._next = 0
+
+    async def warmup(self) -> None:
+        """Carga el modelo de embeddings en un hilo para que la primera consulta no lo pague."""
+        if self.enabled:
+            await asyncio.to_thread(self._ensure_model)
+
+    async def embed(self, text: str) -> np.ndarray | None:
+        """Calcula el embedding normalizado de `text` en un hilo, o None si está desactivada."""
+        if not self.enabled:
+            return None
+        return await asyncio.to_thread(self._encode, text)
+
+    def lookup(self, namespace: str, embedding: np.ndarray | None) -> str | None:
+        """Devuelve la respuesta más similar del mismo espacio de nombres si supera el umbral."""
+        if embedding is None:
+            return None
+        if self._size:
+            sims = self._embeddings[: self._size] @ embedding
+            sims[self._namespaces[: self._size] != self._namespace_id(namespace)] = -1.0
+            best = int(np.argmax(sims))
+            if sims[best] >= self._threshold:
+                self.hits += 1
+                return self._responses[best]
+        self.misses += 1
+        return None
+
+    def add(self, namespace: str, embedding: np.ndarray | None, response: str) -> None:
+        """Guarda `response` para `embedding`, reemplazando la entrada más antigua si está llena."""
+        if embedding is None:
+            return
+        slot = self._next
+        self._embeddings[slot] = embedding
+        self._namespaces[slot] = self._namespace_id(namespace)
+        self._responses[slot] = response
+        self._next = (slot + 1) % self._max_entries
+        self._size = min(self._size + 1, self._max_entries)
+
+    def __len__(self) -> int:
+        """Número de respuestas retenidas."""
+        return self._size
+
+    def save(self) -> None:
+        """Persiste la caché en `persist_path` (sin pickle: texto como array unicode)."""
+        if self._persist_path is None or not self._size:
+            return
+        try:
+            np.savez(
+                self._persist_path,
+                model=np.array(self._model_name),
+                embeddings=self._embeddings[: self._size],
+                namespaces=self._namespaces[: self._size],
+                responses=np.array(self._responses[: self._size]),
+                next=np.array(self._next),
+            )
+        except OSError as e:
+            logger.warning(f"no se pudo guardar la caché semántica: {e}")
+
+    def _encode(self, text: str) -> np.ndarray | None:
+        if not self._ensure_model():
+            return None
+        embedding = self._model.encode(text, normalize_embeddings=True, convert_to_numpy=True)
+        return embedding.astype(np.float32, copy=False)
+
+    def _ensure_model(self) -> bool:
+        """Carga el modelo una sola vez aunque lleguen consultas concurrentes; True si está listo."""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._load_model()
+        return self._model is not None
+
+    def _load_model(self) -> None:
+        if SentenceTransformer is None:
+            logger.warning("caché semántica desactivada: instala sentence-transformers para usarla")
+            self.enabled = False
+            return
+        logger.info(f"cargando modelo de embeddings: {self._model_name}")
+        model = SentenceTransformer(self._model_name, device="cpu")
+        self._allocate(model.get_sentence_embedding_dimension())
+        self._restore()
+        # Se publica al final: quien vea `_model` fuera del lock ya encuentra la matriz lista
+        self._model = model
+
+    def _allocate(self, dim: int) -> None:
+        self._embeddings = np.zeros((self._max_entries, dim), dtype=np.float32)
+
+    def _restore(self) -> None:
+        """Recupera la caché persistida si corresponde al mismo modelo y dimensión."""
+        if self._persist_path is None or not self._persist_path.exists():
+            return
+        try:
+            with np.load(self._persist_path) as data:
+                embeddings = data["embeddings"]
+                if str(data["model"]) != self._model_name or embeddings.shape[1] != self._embeddings.shape[1]:
+                    return
+                size = min(len(embeddings), self._max_entries)
+                self._embeddings[:size] = embeddings[:size]
+                self._namespaces[:size] = data["namespaces"][:size]
+                self._responses[:size] = data["responses"][:size].tolist()
+                self._size = size
+                self._next = int(data["next"]) % self._max_entries
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"no se pudo restaurar la caché semántica: {e}")
+
+    @staticmethod
+    def _namespace_id(namespace: str) -> int:
+        digest = hashlib.blake2b(namespace.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little", signed=True)
+
+
+_semantic_cache: SemanticCache | None = None
+
+
+def get_semantic_cache() -> SemanticCache:
+    """Devuelve la caché semántica compartida, construida desde `config.llm.semantic_cache`."""
+    global _semantic_cache
+    if _semantic_cache is None:
+        cache_config = config.llm.semantic_cache
+        _semantic_cache = SemanticCache(
+            model_name=cache_config.model,
+            threshold=cache_config.threshold,
+            max_entries=cache_config.max_entries,
+            persist_path=cache_config.persist_path,
+            enabled=cache_config.enabled,
+        )
+        if cache_config.enabled:
+            atexit.register(_semantic_cache.save)
+    return _semantic_cache
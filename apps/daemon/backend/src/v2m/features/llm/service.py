@@ -5,6 +5,7 @@ Define la interfaz (Protocol) para interactuar con proveedores de LLM
 con las operaciones requeridas por los casos de uso de la aplicación.
 """
 
+from collections.abc import AsyncIterator
 from typing import Protocol, runtime_checkable
 
 
@@ -23,6 +24,21 @@ class LLMService(Protocol):
         """
         ...
 
+    def process_text_stream(self, text: str) -> AsyncIterator[str]:
+        """Refina un bloque de texto emitiendo fragmentos a medida que el modelo los genera.
+
+        El consumidor recibe el primer fragmento tras el TTFT del modelo en lugar de
+        esperar la respuesta completa. La concatenación de los fragmentos equivale
+        (salvo espacios en los extremos) al resultado de `process_text`.
+
+        Args:
+            text: El texto original.
+
+        Yields:
+            str: Fragmentos del texto refinado.
+        """
+        ...
+
     async def translate_text(self, text: str, target_lang: str) -> str:
         """Traduce un bloque de texto al idioma especificado.
 
@@ -1,16 +1,53 @@
 import asyncio
+import contextlib
 import gc
 import logging
+import os
 import sys
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from collections.abc import AsyncIterator, Callable
 from typing import Any
 
+import numpy as np
 import psutil
-from faster_whisper import WhisperModel
+from faster_whisper import BatchedInferencePipeline, WhisperModel
+
+from v2m.shared.utils.aio import iterate_in_thread
+from v2m.shared.utils.env import cuda_info
 
 logger = logging.getLogger(__name__)
 
+# Cuantización por defecto según dispositivo ("auto"). int8_float16 guarda los pesos en
+# int8 (≈50% menos VRAM que float16) y usa las rutas int8 de los Tensor Cores; en CPU,
+# int8 aprovecha las GEMM int8 (AVX512-VNNI) de CTranslate2.
+DEFAULT_COMPUTE_TYPES = {"cuda": "int8_float16", "cpu": "int8"}
+
+# Hilos de CTranslate2 en CPU: la mitad de los núcleos, para no sobresuscribir la
+# máquina junto al hilo de inferencia y el resto del daemon.
+CPU_THREADS = max(1, (os.cpu_count() or 2) // 2)
+
+# Silencio decodificado tras la precarga: la primera inferencia real ya no paga la
+# selección de kernels ni la reserva de workspace de CTranslate2. La duración da
+# igual para la forma de los tensores (el extractor siempre rellena a 30 s); 2 s
+# acotan el coste en CPU.
+WARMUP_SAMPLES = 2 * 16000
+
+
+def _as_model_input(audio: Any) -> Any:
+    """Entrega a faster-whisper audio float32 contiguo (sin copia si ya lo es).
+
+    faster-whisper calcula el espectrograma con numpy en CPU y CTranslate2 copia las
+    features resultantes al dispositivo; no acepta tensores de torch, así que no hay
+    buffer pinned que reutilizar. Lo que sí evita esto es que un array float64 o no
+    contiguo arrastre copias y aritmética en doble precisión por todo el extractor.
+    Rutas de archivo y buffers binarios pasan sin cambios.
+    """
+    if isinstance(audio, np.ndarray):
+        return np.ascontiguousarray(audio, dtype=np.float32)
+    return audio
+
 
 def _safe_log(level: int, msg: str) -> None:
     """Log safely, suppressing errors when interpreter is shutting down."""
@@ -24,6 +61,57 @@ def _safe_log(level: int, msg: str) -> None:
         pass
 
 
+class _InferenceThread:
+    """Hilo dedicado de larga vida que ejecuta trabajos en orden FIFO.
+
+    Reemplaza a un `ThreadPoolExecutor(max_workers=1)`: despachar un trabajo es un
+    append a un deque más un notify, y el resultado vuelve al event loop con
+    `call_soon_threadsafe` sobre un `asyncio.Future`, sin el `concurrent.futures.Future`
+    intermedio ni el semáforo del pool. El hilo arranca con el primer trabajo.
+    """
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._inbox: deque[tuple[Callable[[], Any], asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._ready = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    def run(self, func: Callable[[], Any]) -> asyncio.Future:
+        """Encola `func()` y devuelve un future del loop actual con su resultado."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._ready:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._serve, name=self._name, daemon=True)
+                self._thread.start()
+            self._inbox.append((func, loop, future))
+            self._ready.notify()
+        return future
+
+    def _serve(self) -> None:
+        while True:
+            with self._ready:
+                while not self._inbox:
+                    self._ready.wait()
+                func, loop, future = self._inbox.popleft()
+            try:
+                outcome = (func(), None)
+            except BaseException as e:
+                outcome = (None, e)
+            # RuntimeError: loop cerrado (apagado del daemon), nadie espera ya el resultado
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(_resolve, future, *outcome)
+
+
+def _resolve(future: asyncio.Future, result: Any, error: BaseException | None) -> None:
+    if future.done():  # El llamador canceló la espera
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
 class PersistentWhisperWorker:
     """Gestiona una instancia persistente del modelo Whisper en un hilo dedicado.
 
@@ -34,32 +122,40 @@ class PersistentWhisperWorker:
         self,
         model_size: str,
         device: str = "cuda",
-        compute_type: str = "float16",
+        compute_type: str = "auto",
         device_index: int = 0,
         num_workers: int = 1,
         keep_warm: bool = True,
+        batch_size: int = 1,
     ):
         """Inicializa el trabajador persistente de Whisper.
 
         Args:
             model_size: Tamaño del modelo Whisper (tiny, base, etc.).
             device: Dispositivo de cómputo (cuda o cpu).
-            compute_type: Precisión de cómputo (float16, int8, etc.).
+            compute_type: Precisión de cómputo (float16, int8, etc.). "auto" elige
+                int8_float16 en cuda e int8 en cpu.
             device_index: Índice de la GPU si se usa cuda.
             num_workers: Número de hilos internos de Whisper.
             keep_warm: Si se debe mantener el modelo en memoria tras la inferencia.
+            batch_size: Ventanas de voz decodificadas por lote en `transcribe` (1 = secuencial).
         """
         self.model_size = model_size
         self.device = device
-        self.compute_type = compute_type
+        self._auto_compute_type = compute_type == "auto"
+        self.compute_type = DEFAULT_COMPUTE_TYPES.get(device, "default") if self._auto_compute_type else compute_type
         self.device_index = device_index
         self.num_workers_whisper = num_workers
         self.keep_warm = keep_warm
+        self.batch_size = batch_size
 
         self._model: WhisperModel | None = None
+        self._pipeline: BatchedInferencePipeline | None = None
         self._lock = asyncio.Lock()
         # Single worker strict for GPU isolation
-        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper_worker")
+        self._thread = _InferenceThread("whisper_worker")
+        # Secuencia de la última solicitud de submit_latest (las anteriores en espera se descartan)
+        self._latest_seq = 0
 
     async def initialize(self):
         """Pre-loads the model if keep_warm is True."""
@@ -67,77 +163,154 @@ class PersistentWhisperWorker:
             async with self._lock:
                 await self._load_model()
 
+    async def preload(self) -> None:
+        """Ejecuta `initialize_sync` en el hilo de inferencia con el lock tomado.
+
+        Pensado para el warmup del arranque en background: una inferencia que llegue
+        mientras tanto espera el lock y encuentra el modelo cargado, en lugar de ver
+        `_model is None` y cargar una segunda copia en paralelo.
+        """
+        async with self._lock:
+            await self._thread.run(self.initialize_sync)
+
     def initialize_sync(self):
         """Carga síncrona para warmup en hilos (Container)."""
         if self.keep_warm and self._model is None:
             _safe_log(logging.INFO, f"Precargando modelo {self.model_size} en {self.device}...")
 
-            # Verify CUDA availability if requested
+            # Verify CUDA availability if requested (sondeo cacheado por proceso)
             if self.device == "cuda":
-                try:
-                    import torch
-
-                    if not torch.cuda.is_available():
-                        _safe_log(logging.WARNING, "CUDA solicitado pero no disponible, usando CPU")
-                        self.device = "cpu"
-                    else:
-                        gpu_name = torch.cuda.get_device_name(self.device_index)
-                        _safe_log(logging.INFO, f"GPU detectada: {gpu_name}")
-                except ImportError:
+                info = cuda_info()
+                if not info.has_torch:
                     _safe_log(logging.DEBUG, "PyTorch no disponible para verificación de CUDA")
+                elif not info.available:
+                    _safe_log(logging.WARNING, "CUDA solicitado pero no disponible, usando CPU")
+                    self.device = "cpu"
+                    if self._auto_compute_type:
+                        self.compute_type = DEFAULT_COMPUTE_TYPES["cpu"]
+                elif self.device_index < len(info.device_names):
+                    _safe_log(logging.INFO, f"GPU detectada: {info.device_names[self.device_index]}")
 
             self._model = self._create_model()
+            self._warmup(self._model)
             _safe_log(logging.INFO, f"Modelo precargado. [device={self.device}, compute_type={self.compute_type}]")
 
     async def run_inference(self, func, *args, **kwargs):
-        """Ejecuta una función de inferencia (que usa el modelo) en el executor dedicado.
+        """Ejecuta una función de inferencia (que usa el modelo) en el hilo de inferencia dedicado.
 
         La función `func` debe aceptar `model` como primer argumento.
         Incluye métricas de latencia para diagnóstico.
         """
         async with self._lock:
-            if self._model is None:
-                await self._load_model()
-            elif not self.keep_warm:
-                # Si no es keep_warm, verificamos si deberíamos descargar antes (pero aquí estamos por ejecutar)
-                pass
+            return await self._run_locked(func, args, kwargs)
 
-            # Check memory pressure before execution if policy requires (logging only)
-            if self._is_memory_critical():
-                logger.warning("Memoria crítica detectada (>90%), procediendo con inferencia.")
+    async def submit_latest(self, func, *args, **kwargs):
+        """Como run_inference, pero solo ejecuta la solicitud más reciente de este tipo.
 
-            loop = asyncio.get_running_loop()
-            start_time = time.perf_counter()
-            try:
-                # Ejecutar la función pasando el modelo
-                result = await loop.run_in_executor(self._executor, lambda: func(self._model, *args, **kwargs))
-                inference_duration = time.perf_counter() - start_time
-                logger.debug(f"Inferencia completada en {inference_duration:.3f}s")
-                return result
-            except Exception as e:
-                inference_duration = time.perf_counter() - start_time
-                logger.error(f"Error de inferencia tras {inference_duration:.3f}s: {e}")
-                raise
+        Si otra llamada a submit_latest llega mientras esta aún espera turno, esta se
+        descarta sin ejecutarse y retorna None. Pensado para inferencias provisionales:
+        solo importa la más nueva, y así no se acumulan detrás de una inferencia lenta.
+        """
+        self._latest_seq += 1
+        seq = self._latest_seq
+        async with self._lock:
+            if seq != self._latest_seq:
+                logger.debug("Inferencia descartada: reemplazada por una más reciente")
+                return None
+            return await self._run_locked(func, args, kwargs)
+
+    async def _run_locked(self, func, args: tuple, kwargs: dict):
+        """Ejecuta `func(model, ...)` en el hilo de inferencia; requiere tener tomado `self._lock`.
+
+        Tener `self._lock` no garantiza que el hilo esté libre: si se cancela a quien
+        espera aquí, el lock se suelta mientras `func` sigue corriendo en el hilo, y el
+        siguiente trabajo se encola (FIFO) detrás de ella.
+        """
+        if self._model is None:
+            await self._load_model()
+        elif not self.keep_warm:
+            # Si no es keep_warm, verificamos si deberíamos descargar antes (pero aquí estamos por ejecutar)
+            pass
+
+        # Check memory pressure before execution if policy requires (logging only)
+        if self._is_memory_critical():
+            logger.warning("Memoria crítica detectada (>90%), procediendo con inferencia.")
+
+        start_time = time.perf_counter()
+        try:
+            # Ejecutar la función pasando el modelo
+            result = await self._thread.run(lambda: func(self._model, *args, **kwargs))
+            inference_duration = time.perf_counter() - start_time
+            logger.debug(f"Inferencia completada en {inference_duration:.3f}s")
+            return result
+        except Exception as e:
+            inference_duration = time.perf_counter() - start_time
+            logger.error(f"Error de inferencia tras {inference_duration:.3f}s: {e}")
+            raise
 
     async def transcribe(self, audio: Any, **kwargs):
-        """Wrapper directo para transcribe."""
+        """Wrapper directo para transcribe.
+
+        Con `batch_size > 1` usa `BatchedInferencePipeline`: el clip se corta en
+        ventanas de voz (VAD) que se decodifican en lotes en una sola llamada a la GPU,
+        en lugar de recorrer las ventanas de 30 s una tras otra. Solo acelera clips
+        largos; requiere `vad_filter=True` (o `clip_timestamps`) si supera 30 s.
+        """
 
         def _transcribe_sync(model, audio_data, **opts):
             # faster-whisper transcribe returns a generator.
-            # We must convert to list inside the executor to perform the inference there.
-            segments, info = model.transcribe(audio_data, **opts)
+            # We must convert to list inside the inference thread to perform the inference there.
+            if self.batch_size > 1:
+                segments, info = self._batched(model).transcribe(audio_data, batch_size=self.batch_size, **opts)
+            else:
+                segments, info = model.transcribe(audio_data, **opts)
             return list(segments), info
 
-        return await self.run_inference(_transcribe_sync, audio, **kwargs)
+        return await self.run_inference(_transcribe_sync, _as_model_input(audio), **kwargs)
+
+    async def transcribe_stream(self, audio: Any, **kwargs) -> AsyncIterator[Any]:
+        """Transcribe `audio` emitiendo cada segmento en cuanto faster-whisper lo decodifica.
+
+        A diferencia de `transcribe`, no espera a decodificar todo el audio: el
+        generador de segmentos se recorre en el hilo de inferencia y cada segmento
+        llega al event loop por una cola. El lock se mantiene hasta agotar (o
+        abandonar) la iteración, así ninguna otra inferencia usa el modelo en medio.
+
+        Args:
+            audio: Audio float32 mono a 16 kHz (o ruta de archivo).
+            **kwargs: Opciones de `WhisperModel.transcribe`.
+
+        Yields:
+            Segment: Segmentos en orden de aparición.
+        """
+        async with self._lock:
+            if self._model is None:
+                await self._load_model()
+            model = self._model
+            audio = _as_model_input(audio)
+
+            def _segments():
+                segments, _info = model.transcribe(audio, **kwargs)
+                return segments
+
+            start_time = time.perf_counter()
+            async for segment in iterate_in_thread(_segments, self._thread.run):
+                yield segment
+            logger.debug(f"Transcripción en streaming completada en {time.perf_counter() - start_time:.3f}s")
+
+    def _batched(self, model: WhisperModel) -> BatchedInferencePipeline:
+        """Pipeline por lotes sobre `model`, creado una vez por modelo cargado."""
+        if self._pipeline is None or self._pipeline.model is not model:
+            self._pipeline = BatchedInferencePipeline(model)
+        return self._pipeline
 
     async def _load_model(self):
         if self._model is not None:
             return
 
         logger.info(f"Cargando modelo Whisper {self.model_size} en {self.device}...")
-        loop = asyncio.get_running_loop()
         try:
-            self._model = await loop.run_in_executor(self._executor, self._create_model)
+            self._model = await self._thread.run(self._create_model)
             logger.info(
                 f"Modelo Whisper cargado correctamente. "
                 f"[device={self.device}, compute_type={self.compute_type}, "
@@ -147,6 +320,26 @@ class PersistentWhisperWorker:
             logger.error(f"Fallo al cargar modelo: {e}")
             raise
 
+    def _warmup(self, model: WhisperModel) -> None:
+        """Decodifica `WARMUP_SAMPLES` de silencio y descarta el resultado.
+
+        Con `batch_size > 1` crea también el pipeline por lotes, que se reutiliza en
+        cada `transcribe`. Un fallo aquí no impide usar el modelo: se registra y sigue.
+        """
+        start_time = time.perf_counter()
+        try:
+            if self.batch_size > 1:
+                self._batched(model)
+            segments, _info = model.transcribe(
+                np.zeros(WARMUP_SAMPLES, dtype=np.float32), language="en", beam_size=1, without_timestamps=True
+            )
+            for _ in segments:
+                pass
+        except Exception as e:
+            _safe_log(logging.WARNING, f"Warmup de Whisper falló (se omite): {e}")
+            return
+        _safe_log(logging.DEBUG, f"Warmup de Whisper completado en {time.perf_counter() - start_time:.3f}s")
+
     def _create_model(self):
         return WhisperModel(
             self.model_size,
@@ -154,6 +347,7 @@ class PersistentWhisperWorker:
             compute_type=self.compute_type,
             device_index=self.device_index,
             num_workers=self.num_workers_whisper,
+            cpu_threads=CPU_THREADS,
         )
 
     def _is_memory_critical(self) -> bool:
@@ -169,20 +363,17 @@ class PersistentWhisperWorker:
             if self._model:
                 logger.warning("Descargando modelo Whisper de la memoria...")
                 self._model = None
+                self._pipeline = None
                 # Force GC
-                loop = asyncio.get_running_loop()
-                await loop.run_in_executor(self._executor, self._gc_collect)
+                await self._thread.run(self._gc_collect)
                 logger.info("Modelo descargado.")
 
     def _gc_collect(self):
         """Fuerza liberación de memoria incluyendo caché de CUDA."""
         gc.collect()
         # Limpiar caché de CUDA si está disponible
-        try:
+        if cuda_info().available:
             import torch
 
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-                logger.debug("CUDA cache liberada")
-        except ImportError:
-            pass
+            torch.cuda.empty_cache()
+            logger.debug("CUDA cache liberada")
@@ -15,33 +15,32 @@ Para desarrollo:
     uvicorn v2m.api.app:app --reload --host 127.0.0.1 --port 8765
 """
 
+from __future__ import annotations
+
 import argparse
+import importlib.util
 import sys
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from http.client import HTTPConnection
 
-from v2m.shared.logging import logger
-from v2m.shared.utils.env import configure_gpu_environment
+# Los imports de v2m (config, logging) se hacen en el modo servidor: `--help` y los
+# comandos del cliente CLI no necesitan cargar pydantic-settings ni leer config.toml.
 
 # Puerto por defecto para el servidor HTTP
 DEFAULT_PORT = 8765
 DEFAULT_HOST = "127.0.0.1"
 
+# Implementaciones en C del event loop y del parser HTTP, incluidas en `uvicorn[standard]`
+# (dependencia del proyecto). Se piden explícitamente a Uvicorn (que crea el loop él
+# mismo); en una instalación sin ellas (p. ej. uvloop no existe en Windows) se usa
+# asyncio + h11 en lugar de fallar al arrancar.
+HAS_UVLOOP = importlib.util.find_spec("uvloop") is not None
+HAS_HTTPTOOLS = importlib.util.find_spec("httptools") is not None
 
-def _setup_uvloop() -> None:
-    """Configura uvloop como el bucle de eventos si está disponible.
-
-    Optimiza el rendimiento de I/O asíncrono en sistemas *nix, proporcionando
-    hasta 2-4x mejor throughput en operaciones de networking.
-
-    Note:
-        Solo tiene efecto en Linux/macOS. En Windows se ignora silenciosamente.
-    """
-    try:
-        import uvloop
-
-        uvloop.install()
-        logger.debug("uvloop habilitado")
-    except ImportError:
-        pass
+# Conexión del cliente CLI, reutilizada (keep-alive) entre comandos del mismo proceso
+_conn: HTTPConnection | None = None
 
 
 def _run_server(host: str, port: int) -> None:
@@ -54,9 +53,15 @@ def _run_server(host: str, port: int) -> None:
     Note:
         El servidor se ejecuta en modo síncrono (blocking). Para desarrollo,
         use uvicorn directamente con --reload.
+
+        Siempre un único worker: el daemon es dueño del micrófono, del modelo
+        Whisper en GPU y de los clientes WebSocket. Varios procesos tendrían
+        cada uno su propio estado de grabación y su propia copia del modelo.
     """
     import uvicorn
 
+    from v2m.shared.logging import logger
+
     logger.info(f"🚀 Iniciando V2M Server en http://{host}:{port}")
     logger.info(f"📚 Documentación disponible en http://{host}:{port}/docs")
 
@@ -65,13 +70,61 @@ def _run_server(host: str, port: int) -> None:
         host=host,
         port=port,
         log_level="info",
+        loop="uvloop" if HAS_UVLOOP else "asyncio",
+        http="httptools" if HAS_HTTPTOOLS else "h11",
+        workers=1,
+        backlog=2048,
+        # Clientes que sondean /status reutilizan la conexión en lugar de reabrirla
+        timeout_keep_alive=30,
         # Desactivar reload en producción - activar con --reload para desarrollo
     )
 
 
+def _request(method: str, path: str, port: int, timeout: float) -> tuple[int, str, bytes]:
+    """Hace una petición al daemon por la conexión persistente del proceso.
+
+    Si la conexión reutilizada resulta cerrada por el servidor (timeout de keep-alive),
+    se reintenta una vez con una conexión nueva.
+
+    Returns:
+        tuple[int, str, bytes]: Código de estado, motivo y cuerpo de la respuesta.
+
+    Raises:
+        ConnectionError: Si el daemon no acepta la conexión.
+    """
+    global _conn
+    from http.client import HTTPConnection
+
+    while True:
+        if _conn is None or _conn.port != port:
+            if _conn is not None:
+                _conn.close()
+            _conn = HTTPConnection("127.0.0.1", port, timeout=timeout)
+        reused = _conn.sock is not None
+        _conn.timeout = timeout
+        if reused:
+            _conn.sock.settimeout(timeout)
+        try:
+            _conn.request(method, path, headers={"Connection": "keep-alive"})
+            response = _conn.getresponse()
+            return response.status, response.reason, response.read()
+        except ConnectionError:
+            _conn.close()
+            if not reused:
+                raise
+        except Exception:
+            # Respuesta a medias (p. ej. timeout): la conexión queda inservible
+            _conn.close()
+            raise
+
+
 def _send_http_command(command: str, port: int) -> None:
     """Envía un comando HTTP al servidor V2M.
 
+    Usa `http.client` de la stdlib: una sola petición a localhost no justifica el
+    import de `requests` (urllib3, charset_normalizer, idna, certifi) en cada comando.
+    Invocado varias veces en el mismo proceso, reutiliza la conexión (`_request`).
+
     Args:
         command: Nombre del comando (toggle, start, stop, status, health).
         port: Puerto donde el servidor está escuchando.
@@ -79,8 +132,6 @@ def _send_http_command(command: str, port: int) -> None:
     Raises:
         SystemExit: Si el comando es desconocido o el servidor no responde.
     """
-    import requests
-
     base_url = f"http://127.0.0.1:{port}"
 
     # Mapeo de comandos CLI a endpoints HTTP
@@ -98,15 +149,16 @@ def _send_http_command(command: str, port: int) -> None:
         sys.exit(1)
 
     method, path = endpoint_map[command.lower()]
-    url = f"{base_url}{path}"
 
     try:
-        response = requests.post(url, timeout=30) if method == "POST" else requests.get(url, timeout=5)
+        status, reason, body = _request(method, path, port, timeout=30 if method == "POST" else 5)
 
-        response.raise_for_status()
-        print(response.json())
+        if status >= 400:
+            raise RuntimeError(f"{status} {reason} en {base_url}{path}")
+        # El daemon ya responde JSON: se imprime tal cual (apto para `jq`), sin re-parsear
+        print(body.decode("utf-8", errors="replace"))
 
-    except requests.ConnectionError:
+    except ConnectionError:
         print(f"❌ No se pudo conectar al servidor en {base_url}")
         print("   Asegúrate de que el daemon esté corriendo: python -m v2m.main")
         sys.exit(1)
@@ -165,7 +217,8 @@ Ejemplos:
         _send_http_command(args.command, args.port)
     else:
         # Modo Servidor: iniciar FastAPI
-        _setup_uvloop()
+        from v2m.shared.utils.env import configure_gpu_environment
+
         configure_gpu_environment()
         _run_server(args.host, args.port)
 
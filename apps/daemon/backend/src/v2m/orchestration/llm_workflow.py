@@ -1,17 +1,32 @@
 """Workflow de Procesamiento LLM."""
 
 import asyncio
+import importlib
+import json
 import re
+from collections.abc import AsyncIterator
 from typing import TYPE_CHECKING, Any
 
+from v2m.api.schemas import LLMResponse
 from v2m.shared.config import config
 from v2m.shared.logging import logger
+from v2m.shared.utils.text import preview
 
 if TYPE_CHECKING:
-    from v2m.api.schemas import LLMResponse
     from v2m.features.desktop.linux_adapters import LinuxClipboardAdapter
     from v2m.features.desktop.notification_service import LinuxNotificationService
 
+# Backend LLM -> (módulo, clase). Solo se importa el módulo del backend configurado;
+# cualquier valor desconocido usa el modelo local.
+_BACKENDS: dict[str, tuple[str, str]] = {
+    "gemini": ("v2m.features.llm.gemini_service", "GeminiLLMService"),
+    "ollama": ("v2m.features.llm.ollama_service", "OllamaLLMService"),
+    "local": ("v2m.features.llm.local_service", "LocalLLMService"),
+}
+
+# Idioma destino aceptado en `translate_text` (se interpola en el prompt de sistema)
+_LANG_RE = re.compile(r"^[a-zA-Z\s\-]{2,20}$")
+
 
 class LLMWorkflow:
     """Orquestador para el refinamiento y traducción de texto mediante LLM."""
@@ -42,61 +57,111 @@ class LLMWorkflow:
 
     @property
     def llm_service(self) -> Any:
-        """Servicio LLM configurado (Gemini, Ollama o Local)."""
+        """Servicio LLM configurado (Gemini, Ollama o Local).
+
+        Se envuelve en `CoalescingLLMService`: solicitudes idénticas concurrentes
+        comparten una sola llamada al backend. Sus métodos son corrutinas sea cual
+        sea el backend, así que se esperan directamente.
+        """
         if self._llm_service is None:
+            from v2m.features.llm.coalescer import CoalescingLLMService
+
             backend = config.llm.backend
-            if backend == "gemini":
-                from v2m.features.llm.gemini_service import GeminiLLMService
+            module_path, class_name = _BACKENDS.get(backend, _BACKENDS["local"])
+            service = getattr(importlib.import_module(module_path), class_name)()
+            self._llm_service = CoalescingLLMService(service)
+            logger.info(f"LLM backend inicializado: {backend}")
+        return self._llm_service
 
-                self._llm_service = GeminiLLMService()
-            elif backend == "ollama":
-                from v2m.features.llm.ollama_service import OllamaLLMService
+    async def warmup(self) -> None:
+        """Precarga la caché semántica y el modelo del backend si lo configura (`llm.ollama.preload`).
 
-                self._llm_service = OllamaLLMService()
-            else:
-                from v2m.features.llm.local_service import LocalLLMService
+        Con `[llm.semantic_cache] enabled = true` el modelo de embeddings se carga aquí
+        y no en el primer refinamiento. Del backend, Gemini no tiene nada que cargar y
+        el local carga bajo demanda para dejar la VRAM libre, así que solo aplica a Ollama.
+        """
+        if config.llm.semantic_cache.enabled:
+            from v2m.features.llm.semantic_cache import get_semantic_cache
 
-                self._llm_service = LocalLLMService()
-            logger.info(f"LLM backend inicializado: {backend}")
-        return self._llm_service
+            try:
+                await get_semantic_cache().warmup()
+            except Exception as e:
+                logger.error(f"❌ Error cargando la caché semántica: {e}")
 
-    async def process_text(self, text: str) -> "LLMResponse":
-        """Refina el texto usando el LLM y lo copia al portapapeles."""
-        from v2m.api.schemas import LLMResponse
+        if config.llm.backend != "ollama" or not config.llm.ollama.preload:
+            return
+        try:
+            await self.llm_service.warmup()
+        except Exception as e:
+            logger.error(f"❌ Error en warmup del LLM: {e}")
 
+    async def process_text(self, text: str) -> LLMResponse:
+        """Refina el texto usando el LLM y lo copia al portapapeles."""
         backend_name = config.llm.backend
         try:
-            if asyncio.iscoroutinefunction(self.llm_service.process_text):
-                refined = await self.llm_service.process_text(text)
-            else:
-                refined = await asyncio.to_thread(self.llm_service.process_text, text)
-            self.clipboard.copy(refined)
-            self.notifications.notify(f"✅ {backend_name} - copiado", f"{refined[:80]}...")
+            refined = await self.llm_service.process_text(text)
+            await self._copy_and_notify(refined, f"✅ {backend_name} - copiado", preview(refined))
             return LLMResponse(text=refined, backend=backend_name)
         except Exception as e:
             logger.error(f"Error procesando texto con {backend_name}: {e}")
-            self.clipboard.copy(text)
-            self.notifications.notify(f"⚠️ {backend_name} falló", "usando texto original...")
+            await self._copy_and_notify(text, f"⚠️ {backend_name} falló", "usando texto original...")
             return LLMResponse(text=text, backend=f"{backend_name} (fallback)")
 
-    async def translate_text(self, text: str, target_lang: str) -> "LLMResponse":
-        """Traduce el texto al idioma especificado usando el LLM."""
-        from v2m.api.schemas import LLMResponse
+    async def process_text_stream(self, text: str) -> AsyncIterator[str]:
+        """Refina el texto emitiendo eventos Server-Sent Events a medida que llegan tokens.
+
+        Cada fragmento se envía como un evento `data` (JSON con el texto, así los
+        saltos de línea no rompen el framing SSE). Al terminar se copia el texto
+        completo al portapapeles y se emite `event: done` con el `LLMResponse`; si el
+        backend falla se copia el texto original, igual que `process_text`.
+
+        Yields:
+            str: Eventos SSE ya serializados.
+        """
+        backend_name = config.llm.backend
+        parts: list[str] = []
+        try:
+            async for chunk in self.llm_service.process_text_stream(text):
+                parts.append(chunk)
+                yield _sse({"text": chunk})
+            refined = "".join(parts).strip()
+            await self._copy_and_notify(refined, f"✅ {backend_name} - copiado", preview(refined))
+            response = LLMResponse(text=refined, backend=backend_name)
+        except Exception as e:
+            logger.error(f"Error procesando texto con {backend_name}: {e}")
+            await self._copy_and_notify(text, f"⚠️ {backend_name} falló", "usando texto original...")
+            response = LLMResponse(text=text, backend=f"{backend_name} (fallback)")
+        yield _sse(response.model_dump(), event="done")
 
+    async def translate_text(self, text: str, target_lang: str) -> LLMResponse:
+        """Traduce el texto al idioma especificado usando el LLM."""
         backend_name = config.llm.backend
-        if not re.match(r"^[a-zA-Z\s\-]{2,20}$", target_lang):
+        if not _LANG_RE.match(target_lang):
             logger.warning(f"Idioma inválido: {target_lang}")
-            self.notifications.notify("❌ Error", "Idioma de destino inválido")
+            await asyncio.to_thread(self.notifications.notify, "❌ Error", "Idioma de destino inválido")
             return LLMResponse(text=text, backend="error")
         try:
-            if asyncio.iscoroutinefunction(self.llm_service.translate_text):
-                translated = await self.llm_service.translate_text(text, target_lang)
-            else:
-                translated = await asyncio.to_thread(self.llm_service.translate_text, text, target_lang)
-            self.clipboard.copy(translated)
-            self.notifications.notify(f"✅ Traducción ({target_lang})", f"{translated[:80]}...")
+            translated = await self.llm_service.translate_text(text, target_lang)
+            await self._copy_and_notify(translated, f"✅ Traducción ({target_lang})", preview(translated))
             return LLMResponse(text=translated, backend=backend_name)
         except Exception as e:
             logger.error(f"Error traduciendo con {backend_name}: {e}")
-            self.notifications.notify("❌ Error traducción", "Fallo al traducir")
+            await asyncio.to_thread(self.notifications.notify, "❌ Error traducción", "Fallo al traducir")
             return LLMResponse(text=text, backend=f"{backend_name} (error)")
+
+    async def _copy_and_notify(self, text: str, title: str, message: str) -> None:
+        """Copia `text` al portapapeles y envía la notificación en paralelo, en hilos.
+
+        Ambas llamadas bloquean (wl-copy/xclip espera ~100 ms, gdbus es un subproceso):
+        fuera del event loop no frenan otras solicitudes y se espera solo la más lenta.
+        """
+        await asyncio.gather(
+            asyncio.to_thread(self.clipboard.copy, text),
+            asyncio.to_thread(self.notifications.notify, title, message),
+        )
+
+
+def _sse(data: dict[str, Any], event: str | None = None) -> str:
+    """Serializa un evento Server-Sent Events con `data` en JSON compacto."""
+    payload = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n" if event else f"data: {payload}\n\n"
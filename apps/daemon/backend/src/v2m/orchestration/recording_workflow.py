@@ -8,17 +8,22 @@ import asyncio
 import contextlib
 from typing import TYPE_CHECKING, Any, Protocol
 
+from v2m.api.schemas import StatusResponse, ToggleResponse
 from v2m.shared.config import config
 from v2m.shared.logging import logger
+from v2m.shared.utils.text import preview
 
 if TYPE_CHECKING:
-    from v2m.api.schemas import StatusResponse, ToggleResponse
     from v2m.features.audio.recorder import AudioRecorder
     from v2m.features.audio.streaming_transcriber import StreamingTranscriber
     from v2m.features.desktop.linux_adapters import LinuxClipboardAdapter
     from v2m.features.desktop.notification_service import LinuxNotificationService
     from v2m.features.transcription.persistent_model import PersistentWhisperWorker
 
+# Segundos que puede tardar el cierre de la transcripción antes de avisar "procesando":
+# en el caso habitual el texto llega antes y el aviso (un round-trip D-Bus) sobra.
+PROCESSING_NOTICE_DELAY = 0.15
+
 
 class BroadcastFn(Protocol):
     """Protocolo para funciones que emiten eventos a través de WebSocket."""
@@ -34,10 +39,15 @@ class WebSocketSessionAdapter:
     def __init__(self, broadcast_fn: BroadcastFn | None = None) -> None:
         """Inicializa el adaptador.
 
+        Con `broadcast_fn` la instancia delega `emit_event` directamente en ella: cada
+        evento crea una sola corrutina en lugar de envolverla en otra.
+
         Args:
             broadcast_fn: Función opcional para emitir eventos.
         """
         self._broadcast_fn = broadcast_fn
+        if broadcast_fn is not None:
+            self.emit_event = broadcast_fn
 
     async def emit_event(self, event_type: str, data: dict[str, Any]) -> None:
         """Emite un evento usando la función de broadcast configurada."""
@@ -77,6 +87,7 @@ class RecordingWorkflow:
                 device_index=whisper_cfg.device_index,
                 num_workers=whisper_cfg.num_workers,
                 keep_warm=whisper_cfg.keep_warm,
+                batch_size=whisper_cfg.batch_size,
             )
         return self._worker
 
@@ -126,45 +137,46 @@ class RecordingWorkflow:
         if self._model_loaded:
             return
         try:
-            loop = asyncio.get_running_loop()
-            await loop.run_in_executor(None, self.worker.initialize_sync)
+            # Bajo el lock del worker: un /toggle durante la carga no arranca otra
+            await self.worker.preload()
             self._model_loaded = True
             logger.info("✅ Modelo Whisper precargado en VRAM")
         except Exception as e:
             logger.error(f"❌ Error en warmup del modelo: {e}")
 
-    async def toggle(self) -> "ToggleResponse":
+    async def toggle(self) -> ToggleResponse:
         if not self._is_recording:
             return await self.start()
         return await self.stop()
 
-    async def start(self) -> "ToggleResponse":
-        from v2m.api.schemas import ToggleResponse
-
+    async def start(self) -> ToggleResponse:
         if self._is_recording:
             return ToggleResponse(status="recording", message="⚠️ Ya está grabando")
         try:
             await self.transcriber.start()
             self._is_recording = True
-            config.paths.recording_flag.touch()
-            self.notifications.notify("🎤 voice2machine", "grabación iniciada...")
+            # Flag para herramientas externas (barras de estado, scripts); en hilo, fuera del loop
+            await asyncio.to_thread(config.paths.recording_flag.touch)
+            await asyncio.to_thread(self.notifications.notify, "🎤 voice2machine", "grabación iniciada...")
             logger.info("🎙️ Grabación iniciada")
             return ToggleResponse(status="recording", message="🎙️ Grabando...")
         except Exception as e:
             logger.error(f"Error iniciando grabación: {e}")
             return ToggleResponse(status="error", message=f"❌ Error: {e}")
 
-    async def stop(self) -> "ToggleResponse":
-        from v2m.api.schemas import ToggleResponse
-
+    async def stop(self) -> ToggleResponse:
         if not self._is_recording:
             return ToggleResponse(status="idle", message="⚠️ No hay grabación en curso")
         try:
             self._is_recording = False
-            if config.paths.recording_flag.exists():
-                config.paths.recording_flag.unlink()
-            self.notifications.notify("⚡ v2m procesando", "procesando...")
-            transcription = await self.transcriber.stop()
+            await asyncio.to_thread(config.paths.recording_flag.unlink, missing_ok=True)
+            stopping = asyncio.ensure_future(self.transcriber.stop())
+            try:
+                # shield: agotar la espera no cancela el cierre de la transcripción
+                transcription = await asyncio.wait_for(asyncio.shield(stopping), PROCESSING_NOTICE_DELAY)
+            except TimeoutError:
+                await asyncio.to_thread(self.notifications.notify, "⚡ v2m procesando", "procesando...")
+                transcription = await stopping
             if not transcription or not transcription.strip():
                 # Diagnóstico mejorado: reportar estado de la cola y duración de grabación
                 try:
@@ -176,11 +188,13 @@ class RecordingWorkflow:
                 except Exception as diag_err:
                     logger.debug(f"Error obteniendo diagnóstico: {diag_err}")
 
-                self.notifications.notify("❌ whisper", "no se detectó voz en el audio")
+                await asyncio.to_thread(self.notifications.notify, "❌ whisper", "no se detectó voz en el audio")
                 return ToggleResponse(status="idle", message="❌ No se detectó voz", text=None)
-            self.clipboard.copy(transcription)
-            preview = transcription[:80]
-            self.notifications.notify("✅ whisper - copiado", f"{preview}...")
+            # Portapapeles y notificación bloquean: en hilos y en paralelo, fuera del event loop
+            await asyncio.gather(
+                asyncio.to_thread(self.clipboard.copy, transcription),
+                asyncio.to_thread(self.notifications.notify, "✅ whisper - copiado", preview(transcription)),
+            )
             logger.info(f"✅ Transcripción completada: {len(transcription)} chars")
             return ToggleResponse(status="idle", message="✅ Copiado al portapapeles", text=transcription)
         except Exception as e:
@@ -188,9 +202,7 @@ class RecordingWorkflow:
             self._is_recording = False
             return ToggleResponse(status="error", message=f"❌ Error: {e}")
 
-    def get_status(self) -> "StatusResponse":
-        from v2m.api.schemas import StatusResponse
-
+    def get_status(self) -> StatusResponse:
         state = "recording" if self._is_recording else "idle"
         return StatusResponse(state=state, recording=self._is_recording, model_loaded=self._model_loaded)
 
@@ -0,0 +1,101 @@
+"""Circuit breaker para backends remotos (Gemini, Ollama).
+
+Con el backend caído cada solicitud agota sus reintentos y su timeout antes de
+fallar, y las siguientes se encolan detrás. Tras `failure_threshold` fallos
+consecutivos el circuito se abre y las llamadas fallan de inmediato durante
+`reset_after` segundos; después se deja pasar una única llamada de prueba
+(semiabierto) que, según su resultado, cierra el circuito o lo reabre.
+
+Todo el estado se modifica desde el event loop, sin puntos de espera entre la
+lectura y la escritura, así que no necesita locks.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from v2m.shared.errors import ApplicationError
+from v2m.shared.logging import logger
+
+
+class AsyncCircuitBreaker:
+    """Corta las llamadas a un backend tras una racha de fallos.
+
+    Uso:
+        ```python
+        async with breaker.guard():
+            response = await client.call(...)
+        ```
+
+    Cuentan como fallo las excepciones (`Exception`) que atraviesan `guard()`; una
+    cancelación o el cierre de un generador no cuentan como veredicto.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_after: float = 30.0,
+        error_type: type[ApplicationError] = ApplicationError,
+    ) -> None:
+        """Inicializa el breaker cerrado.
+
+        Args:
+            name: Nombre del backend (para logs y mensajes de error).
+            failure_threshold: Fallos consecutivos que abren el circuito.
+            reset_after: Segundos abierto antes de permitir una llamada de prueba.
+            error_type: Excepción lanzada mientras el circuito está abierto.
+        """
+        self.name = name
+        self._failure_threshold = failure_threshold
+        self._reset_after = reset_after
+        self._error_type = error_type
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        """True si el circuito está abierto o semiabierto (llamada de prueba en curso)."""
+        return self._opened_at is not None
+
+    @asynccontextmanager
+    async def guard(self) -> AsyncIterator[None]:
+        """Ejecuta el bloque si el circuito lo permite y registra su resultado.
+
+        Raises:
+            ApplicationError: (del tipo `error_type`) si el circuito está abierto.
+        """
+        probe = self._admit()
+        try:
+            yield
+        except Exception:
+            self._record_failure(probe)
+            raise
+        except BaseException:
+            if probe:
+                self._probing = False
+            raise
+        self._failures = 0
+        if self._opened_at is not None:
+            logger.info(f"circuito de {self.name} cerrado")
+            self._opened_at = None
+        self._probing = False
+
+    def _admit(self) -> bool:
+        """Decide si la llamada pasa; devuelve True si es la llamada de prueba."""
+        if self._opened_at is None:
+            return False
+        if self._probing or time.monotonic() - self._opened_at < self._reset_after:
+            raise self._error_type(f"{self.name} no disponible (circuito abierto tras {self._failures} fallos)")
+        self._probing = True
+        return True
+
+    def _record_failure(self, probe: bool) -> None:
+        self._failures += 1
+        if probe or (self._opened_at is None and self._failures >= self._failure_threshold):
+            self._opened_at = time.monotonic()
+            self._probing = False
+            logger.warning(f"circuito de {self.name} abierto por {self._reset_after:.0f}s tras {self._failures} fallos")
@@ -35,8 +35,10 @@ Notas:
     - Las variables de entorno se prefijan automáticamente con el nombre de la sección.
 """
 
+import copy
+import functools
 from pathlib import Path
-from typing import Literal
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 from pydantic_settings import (
@@ -54,6 +56,23 @@ BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent.parent
 # --- Directorio Seguro de Ejecución ---
 RUNTIME_DIR = get_secure_runtime_dir()
 
+# --- Caché del TOML parseado: (ruta, mtime_ns) -> contenido ---
+_TOML_CACHE: dict[tuple[str, int], dict[str, Any]] = {}
+
+
+class _CachedTomlSettingsSource(TomlConfigSettingsSource):
+    """Fuente TOML que parsea cada archivo una sola vez mientras no cambie su mtime.
+
+    Cada `Settings()` (tests, subprocesos) volvería a leer y parsear `config.toml`;
+    la caché devuelve una copia para que nadie mute el contenido compartido.
+    """
+
+    def _read_file(self, file_path: Path) -> dict[str, Any]:
+        key = (str(file_path), file_path.stat().st_mtime_ns)
+        if (data := _TOML_CACHE.get(key)) is None:
+            data = _TOML_CACHE[key] = super()._read_file(file_path)
+        return copy.deepcopy(data)
+
 
 class PathsConfig(BaseModel):
     """Configuración para rutas de archivos y directorios.
@@ -86,12 +105,19 @@ class VadParametersConfig(BaseModel):
             Defecto: 1000ms (Spanish prosody safe - preserves natural pauses)
         speech_pad_ms: Relleno aplicado al inicio/fin de segmentos de habla detectados.
             Defecto: 400ms (keeps the start/end of words)
+        execution_provider: Proveedor de onnxruntime para el Silero VAD del streaming
+            ('auto', 'cuda', 'coreml', 'cpu'). 'auto' prefiere CUDA o CoreML si están
+            disponibles y cae a CPU. No se pasa a faster-whisper. Defecto: 'auto'
+        silence_floor: Amplitud pico por debajo de la cual el streaming trata un chunk
+            como silencio sin invocar Silero. No se pasa a faster-whisper. Defecto: 0.003
     """
 
     threshold: float = 0.35
     min_speech_duration_ms: int = 250
     min_silence_duration_ms: int = 1000
     speech_pad_ms: int = 400
+    execution_provider: Literal["auto", "cuda", "coreml", "cpu"] = "auto"
+    silence_floor: float = 0.003
 
 
 class WhisperConfig(BaseModel):
@@ -104,10 +130,12 @@ class WhisperConfig(BaseModel):
             Defecto: 'es'
         device: Dispositivo de cómputo ('cuda' para GPU, 'cpu').
             Defecto: 'cuda'
-        compute_type: Precisión numérica ('float16', 'int8_float16', 'int8').
-            Defecto: 'int8_float16'
+        compute_type: Precisión numérica ('float16', 'int8_float16', 'int8') o 'auto'
+            (int8_float16 en cuda, int8 en cpu). Defecto: 'auto'
         device_index: Índice de GPU a utilizar. Defecto: 0
         num_workers: Número de workers para procesamiento paralelo. Defecto: 4
+        batch_size: Ventanas de voz decodificadas por lote en segmentos de más de 30 s
+            (BatchedInferencePipeline). 1 desactiva el modo por lotes. Defecto: 1
         beam_size: Tamaño del beam search. Defecto: 5 (SOTA 2026 - óptimo para large-v3-turbo)
         best_of: Número de candidatos a considerar. Defecto: 5
         temperature: Temperatura de muestreo (0.0 para determinístico).
@@ -126,9 +154,10 @@ class WhisperConfig(BaseModel):
     model: str = "large-v2"
     language: str = "es"
     device: str = "cuda"
-    compute_type: str = "int8_float16"
+    compute_type: str = "auto"
     device_index: int = 0
     num_workers: int = 4
+    batch_size: int = Field(default=1, ge=1)
     beam_size: int = 5
     best_of: int = 5
     temperature: float | list[float] = 0.0
@@ -209,6 +238,8 @@ class OllamaConfig(BaseModel):
         keep_alive: Tiempo para mantener el modelo cargado. "0m" libera VRAM inmediatamente.
         temperature: Temperatura de generación. 0.0 para salidas estructuradas determinísticas.
         translation_temperature: Temperatura para tareas de traducción.
+        preload: Si se carga el modelo en Ollama al arrancar el daemon, en paralelo con
+            Whisper, en lugar de en la primera solicitud.
     """
 
     host: str = Field(default="http://localhost:11434")
@@ -216,6 +247,73 @@ class OllamaConfig(BaseModel):
     keep_alive: str = Field(default="5m")
     temperature: float = Field(default=0.0, ge=0.0, le=2.0)
     translation_temperature: float = Field(default=0.3, ge=0.0, le=2.0)
+    preload: bool = Field(default=True)
+
+
+class LLMHttpConfig(BaseModel):
+    """Configuración HTTP de los clientes LLM remotos (Gemini, Ollama).
+
+    Atributos:
+        max_connections: Conexiones simultáneas máximas del pool. Defecto: 512
+        max_keepalive_connections: Conexiones ociosas retenidas para reutilizar. Defecto: 256
+        timeout: Timeout total de lectura/escritura en segundos. Defecto: 60
+        connect_timeout: Timeout de conexión en segundos. Defecto: 5
+    """
+
+    max_connections: int = Field(default=512, ge=1)
+    max_keepalive_connections: int = Field(default=256, ge=0)
+    timeout: float = Field(default=60.0, gt=0)
+    connect_timeout: float = Field(default=5.0, gt=0)
+
+
+class LLMCircuitBreakerConfig(BaseModel):
+    """Circuit breaker de los backends LLM remotos (Gemini, Ollama).
+
+    Atributos:
+        failure_threshold: Fallos consecutivos que abren el circuito. Defecto: 5
+        reset_after: Segundos fallando de inmediato antes de probar de nuevo. Defecto: 30
+    """
+
+    failure_threshold: int = Field(default=5, ge=1)
+    reset_after: float = Field(default=30.0, gt=0)
+
+
+class LLMCacheConfig(BaseModel):
+    """Configuración de la caché de respuestas LLM exactas.
+
+    Solo se cachean llamadas deterministas (temperatura 0); el resto siempre llega
+    al backend.
+
+    Atributos:
+        enabled: Activa la caché. Defecto: False
+        max_entries: Máximo de respuestas retenidas (LRU). Defecto: 1024
+        ttl_seconds: Vida de cada respuesta en segundos. Defecto: 3600
+    """
+
+    enabled: bool = Field(default=False)
+    max_entries: int = Field(default=1024, ge=1)
+    ttl_seconds: int = Field(default=3600, ge=1)
+
+
+class LLMSemanticCacheConfig(BaseModel):
+    """Configuración de la caché semántica de refinamientos LLM.
+
+    Reutiliza el refinamiento de un texto casi idéntico (similitud coseno de
+    embeddings). Es aproximada: requiere `sentence-transformers` y un umbral alto.
+
+    Atributos:
+        enabled: Activa la caché. Defecto: False
+        model: Modelo de embeddings de sentence-transformers. Defecto: 'all-MiniLM-L6-v2'
+        threshold: Similitud coseno mínima para reutilizar una respuesta. Defecto: 0.92
+        max_entries: Capacidad (FIFO). Defecto: 10000
+        persist_path: Archivo `.npz` donde se guarda al salir (None para no persistir).
+    """
+
+    enabled: bool = Field(default=False)
+    model: str = Field(default="all-MiniLM-L6-v2")
+    threshold: float = Field(default=0.92, ge=0.0, le=1.0)
+    max_entries: int = Field(default=10_000, ge=1)
+    persist_path: Path | None = Field(default=RUNTIME_DIR / "v2m_semantic_cache.npz")
 
 
 class LLMConfig(BaseModel):
@@ -225,11 +323,19 @@ class LLMConfig(BaseModel):
         backend: Selector de backend ("local", "gemini" u "ollama"). Defecto: "local"
         local: Configuración para el backend local llama.cpp.
         ollama: Configuración para el backend Ollama.
+        http: Pool de conexiones y timeouts de los clientes HTTP de Gemini y Ollama.
+        circuit_breaker: Corte rápido de llamadas tras fallos consecutivos del backend.
+        cache: Caché de respuestas exactas compartida por los backends.
+        semantic_cache: Caché semántica (por similitud) de refinamientos.
     """
 
     backend: Literal["local", "gemini", "ollama"] = Field(default="local")
     local: LocalLLMConfig = Field(default_factory=LocalLLMConfig)
     ollama: OllamaConfig = Field(default_factory=OllamaConfig)
+    http: LLMHttpConfig = Field(default_factory=LLMHttpConfig)
+    circuit_breaker: LLMCircuitBreakerConfig = Field(default_factory=LLMCircuitBreakerConfig)
+    cache: LLMCacheConfig = Field(default_factory=LLMCacheConfig)
+    semantic_cache: LLMSemanticCacheConfig = Field(default_factory=LLMSemanticCacheConfig)
 
 
 class TranscriptionConfig(BaseModel):
@@ -286,9 +392,24 @@ class Settings(BaseSettings):
             init_settings,
             env_settings,
             dotenv_settings,
-            TomlConfigSettingsSource(settings_cls),
+            _CachedTomlSettingsSource(settings_cls),
             file_secret_settings,
         )
 
 
-config = Settings()
+@functools.cache
+def get_config() -> Settings:
+    """Devuelve la configuración global, construida en el primer acceso.
+
+    Returns:
+        Settings: Instancia única compartida por todo el proceso.
+    """
+    return Settings()
+
+
+def __getattr__(name: str) -> Any:
+    # `from v2m.shared.config import config` se resuelve aquí (PEP 562): los
+    # procesos que nunca tocan la configuración no pagan su carga ni validación
+    if name == "config":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
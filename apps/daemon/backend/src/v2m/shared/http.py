@@ -0,0 +1,42 @@
+"""Parámetros HTTP compartidos por los clientes de LLM.
+
+Gemini y Ollama construyen su propio `httpx.AsyncClient`; este módulo centraliza los
+límites del pool de conexiones y los timeouts con los que se crean, de modo que ambos
+backends se comporten igual ante ráfagas de solicitudes concurrentes. HTTP/2
+(multiplexado de solicitudes sobre una conexión) se activa solo si el paquete
+opcional `h2` está instalado.
+"""
+
+import importlib.util
+from typing import Any
+
+import httpx
+
+from v2m.shared.config import config
+
+HAS_HTTP2 = importlib.util.find_spec("h2") is not None
+
+# Errores de red transitorios: los únicos que los servicios LLM reintentan
+TRANSIENT_HTTP_ERRORS: tuple[type[Exception], ...] = (httpx.TimeoutException, httpx.NetworkError, ConnectionError)
+
+
+def llm_http_client_args(include_timeout: bool = True) -> dict[str, Any]:
+    """Argumentos para el `httpx.AsyncClient` de un servicio LLM.
+
+    Args:
+        include_timeout: Incluir `timeout`. Desactivar cuando el SDK gestiona el suyo.
+
+    Returns:
+        dict[str, Any]: kwargs de `httpx.AsyncClient` (limits, http2 y opcionalmente timeout).
+    """
+    http_config = config.llm.http
+    args: dict[str, Any] = {
+        "limits": httpx.Limits(
+            max_connections=http_config.max_connections,
+            max_keepalive_connections=http_config.max_keepalive_connections,
+        ),
+        "http2": HAS_HTTP2,
+    }
+    if include_timeout:
+        args["timeout"] = httpx.Timeout(http_config.timeout, connect=http_config.connect_timeout)
+    return args
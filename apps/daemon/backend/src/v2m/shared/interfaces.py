@@ -1,11 +1,13 @@
 """Interfaces compartidas para toda la aplicación."""
 
-from typing import Any, Protocol, runtime_checkable
+from typing import Any, Protocol
 
 
-@runtime_checkable
 class SessionManagerInterface(Protocol):
-    """Protocolo para emisión de eventos a clientes conectados."""
+    """Protocolo para emisión de eventos a clientes conectados.
+
+    Solo para tipado estático: nada lo comprueba con `isinstance`.
+    """
 
     async def emit_event(self, event_type: str, data: dict[str, Any]) -> None:
         """Emite un evento a los clientes (ej. WebSocket)."""
@@ -7,7 +7,10 @@ sistemas de monitoreo modernos.
 Características:
     - Formato JSON para cada entrada (machine-readable).
     - Salida a `stdout` (estándar de aplicaciones 12-factor / contenedores).
+    - Escritura en un hilo propio (`QueueHandler` + `QueueListener`): quien registra
+      solo formatea y encola, sin esperar al `write()` de stdout.
     - Instancia global pre-configurada.
+    - Serialización con `orjson` (extensión en C) si está instalado; si no, `json` estándar.
 
 Formato de salida:
     ```json
@@ -15,11 +18,23 @@ Formato de salida:
     ```
 """
 
+import atexit
 import logging as _logging
 import sys
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
 
 from pythonjsonlogger import json
 
+# orjson es opcional: python-json-logger trae su formatter, pero orjson no es dependencia del proyecto
+try:
+    from pythonjsonlogger.orjson import OrjsonFormatter as _JsonFormatter
+except ImportError:
+    _JsonFormatter = json.JsonFormatter
+
+# Hilo que escribe en stdout los registros encolados (uno por proceso)
+_listener: QueueListener | None = None
+
 
 def setup_logging() -> _logging.Logger:
     """Configura y retorna un logger estructurado en formato JSON.
@@ -30,20 +45,28 @@ def setup_logging() -> _logging.Logger:
     Returns:
         logging.Logger: Instancia configurada. Se recomienda usar la variable global `logger`.
     """
+    global _listener
+
     logger = _logging.getLogger("v2m")
     logger.setLevel(_logging.INFO)
 
     # Prevenir duplicación de handlers si se recarga el módulo
     if logger.hasHandlers():
         logger.handlers.clear()
+    if _listener is not None:
+        _listener.stop()
 
     # --- Configuración de Handler y Formatter ---
+    # El JSON se arma en el hilo que registra (QueueHandler.prepare deja la línea
+    # final en `msg`, con el traceback incluido) y el listener solo la escribe.
     # StreamHandler para stdout (compatible con journald/docker)
-    handler = _logging.StreamHandler(sys.stdout)
-    # JsonFormatter para estructura
-    formatter = json.JsonFormatter("%(asctime)s %(name)s %(levelname)s %(message)s")
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    queue: SimpleQueue[_logging.LogRecord] = SimpleQueue()
+    queue_handler = QueueHandler(queue)
+    queue_handler.setFormatter(_JsonFormatter("%(asctime)s %(name)s %(levelname)s %(message)s"))
+    logger.addHandler(queue_handler)
+
+    _listener = QueueListener(queue, _logging.StreamHandler(sys.stdout))
+    _listener.start()
 
     return logger
 
@@ -51,3 +74,5 @@ def setup_logging() -> _logging.Logger:
 # --- Instancia Global del Logger ---
 # Punto de acceso único para logging en toda la aplicación.
 logger = setup_logging()
+# Al salir se vacía la cola: los últimos registros no se pierden
+atexit.register(lambda: _listener is not None and _listener.stop())
@@ -0,0 +1,29 @@
+"""Carga de Prompts del Sistema.
+
+Los prompts viven como archivos de texto en `BASE_DIR/prompts/` y son estáticos
+durante la vida del proceso. Se leen una sola vez y el resultado se comparte entre
+todas las instancias de servicios que los usan (Gemini, Ollama, Local).
+"""
+
+import functools
+
+from v2m.shared.config import BASE_DIR
+from v2m.shared.logging import logger
+
+
+@functools.lru_cache(maxsize=4)
+def load_prompt(name: str) -> str | None:
+    """Lee el prompt `BASE_DIR/prompts/<name>.txt`, una vez por proceso.
+
+    Args:
+        name: Nombre del prompt sin extensión (ej. "refine_system").
+
+    Returns:
+        str | None: Contenido del archivo, o None si no existe (cada servicio
+            aplica su propio valor por defecto).
+    """
+    try:
+        return (BASE_DIR / "prompts" / f"{name}.txt").read_text(encoding="utf-8")
+    except FileNotFoundError:
+        logger.warning(f"prompt '{name}' no encontrado, usando valor por defecto")
+        return None
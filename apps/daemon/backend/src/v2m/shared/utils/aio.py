@@ -0,0 +1,72 @@
+"""Puentes entre iteradores bloqueantes y el event loop.
+
+Librerías como llama-cpp o faster-whisper exponen su salida incremental como
+generadores síncronos que bloquean entre elemento y elemento. `iterate_in_thread`
+los recorre en un hilo y entrega cada elemento al loop a medida que se produce.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from typing import Any
+
+_DONE = object()
+
+
+class _Failure:
+    """Excepción del hilo productor, transportada a través de la cola."""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+async def iterate_in_thread(
+    factory: Callable[[], Iterable[Any]], run: Callable[[Callable[[], None]], Awaitable[None]] | None = None
+) -> AsyncIterator[Any]:
+    """Recorre en un hilo el iterable que devuelve `factory` y emite sus elementos.
+
+    El hilo publica cada elemento con `call_soon_threadsafe` en una `asyncio.Queue`
+    y termina con un centinela; una excepción del productor se relanza en el
+    consumidor. Si el consumidor abandona la iteración, el productor se detiene en
+    el siguiente elemento y se espera a que libere el hilo antes de retornar.
+
+    Args:
+        factory: Crea el iterable (se invoca dentro del hilo).
+        run: Lanza el productor en un hilo y devuelve un awaitable de su fin
+            (ej. el hilo dedicado de un worker); None usa `asyncio.to_thread`.
+
+    Yields:
+        Any: Elementos del iterable, en orden.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[object] = asyncio.Queue()
+    stop = threading.Event()
+
+    def produce() -> None:
+        try:
+            for item in factory():
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+                if stop.is_set():
+                    break
+        except BaseException as e:
+            loop.call_soon_threadsafe(queue.put_nowait, _Failure(e))
+            return
+        loop.call_soon_threadsafe(queue.put_nowait, _DONE)
+
+    # to_thread (y no run_in_executor) copia los contextvars del llamador al hilo
+    producer = run(produce) if run is not None else asyncio.ensure_future(asyncio.to_thread(produce))
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                break
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        await producer
@@ -1,14 +1,83 @@
 import ctypes
+import functools
 import os
 import site
 from pathlib import Path
+from typing import NamedTuple
 
+from v2m.shared.config import config
 from v2m.shared.logging import logger
 
+# Librerías críticas que deben ser precargadas en orden de dependencia
+# cuDNN 9 split libs: engines dependen de ops, ops depende de graph/cnn? No, graph depende de ops.
+# Orden seguro aproximado: cublas -> cudnn_ops -> cudnn_cnn -> cudnn_adv -> cudnn_engines
+NVIDIA_LIBS_TO_PRELOAD = (
+    "libcublas.so",
+    "libcublasLt.so",
+    "libcudnn_engines_precompiled.so",  # cuDNN 9
+    "libcudnn_engines_runtime.so",  # cuDNN 9
+    "libcudnn_heuristic.so",  # cuDNN 9
+    "libcudnn_graph.so",  # cuDNN 9
+    "libcudnn_ops.so",  # cuDNN 9
+    "libcudnn_cnn.so",  # cuDNN 9
+    "libcudnn_adv.so",  # cuDNN 9
+    "libcudnn.so",
+)
+
+
+class CudaInfo(NamedTuple):
+    """Resultado del sondeo de CUDA vía PyTorch (constante durante el proceso).
+
+    Atributos:
+        has_torch: PyTorch está instalado.
+        available: `torch.cuda.is_available()`.
+        device_names: Nombre de cada GPU visible, por índice.
+    """
+
+    has_torch: bool
+    available: bool
+    device_names: tuple[str, ...]
+
+
+@functools.cache
+def cuda_info() -> CudaInfo:
+    """Sondea CUDA una sola vez por proceso.
+
+    `torch.cuda.is_available()` inicializa el driver en la primera llamada (~100 ms);
+    el resultado se cachea para que el warmup, las descargas de modelo y cualquier
+    otro consumidor no repitan el import ni el sondeo.
+    """
+    try:
+        import torch
+    except ImportError:
+        return CudaInfo(has_torch=False, available=False, device_names=())
+    if not torch.cuda.is_available():
+        return CudaInfo(has_torch=True, available=False, device_names=())
+    names = tuple(torch.cuda.get_device_name(i) for i in range(torch.cuda.device_count()))
+    return CudaInfo(has_torch=True, available=True, device_names=names)
+
 
 def configure_gpu_environment() -> None:
+    """Prepara el proceso para inferencia en GPU al arrancar el servidor.
+
+    Precarga las librerías NVIDIA y, si Whisper está configurado en `cuda`, ejecuta
+    el sondeo de CUDA (`cuda_info`) ya en el arranque y no durante el warmup del modelo.
+    """
+    _preload_nvidia_libraries()
+    if config.transcription.whisper.device == "cuda":
+        info = cuda_info()
+        if info.available:
+            logger.info(f"cuda disponible: {', '.join(info.device_names)}")
+
+
+@functools.cache
+def _preload_nvidia_libraries() -> None:
     """Configura dinámicamente las rutas de librerías NVIDIA (cuDNN, Cublas) en el entorno.
 
+    Se ejecuta una sola vez por proceso: una segunda llamada a
+    `configure_gpu_environment` no vuelve a recorrer site-packages, ni a
+    anteponer rutas a LD_LIBRARY_PATH, ni a cargar librerías ya cargadas.
+
     Estrategia SOTA (2026) para entornos aislados (venv):
     1. Identifica rutas de librerías nvidia instaladas vía pip.
     2. Actualiza LD_LIBRARY_PATH (útil para subprocesos).
@@ -20,26 +89,12 @@ def configure_gpu_environment() -> None:
         site_packages = site.getsitepackages()
         nvidia_paths = []
 
-        # Librerías críticas que deben ser precargadas en orden de dependencia
-        # cuDNN 9 split libs: engines dependen de ops, ops depende de graph/cnn? No, graph depende de ops.
-        # Orden seguro aproximado: cublas -> cudnn_ops -> cudnn_cnn -> cudnn_adv -> cudnn_engines
-        libs_to_preload = [
-            "libcublas.so",
-            "libcublasLt.so",
-            "libcudnn_engines_precompiled.so",  # cuDNN 9
-            "libcudnn_engines_runtime.so",  # cuDNN 9
-            "libcudnn_heuristic.so",  # cuDNN 9
-            "libcudnn_graph.so",  # cuDNN 9
-            "libcudnn_ops.so",  # cuDNN 9
-            "libcudnn_cnn.so",  # cuDNN 9
-            "libcudnn_adv.so",  # cuDNN 9
-            "libcudnn.so",
-        ]
-
         # 1. Encontrar rutas
+        # Se recorren todos los site-packages (venv y usuario pueden repartirse los
+        # paquetes nvidia); is_dir() ya implica exists(), un solo stat por ruta
         for sp in site_packages:
             p = Path(sp) / "nvidia"
-            if p.exists() and p.is_dir():
+            if p.is_dir():
                 for lib_dir in p.glob("*/lib"):
                     if lib_dir.is_dir():
                         nvidia_paths.append(lib_dir)
@@ -54,33 +109,45 @@ def configure_gpu_environment() -> None:
             new_ld_paths.append(current_ld)
         os.environ["LD_LIBRARY_PATH"] = ":".join(new_ld_paths)
 
-        # 3. Precarga con ctypes
+        # 3. Precarga con ctypes, en orden de dependencia
+        candidates = _find_libraries(nvidia_paths, NVIDIA_LIBS_TO_PRELOAD)
         loaded_count = 0
-        for lib_name in libs_to_preload:
-            # Buscar la librería en todas las rutas nvidia detectadas
-            found = False
-            for path in nvidia_paths:
-                # Buscar patrón incluyendo versión (ej: libcudnn_ops.so.9)
-                # glob permite encontrar libcudnn_ops.so.9.1.0 o enlaces
-                candidates = list(path.glob(f"{lib_name}*"))
-                if candidates:
-                    # Preferir la versión más corta (suele ser el symlink .so o .so.9)
-                    # O simplemente tomar el primero
-                    target_lib = sorted(candidates, key=lambda x: len(str(x)))[0]
-
-                    try:
-                        ctypes.CDLL(str(target_lib), mode=ctypes.RTLD_GLOBAL)
-                        loaded_count += 1
-                        found = True
-                        break
-                    except OSError:
-                        continue  # Intentar siguiente ruta o ignorar si falla
-
-            if not found:
-                # No es crítico fallar aquí, quizás no está instalada o no se necesita
-                pass
+        for lib_name in NVIDIA_LIBS_TO_PRELOAD:
+            # Probar cada ruta nvidia en orden; no es crítico si ninguna carga
+            for target_lib in candidates.get(lib_name, ()):
+                try:
+                    ctypes.CDLL(target_lib, mode=ctypes.RTLD_GLOBAL)
+                    loaded_count += 1
+                    break
+                except OSError:
+                    continue
 
         logger.info(f"entorno gpu configurado: {len(nvidia_paths)} rutas, {loaded_count} libs precargadas")
 
     except Exception as e:
         logger.warning(f"fallo autoconfiguración gpu: {e}")
+
+
+def _find_libraries(lib_dirs: list[Path], lib_names: tuple[str, ...]) -> dict[str, list[str]]:
+    """Localiza cada librería con una sola pasada de `os.scandir` por directorio.
+
+    Acepta el nombre con sufijo de versión (ej. `libcudnn_ops.so.9`) y, dentro de
+    cada directorio, prefiere el nombre más corto (suele ser el symlink `.so` o `.so.9`).
+
+    Returns:
+        dict[str, list[str]]: Por librería, una ruta candidata por directorio, en el
+        orden de `lib_dirs`.
+    """
+    found: dict[str, list[str]] = {}
+    for lib_dir in lib_dirs:
+        best: dict[str, os.DirEntry[str]] = {}
+        with os.scandir(lib_dir) as entries:
+            for entry in entries:
+                for lib_name in lib_names:
+                    if entry.name.startswith(lib_name):
+                        prev = best.get(lib_name)
+                        if prev is None or len(entry.name) < len(prev.name):
+                            best[lib_name] = entry
+        for lib_name, entry in best.items():
+            found.setdefault(lib_name, []).append(entry.path)
+    return found
@@ -5,11 +5,13 @@ la seguridad y el cumplimiento de los estándares XDG (XDG_RUNTIME_DIR).
 """
 
 import contextlib
+import functools
 import os
 import tempfile
 from pathlib import Path
 
 
+@functools.cache
 def get_secure_runtime_dir(app_name: str = "v2m") -> Path:
     """Retorna un directorio de ejecución seguro para la aplicación.
 
@@ -17,6 +19,10 @@ def get_secure_runtime_dir(app_name: str = "v2m") -> Path:
     específicos del usuario), luego recurre a un subdirectorio en `/tmp`
     con permisos estrictos (0700).
 
+    El resultado se cachea por `app_name`: el UID y el entorno no cambian durante
+    el proceso. Tras modificar `XDG_RUNTIME_DIR` (ej. en tests) hay que llamar a
+    `get_secure_runtime_dir.cache_clear()`.
+
     Args:
         app_name: Nombre del subdirectorio de la aplicación.
 
@@ -0,0 +1,17 @@
+"""Utilidades de texto para mensajes al usuario."""
+
+
+def preview(text: str, limit: int = 80) -> str:
+    """Recorta `text` para el cuerpo de una notificación.
+
+    Solo añade "..." si realmente recorta: un texto corto se devuelve tal cual,
+    sin copia ni concatenación.
+
+    Args:
+        text: Texto completo.
+        limit: Caracteres máximos antes de recortar.
+
+    Returns:
+        str: `text` si cabe; si no, sus primeros `limit` caracteres seguidos de "...".
+    """
+    return text if len(text) <= limit else f"{text[:limit]}..."
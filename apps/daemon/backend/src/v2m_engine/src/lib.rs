@@ -9,6 +9,7 @@
 
 use log::{error, info, warn};
 use numpy::PyArray1;
+use pyo3::create_exception;
 use pyo3::prelude::*;
 use ringbuf::{
     traits::{Consumer, Producer, Split, Observer},
@@ -29,6 +30,12 @@ use cpal::traits::{DeviceTrait, HostTrait, StreamTrait};
 // GRABADOR DE AUDIO (AUDIO RECORDER) - Lock-Free Ring Buffer + Re-muestreo
 // ============================================================================
 
+// Excepciones específicas del motor: permiten a Python capturar solo fallos del
+// motor (y no bugs arbitrarios) al decidir el fallback entre motores.
+create_exception!(v2m_engine, RustEngineError, pyo3::exceptions::PyRuntimeError);
+create_exception!(v2m_engine, RustEngineStartError, RustEngineError);
+create_exception!(v2m_engine, RustEngineStopError, RustEngineError);
+
 type RingProducer = ringbuf::HeapProd<f32>;
 type RingConsumer = ringbuf::HeapCons<f32>;
 
@@ -77,7 +84,7 @@ impl AudioRecorder {
 
     fn start(&mut self) -> PyResult<()> {
         if self.is_recording {
-            return Err(pyo3::exceptions::PyRuntimeError::new_err(
+            return Err(RustEngineStartError::new_err(
                 "Grabación ya en curso",
             ));
         }
@@ -86,7 +93,7 @@ impl AudioRecorder {
         let device = match host.default_input_device() {
             Some(d) => d,
             None => {
-                return Err(pyo3::exceptions::PyOSError::new_err(
+                return Err(RustEngineStartError::new_err(
                     "No hay dispositivo de entrada disponible",
                 ))
             }
@@ -96,7 +103,7 @@ impl AudioRecorder {
         let supported_configs = match device.supported_input_configs() {
             Ok(c) => c,
             Err(e) => {
-                return Err(pyo3::exceptions::PyOSError::new_err(format!(
+                return Err(RustEngineStartError::new_err(format!(
                     "Fallo al consultar configuraciones del dispositivo: {}",
                     e
                 )))
@@ -123,7 +130,7 @@ impl AudioRecorder {
                 c.with_sample_rate(target_rate).into()
             }
             None => {
-                return Err(pyo3::exceptions::PyValueError::new_err(format!(
+                return Err(RustEngineStartError::new_err(format!(
                     "No se encontró configuración soportada para {} canales",
                     self.channels
                 )));
@@ -159,14 +166,14 @@ impl AudioRecorder {
                 None,
             )
             .map_err(|e| {
-                pyo3::exceptions::PyRuntimeError::new_err(format!(
+                RustEngineStartError::new_err(format!(
                     "Fallo al construir flujo de entrada: {}",
                     e
                 ))
             })?;
 
         stream.play().map_err(|e| {
-            pyo3::exceptions::PyRuntimeError::new_err(format!("Fallo al iniciar flujo: {}", e))
+            RustEngineStartError::new_err(format!("Fallo al iniciar flujo: {}", e))
         })?;
 
         self.stream = Some(stream);
@@ -188,6 +195,20 @@ impl AudioRecorder {
         Ok(PyArray1::from_vec(py, Vec::new()))
     }
 
+    /// Copia los datos disponibles directamente en un array NumPy pre-allocado.
+    ///
+    /// Un único memcpy desde el búfer circular (`pop_slice`), sin Vec intermedio.
+    /// Devuelve el número de samples escritos (como máximo `out.len()`).
+    fn read_chunk_into(&self, out: &PyArray1<f32>) -> PyResult<usize> {
+        // SAFETY: `out` no se comparte con otro hilo mientras se mantiene el GIL
+        let slice = unsafe { out.as_slice_mut()? };
+        let mut guard = self.consumer.lock().unwrap();
+        if let Some(consumer) = guard.as_mut() {
+            return Ok(consumer.pop_slice(slice));
+        }
+        Ok(0)
+    }
+
     /// Espera de forma asíncrona a que haya nuevos datos.
     fn wait_for_data<'py>(&self, py: Python<'py>) -> PyResult<&'py PyAny> {
         let notify = self.notify.clone();
@@ -212,7 +233,7 @@ impl AudioRecorder {
 
     fn stop<'py>(&mut self, py: Python<'py>) -> PyResult<&'py PyArray1<f32>> {
         if !self.is_recording {
-            return Err(pyo3::exceptions::PyRuntimeError::new_err("No se está grabando"));
+            return Err(RustEngineStopError::new_err("No se está grabando"));
         }
 
         self.stream = None;
@@ -253,12 +274,12 @@ impl AudioRecorder {
                 1, // canales
             )
             .map_err(|e| {
-                pyo3::exceptions::PyRuntimeError::new_err(format!("Fallo init re-muestreador: {}", e))
+                RustEngineStopError::new_err(format!("Fallo init re-muestreador: {}", e))
             })?;
 
             let waves = vec![raw_data];
             let resampled_waves = resampler.process(&waves, None).map_err(|e| {
-                pyo3::exceptions::PyRuntimeError::new_err(format!("Fallo al re-muestrear: {}", e))
+                RustEngineStopError::new_err(format!("Fallo al re-muestrear: {}", e))
             })?;
 
             resampled_waves[0].clone()
@@ -518,6 +539,8 @@ pub struct ZeroCopyAudioRecorder {
     device_sample_rate: u32,
     channels: u16,
     is_recording: bool,
+    /// Cursor de lectura incremental para `read_chunk_into`.
+    read_pos: usize,
 }
 
 #[pymethods]
@@ -541,24 +564,26 @@ impl ZeroCopyAudioRecorder {
             device_sample_rate: 0,
             channels,
             is_recording: false,
+            read_pos: 0,
         })
     }
 
     fn start(&mut self) -> PyResult<()> {
         if self.is_recording {
-            return Err(pyo3::exceptions::PyRuntimeError::new_err(
+            return Err(RustEngineStartError::new_err(
                 "Grabación ya en curso",
             ));
         }
 
         // Reset del buffer compartido
         self.shared_buffer.reset();
+        self.read_pos = 0;
 
         let host = cpal::default_host();
         let device = match host.default_input_device() {
             Some(d) => d,
             None => {
-                return Err(pyo3::exceptions::PyOSError::new_err(
+                return Err(RustEngineStartError::new_err(
                     "No hay dispositivo de entrada disponible",
                 ))
             }
@@ -567,7 +592,7 @@ impl ZeroCopyAudioRecorder {
         let supported_configs = match device.supported_input_configs() {
             Ok(c) => c,
             Err(e) => {
-                return Err(pyo3::exceptions::PyOSError::new_err(format!(
+                return Err(RustEngineStartError::new_err(format!(
                     "Fallo al consultar configuraciones del dispositivo: {}",
                     e
                 )))
@@ -593,7 +618,7 @@ impl ZeroCopyAudioRecorder {
                 c.with_sample_rate(target_rate).into()
             }
             None => {
-                return Err(pyo3::exceptions::PyValueError::new_err(format!(
+                return Err(RustEngineStartError::new_err(format!(
                     "No se encontró configuración soportada para {} canales",
                     self.channels
                 )));
@@ -607,7 +632,7 @@ impl ZeroCopyAudioRecorder {
 
         // Crear estado compartido thread-safe para el callback
         let shared_state = self.shared_buffer.create_shared_state()
-            .ok_or_else(|| pyo3::exceptions::PyRuntimeError::new_err("SharedMemory no inicializada"))?;
+            .ok_or_else(|| RustEngineStartError::new_err("SharedMemory no inicializada"))?;
 
         let command_tx = self.command_tx.clone();
         let notify = self.notify.clone();
@@ -631,14 +656,14 @@ impl ZeroCopyAudioRecorder {
                 None,
             )
             .map_err(|e| {
-                pyo3::exceptions::PyRuntimeError::new_err(format!(
+                RustEngineStartError::new_err(format!(
                     "Fallo al construir flujo de entrada: {}",
                     e
                 ))
             })?;
 
         stream.play().map_err(|e| {
-            pyo3::exceptions::PyRuntimeError::new_err(format!("Fallo al iniciar flujo: {}", e))
+            RustEngineStartError::new_err(format!("Fallo al iniciar flujo: {}", e))
         })?;
 
         self.stream = Some(stream);
@@ -668,6 +693,9 @@ impl ZeroCopyAudioRecorder {
         let notify = self.notify.clone();
         let write_pos = self.shared_buffer.write_pos.clone();
         let is_finalized = self.shared_buffer.is_finalized.clone();
+        // Solo despertar por samples aún no leídos con read_chunk_into; comparar contra 0
+        // devolvía inmediatamente tras el primer sample y el Producer giraba en vacío
+        let read_pos = self.read_pos;
 
         pyo3_asyncio::tokio::future_into_py(py, async move {
             loop {
@@ -675,7 +703,7 @@ impl ZeroCopyAudioRecorder {
                     return Err(pyo3::exceptions::PyRuntimeError::new_err("Stream closed"));
                 }
 
-                if write_pos.load(Ordering::Acquire) > 0 {
+                if write_pos.load(Ordering::Acquire) > read_pos {
                     return Ok(());
                 }
 
@@ -691,10 +719,39 @@ impl ZeroCopyAudioRecorder {
         self.shared_buffer.read_as_numpy(py)
     }
 
+    /// Copia los samples nuevos (desde la última lectura) en un array NumPy pre-allocado.
+    ///
+    /// Devuelve el número de samples escritos (como máximo `out.len()`).
+    fn read_chunk_into(&mut self, out: &PyArray1<f32>) -> PyResult<usize> {
+        let shmem = match &self.shared_buffer.shmem {
+            Some(s) => s,
+            None => return Ok(0),
+        };
+
+        let available = self.shared_buffer.write_pos.load(Ordering::Acquire) - self.read_pos;
+        // SAFETY: `out` no se comparte con otro hilo mientras se mantiene el GIL
+        let slice = unsafe { out.as_slice_mut()? };
+        let n = available.min(slice.len());
+        if n == 0 {
+            return Ok(0);
+        }
+
+        // SAFETY: [read_pos, read_pos + n) ya fue escrito por el callback (Acquire sobre write_pos)
+        unsafe {
+            std::ptr::copy_nonoverlapping(
+                (shmem.as_ptr() as *const f32).add(self.read_pos),
+                slice.as_mut_ptr(),
+                n,
+            );
+        }
+        self.read_pos += n;
+        Ok(n)
+    }
+
     /// Detiene la grabación y devuelve el audio re-muestreado.
     fn stop<'py>(&mut self, py: Python<'py>) -> PyResult<&'py PyArray1<f32>> {
         if !self.is_recording {
-            return Err(pyo3::exceptions::PyRuntimeError::new_err("No se está grabando"));
+            return Err(RustEngineStopError::new_err("No se está grabando"));
         }
 
         self.stream = None;
@@ -744,12 +801,12 @@ impl ZeroCopyAudioRecorder {
                 1,
             )
             .map_err(|e| {
-                pyo3::exceptions::PyRuntimeError::new_err(format!("Fallo init re-muestreador: {}", e))
+                RustEngineStopError::new_err(format!("Fallo init re-muestreador: {}", e))
             })?;
 
             let waves = vec![raw_data];
             let resampled_waves = resampler.process(&waves, None).map_err(|e| {
-                pyo3::exceptions::PyRuntimeError::new_err(format!("Fallo al re-muestrear: {}", e))
+                RustEngineStopError::new_err(format!("Fallo al re-muestrear: {}", e))
             })?;
 
             resampled_waves[0].clone()
@@ -1049,7 +1106,10 @@ impl SystemMonitor {
 // ============================================================================
 
 #[pymodule]
-fn v2m_engine(_py: Python, m: &PyModule) -> PyResult<()> {
+fn v2m_engine(py: Python, m: &PyModule) -> PyResult<()> {
+    m.add("RustEngineError", py.get_type::<RustEngineError>())?;
+    m.add("RustEngineStartError", py.get_type::<RustEngineStartError>())?;
+    m.add("RustEngineStopError", py.get_type::<RustEngineStopError>())?;
     m.add_class::<AudioRecorder>()?;
     m.add_class::<SharedAudioBuffer>()?;
     m.add_class::<ZeroCopyAudioRecorder>()?;
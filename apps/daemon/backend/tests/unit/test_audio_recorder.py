@@ -34,6 +34,8 @@ Ejecución
     >>> pytest tests/unit/test_audio_recorder.py -v
 """
 
+import asyncio
+import threading
 import unittest
 from unittest.mock import MagicMock, patch
 
@@ -126,7 +128,7 @@ class TestAudioRecorder(unittest.TestCase):
         """
         # ARRANGE: Configuramos el entorno de prueba
         mock_stream = MagicMock()
-        mock_sd.InputStream.return_value = mock_stream
+        mock_sd.RawInputStream.return_value = mock_stream
 
         self.recorder.start()
 
@@ -145,6 +147,131 @@ class TestAudioRecorder(unittest.TestCase):
         with self.assertRaises(RecordingError):
             self.recorder.stop()
 
+    @patch("v2m.features.audio.recorder.sd")
+    def test_buffer_grows_beyond_initial_capacity(self, mock_sd: MagicMock) -> None:
+        """Verifica que el buffer fallback crezca bajo demanda sin perder audio.
+
+        El buffer arranca con `INITIAL_BUFFER_SEC` de capacidad (no la duración
+        máxima completa) y duplica su tamaño cuando el hilo de drenado lo llena.
+        """
+        # ARRANGE: recorder con capacidad inicial de 1 segundo
+        recorder = AudioRecorder(mode="fallback", sample_rate=1000, max_duration_sec=10)
+        recorder._initial_capacity = 1000
+        recorder._buffer = recorder._allocate_buffer()
+        mock_sd.RawInputStream.return_value = MagicMock()
+
+        recorder.start()
+
+        # ACT: escribir 1.5 segundos en bloques de 500 samples
+        for value in (1.0, 2.0, 3.0):
+            recorder._write_samples(np.full(500, value, dtype=np.float32))
+
+        # ASSERT: el buffer creció y conserva los datos en orden
+        self.assertGreaterEqual(len(recorder._buffer), 1500)
+        audio = recorder.stop()
+        self.assertEqual(len(audio), 1500)
+        self.assertEqual(audio[0], 1.0)
+        self.assertEqual(audio[999], 2.0)
+        self.assertEqual(audio[1499], 3.0)
+
+    @patch("v2m.features.audio.recorder.sd")
+    def test_drain_thread_copies_stream_blocks(self, mock_sd: MagicMock) -> None:
+        """Verifica que el hilo de drenado copie los bloques leídos del RawInputStream.
+
+        El fallback no registra callback: un hilo lee bloques crudos (bytes float32)
+        del stream y los vuelca en el buffer hasta que se detiene la grabación.
+        """
+        # ARRANGE: dos bloques de audio y luego fin del stream
+        blocks = [
+            (np.full(1024, 0.5, dtype=np.float32).tobytes(), False),
+            (np.full(1024, 0.25, dtype=np.float32).tobytes(), False),
+        ]
+
+        def read(frames):
+            if blocks:
+                return blocks.pop(0)
+            raise RuntimeError("stream cerrado")
+
+        mock_stream = MagicMock()
+        mock_stream.read.side_effect = read
+        mock_sd.RawInputStream.return_value = mock_stream
+
+        # ACT
+        self.recorder.start()
+        self.recorder._drain_thread.join(timeout=1.0)
+        audio = self.recorder.stop()
+
+        # ASSERT
+        self.assertEqual(len(audio), 2048)
+        self.assertEqual(audio[0], 0.5)
+        self.assertEqual(audio[2047], 0.25)
+        mock_stream.close.assert_called_once()
+
+    @patch("v2m.features.audio.recorder.sd")
+    def test_stop_aborts_stream_when_drain_thread_hangs(self, mock_sd: MagicMock) -> None:
+        """Verifica que stop() aborte el stream si read() sigue bloqueado tras el join.
+
+        Con el dispositivo colgado el hilo de drenado no sale solo: abort() lo
+        desbloquea y solo entonces se cierra el stream.
+        """
+        # ARRANGE: read() bloquea hasta que alguien llame a abort()
+        aborted = threading.Event()
+
+        def read(frames):
+            aborted.wait()
+            raise RuntimeError("stream abortado")
+
+        mock_stream = MagicMock()
+        mock_stream.read.side_effect = read
+        mock_stream.abort.side_effect = aborted.set
+        mock_sd.RawInputStream.return_value = mock_stream
+
+        # ACT
+        self.recorder.start()
+        drain_thread = self.recorder._drain_thread
+        self.recorder.stop()
+
+        # ASSERT
+        mock_stream.abort.assert_called_once()
+        self.assertFalse(drain_thread.is_alive())
+        mock_stream.close.assert_called_once()
+
+    def test_read_chunk_into_is_incremental(self) -> None:
+        """Verifica que read_chunk_into() copie solo los samples nuevos al buffer del caller."""
+        # ARRANGE: grabación simulada con 3000 samples escritos
+        self.recorder._recording = True
+        self.recorder._buffer[:3000] = np.arange(3000, dtype=np.float32)
+        self.recorder._write_pos = 3000
+        out = np.empty(2048, dtype=np.float32)
+
+        # ACT & ASSERT: primera lectura llena el buffer, la segunda trae el resto
+        self.assertEqual(self.recorder.read_chunk_into(out), 2048)
+        self.assertEqual(out[2047], 2047.0)
+        self.assertEqual(self.recorder.read_chunk_into(out), 952)
+        self.assertEqual(out[0], 2048.0)
+        self.assertEqual(self.recorder.read_chunk_into(out), 0)
+
+    @patch("v2m.features.audio.recorder.sf", None)
+    def test_save_wav_reuses_int16_scratch(self) -> None:
+        """Verifica que _save_wav() sin soundfile cuantice en un scratch int16 reutilizado."""
+        import tempfile
+        import wave
+        from pathlib import Path
+
+        audio = np.linspace(-1.0, 1.0, 4000, dtype=np.float32)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            # ACT: dos guardados, el segundo más corto que el primero
+            self.recorder._save_wav(audio, Path(tmp) / "a.wav")
+            scratch = self.recorder._int16_scratch
+            self.recorder._save_wav(audio[:1000], Path(tmp) / "b.wav")
+
+            # ASSERT: mismo buffer y contenido idéntico a la conversión directa
+            self.assertIs(self.recorder._int16_scratch, scratch)
+            with wave.open(str(Path(tmp) / "b.wav"), "rb") as wf:
+                written = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+            np.testing.assert_array_equal(written, (audio[:1000] * 32767).astype(np.int16))
+
     def test_stop_raises_error_with_orphaned_buffer_data(self) -> None:
         """Verifica que stop() falle incluso si hay datos huérfanos en el buffer.
 
@@ -209,6 +336,34 @@ class TestAudioRecorder(unittest.TestCase):
         with self.assertRaises(RecordingError):
             self.recorder.stop()
 
+    def test_wait_for_data_wakes_on_drain_thread_write(self) -> None:
+        """Verifica que wait_for_data (fallback) despierte con la escritura del hilo de drenado.
+
+        Sin polling: el hilo escritor activa el evento del loop tras publicar el
+        bloque, y stop() despierta a quien siga esperando.
+        """
+        self.recorder._recording = True
+
+        async def scenario() -> None:
+            waiter = asyncio.ensure_future(self.recorder.wait_for_data())
+            await asyncio.sleep(0)
+            self.assertFalse(waiter.done())
+
+            writer = threading.Thread(target=self.recorder._write_samples, args=(np.ones(1024, dtype=np.float32),))
+            writer.start()
+            await asyncio.wait_for(waiter, timeout=1.0)
+            writer.join()
+
+            # Consumido el bloque, la siguiente espera solo termina con stop()
+            self.recorder.read_chunk()
+            waiter = asyncio.ensure_future(self.recorder.wait_for_data())
+            await asyncio.sleep(0)
+            self.assertFalse(waiter.done())
+            self.recorder.stop()
+            await asyncio.wait_for(waiter, timeout=1.0)
+
+        asyncio.run(scenario())
+
 
 if __name__ == "__main__":
     unittest.main()
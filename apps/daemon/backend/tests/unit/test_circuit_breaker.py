@@ -0,0 +1,70 @@
+"""Pruebas unitarias del circuit breaker de backends remotos (AsyncCircuitBreaker)."""
+
+import asyncio
+
+import pytest
+
+from v2m.shared.circuit_breaker import AsyncCircuitBreaker
+from v2m.shared.errors import LLMError
+
+
+async def _fail(breaker: AsyncCircuitBreaker) -> None:
+    with pytest.raises(ConnectionError):
+        async with breaker.guard():
+            raise ConnectionError("caído")
+
+
+async def test_opens_after_threshold_and_fails_fast() -> None:
+    """Tras N fallos consecutivos las llamadas fallan sin ejecutar el bloque."""
+    breaker = AsyncCircuitBreaker("fake", failure_threshold=2, reset_after=60, error_type=LLMError)
+    await _fail(breaker)
+    assert not breaker.is_open
+    await _fail(breaker)
+
+    ran = False
+    with pytest.raises(LLMError, match="circuito abierto"):
+        async with breaker.guard():
+            ran = True
+    assert breaker.is_open
+    assert not ran
+
+
+async def test_success_resets_consecutive_failures() -> None:
+    """Un éxito intermedio reinicia la racha de fallos."""
+    breaker = AsyncCircuitBreaker("fake", failure_threshold=2, reset_after=60)
+    await _fail(breaker)
+    async with breaker.guard():
+        pass
+    await _fail(breaker)
+
+    assert not breaker.is_open
+
+
+async def test_half_open_probe_closes_or_reopens(monkeypatch) -> None:
+    """Pasado `reset_after` una sola llamada de prueba decide el estado."""
+    now = [0.0]
+    monkeypatch.setattr("v2m.shared.circuit_breaker.time.monotonic", lambda: now[0])
+    breaker = AsyncCircuitBreaker("fake", failure_threshold=1, reset_after=10)
+    await _fail(breaker)
+
+    now[0] = 11.0
+    await _fail(breaker)  # la prueba falla: se reabre por otros 10 s
+    now[0] = 15.0
+    with pytest.raises(Exception, match="circuito abierto"):
+        async with breaker.guard():
+            pass
+
+    now[0] = 22.0
+    async with breaker.guard():
+        pass
+    assert not breaker.is_open
+
+
+async def test_cancellation_is_not_a_failure() -> None:
+    """Una cancelación no cuenta como fallo del backend."""
+    breaker = AsyncCircuitBreaker("fake", failure_threshold=1, reset_after=60)
+    with pytest.raises(asyncio.CancelledError):
+        async with breaker.guard():
+            raise asyncio.CancelledError
+
+    assert not breaker.is_open
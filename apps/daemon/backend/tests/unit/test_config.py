@@ -39,7 +39,11 @@ Ejecución
     >>> pytest tests/unit/test_config.py -v
 """
 
-from v2m.shared.config import Settings
+import os
+from pathlib import Path
+
+from v2m.shared import config as config_module
+from v2m.shared.config import Settings, get_config
 
 
 def test_config_loading() -> None:
@@ -138,3 +142,35 @@ def test_ollama_config_defaults() -> None:
         f"Temperatura inesperada: {config.llm.ollama.temperature}. "
         "Debe ser 0.0 para structured outputs determinísticos."
     )
+
+
+def test_config_is_lazy_singleton() -> None:
+    """`config` se resuelve con `get_config()` y es la misma instancia en cada acceso."""
+    from v2m.shared.config import config
+
+    assert config is get_config()
+    assert config_module.config is config
+
+
+def test_toml_is_parsed_once_per_mtime(tmp_path: Path, monkeypatch) -> None:
+    """El TOML se reparsea solo si cambia su mtime; la copia devuelta es independiente."""
+    toml_file = tmp_path / "config.toml"
+    toml_file.write_text("[gemini]\nretry_attempts = 7\n")
+    monkeypatch.setitem(Settings.model_config, "toml_file", toml_file)
+    calls = []
+    original = config_module.TomlConfigSettingsSource._read_file
+    monkeypatch.setattr(
+        config_module.TomlConfigSettingsSource,
+        "_read_file",
+        lambda self, path: calls.append(path) or original(self, path),
+    )
+
+    assert Settings().gemini.retry_attempts == 7
+    assert Settings().gemini.retry_attempts == 7
+    assert len(calls) == 1
+
+    toml_file.write_text("[gemini]\nretry_attempts = 2\n")
+    stat = toml_file.stat()
+    os.utime(toml_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert Settings().gemini.retry_attempts == 2
+    assert len(calls) == 2
@@ -0,0 +1,46 @@
+"""Pruebas de la localización de librerías NVIDIA en `v2m.shared.utils.env`."""
+
+import os
+from pathlib import Path
+
+from v2m.shared.utils import env
+from v2m.shared.utils.env import _find_libraries
+
+
+def test_find_libraries_prefers_shortest_name_per_directory(tmp_path: Path) -> None:
+    """Cada librería resuelve al nombre más corto de cada directorio, en orden de directorios."""
+    cublas = tmp_path / "cublas" / "lib"
+    cudnn = tmp_path / "cudnn" / "lib"
+    for lib_dir, names in (
+        (cublas, ["libcublas.so.12.4.5", "libcublas.so.12", "libcublasLt.so.12"]),
+        (cudnn, ["libcudnn.so.9", "libcudnn_ops.so.9", "libcudnn_ops.so.9.1.0", "libcublas.so.11"]),
+    ):
+        lib_dir.mkdir(parents=True)
+        for name in names:
+            (lib_dir / name).touch()
+
+    found = _find_libraries([cublas, cudnn], ("libcublas.so", "libcublasLt.so", "libcudnn_ops.so", "libcudnn.so"))
+
+    assert found == {
+        "libcublas.so": [str(cublas / "libcublas.so.12"), str(cudnn / "libcublas.so.11")],
+        "libcublasLt.so": [str(cublas / "libcublasLt.so.12")],
+        "libcudnn_ops.so": [str(cudnn / "libcudnn_ops.so.9")],
+        "libcudnn.so": [str(cudnn / "libcudnn.so.9")],
+    }
+
+
+def test_preload_nvidia_libraries_runs_once(tmp_path: Path, monkeypatch) -> None:
+    """Una segunda configuración de GPU no vuelve a tocar site-packages ni LD_LIBRARY_PATH."""
+    lib_dir = tmp_path / "nvidia" / "cublas" / "lib"
+    lib_dir.mkdir(parents=True)
+    calls = []
+    monkeypatch.setattr(env.site, "getsitepackages", lambda: calls.append(1) or [str(tmp_path)])
+    monkeypatch.setenv("LD_LIBRARY_PATH", "/usr/lib")
+    env._preload_nvidia_libraries.cache_clear()
+
+    env._preload_nvidia_libraries()
+    env._preload_nvidia_libraries()
+    env._preload_nvidia_libraries.cache_clear()
+
+    assert len(calls) == 1
+    assert os.environ["LD_LIBRARY_PATH"] == f"{lib_dir}:/usr/lib"
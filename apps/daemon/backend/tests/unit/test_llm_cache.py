@@ -0,0 +1,46 @@
+"""Pruebas unitarias de la caché de respuestas LLM exactas (LLMCache)."""
+
+from unittest.mock import patch
+
+from v2m.features.llm.cache import LLMCache
+
+
+def test_build_key_skips_non_deterministic_calls() -> None:
+    """Solo las llamadas con temperatura 0 (y con la caché activa) generan clave."""
+    cache = LLMCache(max_entries=4, ttl_seconds=60)
+
+    assert cache.build_key("m", "sys", "hola", 0.3) is None
+    assert cache.build_key("m", "sys", "hola", 0.0) == cache.build_key("m", "sys", "hola", 0.0)
+    assert cache.build_key("m", "sys", "hola", 0.0) != cache.build_key("m", "otro", "hola", 0.0)
+    assert LLMCache(max_entries=4, ttl_seconds=60, enabled=False).build_key("m", "sys", "hola", 0.0) is None
+
+
+def test_get_set_counts_hits_and_misses() -> None:
+    """Un acierto devuelve la respuesta guardada; una clave None no se contabiliza."""
+    cache = LLMCache(max_entries=4, ttl_seconds=60)
+    key = cache.build_key("m", "sys", "hola", 0.0)
+
+    assert cache.get(key) is None
+    cache.set(key, "Hola.")
+    assert cache.get(key) == "Hola."
+    assert cache.get(None) is None
+
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_lru_eviction_and_ttl() -> None:
+    """Se expulsa la entrada menos usada y las expiradas dejan de servirse."""
+    cache = LLMCache(max_entries=2, ttl_seconds=10)
+
+    with patch("v2m.features.llm.cache.time.monotonic", return_value=100.0):
+        cache.set("a", "A")
+        cache.set("b", "B")
+        cache.get("a")  # "b" pasa a ser la menos usada
+        cache.set("c", "C")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "A"
+
+    with patch("v2m.features.llm.cache.time.monotonic", return_value=111.0):
+        assert cache.get("a") is None
+        assert len(cache) == 1
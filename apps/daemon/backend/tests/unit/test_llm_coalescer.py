@@ -0,0 +1,65 @@
+"""Pruebas unitarias de la unión de llamadas LLM concurrentes (CoalescingLLMService)."""
+
+import asyncio
+
+from v2m.features.llm.coalescer import CoalescingLLMService
+
+
+class _SlowService:
+    """Servicio LLM falso que cuenta llamadas y tarda un poco en responder."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.model_name = "fake"
+
+    async def process_text(self, text: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return text.upper()
+
+    async def translate_text(self, text: str, target_lang: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return f"{target_lang}:{text}"
+
+
+async def test_identical_concurrent_calls_share_one_request() -> None:
+    """Dos refinamientos iguales en vuelo generan una sola llamada al backend."""
+    inner = _SlowService()
+    service = CoalescingLLMService(inner)
+
+    results = await asyncio.gather(service.process_text("hola"), service.process_text("hola"))
+
+    assert results == ["HOLA", "HOLA"]
+    assert inner.calls == 1
+    assert not service._inflight
+
+
+async def test_distinct_calls_are_not_merged() -> None:
+    """Textos o idiomas distintos, y llamadas sucesivas, llegan al backend por separado."""
+    inner = _SlowService()
+    service = CoalescingLLMService(inner)
+
+    await asyncio.gather(
+        service.translate_text("hola", "en"),
+        service.translate_text("hola", "fr"),
+        service.process_text("adiós"),
+    )
+    await service.process_text("adiós")
+
+    assert inner.calls == 4
+    assert service.model_name == "fake"  # atributos no cubiertos se delegan
+
+
+async def test_cancelled_caller_does_not_cancel_shared_call() -> None:
+    """Cancelar a un llamador no aborta la llamada que otro sigue esperando."""
+    inner = _SlowService()
+    service = CoalescingLLMService(inner)
+
+    first = asyncio.create_task(service.process_text("hola"))
+    second = asyncio.create_task(service.process_text("hola"))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "HOLA"
+    assert inner.calls == 1
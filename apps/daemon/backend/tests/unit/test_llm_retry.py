@@ -0,0 +1,89 @@
+"""Pruebas unitarias de los reintentos y el circuit breaker de los servicios LLM."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from v2m.shared.config import config
+from v2m.shared.errors import LLMError
+
+tenacity = pytest.importorskip("tenacity")
+httpx = pytest.importorskip("httpx")
+
+
+def _ollama_service(monkeypatch):
+    pytest.importorskip("ollama")
+    from v2m.features.llm.ollama_service import OllamaLLMService
+
+    monkeypatch.setattr(OllamaLLMService._chat.retry, "wait", tenacity.wait_none())
+    service = OllamaLLMService()
+    service._client.chat = AsyncMock()
+    return service
+
+
+def _gemini_service(monkeypatch):
+    pytest.importorskip("google.genai")
+    from v2m.features.llm.gemini_service import GeminiLLMService
+
+    monkeypatch.setattr(config.gemini, "api_key", "test-key")
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    monkeypatch.setattr(GeminiLLMService._generate.retry, "wait", tenacity.wait_none())
+    service = GeminiLLMService()
+    service.client = MagicMock()
+    service.client.aio.models.generate_content = AsyncMock()
+    return service
+
+
+@pytest.mark.asyncio
+async def test_ollama_retries_transient_errors(monkeypatch) -> None:
+    """Un `ConnectTimeout` se reintenta y cuenta como un solo fallo del breaker."""
+    service = _ollama_service(monkeypatch)
+    service._client.chat.side_effect = httpx.ConnectTimeout("timeout")
+
+    with pytest.raises(LLMError):
+        await service.process_text("reintento ollama")
+
+    assert service._client.chat.await_count == 3
+    assert service._breaker._failures == 1
+
+
+@pytest.mark.asyncio
+async def test_gemini_retries_transient_errors(monkeypatch) -> None:
+    """Gemini agota `retry_attempts` llamadas antes de envolver el error en `LLMError`."""
+    service = _gemini_service(monkeypatch)
+    generate = service.client.aio.models.generate_content
+    generate.side_effect = httpx.ConnectTimeout("timeout")
+
+    with pytest.raises(LLMError):
+        await service.process_text("reintento gemini")
+
+    assert generate.await_count == config.gemini.retry_attempts
+    assert service._breaker._failures == 1
+
+
+@pytest.mark.asyncio
+async def test_gemini_empty_replies_do_not_open_circuit(monkeypatch) -> None:
+    """Respuestas vacías (p. ej. bloqueo de seguridad) fallan sin contar para el breaker."""
+    service = _gemini_service(monkeypatch)
+    service.client.aio.models.generate_content.return_value = MagicMock(text="")
+
+    for i in range(config.llm.circuit_breaker.failure_threshold + 1):
+        with pytest.raises(LLMError, match="vacía"):
+            await service.process_text(f"respuesta vacía {i}")
+
+    assert not service._breaker.is_open
+    assert service._breaker._failures == 0
+
+
+@pytest.mark.asyncio
+async def test_ollama_invalid_replies_do_not_open_circuit(monkeypatch) -> None:
+    """Respuestas fuera de esquema fallan sin contar para el breaker."""
+    service = _ollama_service(monkeypatch)
+    service._client.chat.return_value = MagicMock(message=MagicMock(content='{"explanation": "sin texto"}'))
+
+    for i in range(config.llm.circuit_breaker.failure_threshold + 1):
+        with pytest.raises(LLMError):
+            await service.process_text(f"respuesta inválida {i}")
+
+    assert not service._breaker.is_open
+    assert service._breaker._failures == 0
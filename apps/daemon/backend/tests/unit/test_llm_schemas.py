@@ -0,0 +1,27 @@
+"""Pruebas unitarias del parseo de respuestas estructuradas del LLM."""
+
+import pytest
+
+from v2m.features.llm import schemas
+from v2m.features.llm.schemas import parse_corrected_text
+
+_RAW = '{"corrected_text": "Hola, ¿qué tal?", "explanation": null}'
+
+
+def test_parse_corrected_text_without_msgspec(monkeypatch) -> None:
+    """Sin msgspec se valida con el modelo Pydantic."""
+    monkeypatch.setattr(schemas, "_CORRECTION_DECODER", None)
+
+    assert parse_corrected_text(_RAW) == "Hola, ¿qué tal?"
+    with pytest.raises(ValueError):
+        parse_corrected_text('{"explanation": "sin texto"}')
+
+
+def test_parse_corrected_text_with_msgspec() -> None:
+    """Con msgspec se aceptan str y bytes y se rechaza la misma forma inválida."""
+    msgspec = pytest.importorskip("msgspec")
+
+    assert parse_corrected_text(_RAW) == "Hola, ¿qué tal?"
+    assert parse_corrected_text(_RAW.encode()) == "Hola, ¿qué tal?"
+    with pytest.raises(msgspec.ValidationError):
+        parse_corrected_text('{"explanation": "sin texto"}')
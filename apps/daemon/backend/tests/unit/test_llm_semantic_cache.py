@@ -0,0 +1,101 @@
+"""Pruebas unitarias de la caché semántica de refinamientos LLM (SemanticCache)."""
+
+import asyncio
+import time
+
+import numpy as np
+
+from v2m.features.llm import semantic_cache
+from v2m.features.llm.semantic_cache import SemanticCache
+
+
+class _FakeEncoder:
+    """Modelo de embeddings determinista: un eje por palabra conocida."""
+
+    _VOCAB = ("abre", "el", "navegador", "por", "favor", "cierra")
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return len(self._VOCAB)
+
+    def encode(self, text, normalize_embeddings=True, convert_to_numpy=True):
+        words = text.lower().split()
+        vector = np.array([words.count(w) for w in self._VOCAB], dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+
+
+def _make_cache(tmp_path=None, max_entries: int = 4, threshold: float = 0.75) -> SemanticCache:
+    cache = SemanticCache(
+        "fake", threshold=threshold, max_entries=max_entries, persist_path=tmp_path and tmp_path / "sc.npz"
+    )
+    cache._model = _FakeEncoder()
+    cache._allocate(cache._model.get_sentence_embedding_dimension())
+    return cache
+
+
+async def test_near_duplicate_hits_within_namespace() -> None:
+    """Un texto casi idéntico reutiliza la respuesta, solo dentro del mismo espacio de nombres."""
+    cache = _make_cache()
+    first = await cache.embed("abre el navegador")
+    cache.add("refine", first, "Abre el navegador.")
+
+    similar = await cache.embed("abre el navegador por favor")
+    assert cache.lookup("refine", similar) == "Abre el navegador."
+    assert cache.lookup("translate", similar) is None
+    assert cache.lookup("refine", await cache.embed("cierra")) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+async def test_fifo_ring_replaces_oldest() -> None:
+    """Al llenarse, la inserción reemplaza la entrada más antigua sin crecer."""
+    cache = _make_cache(max_entries=2, threshold=0.99)
+    for text in ("abre", "cierra", "navegador"):
+        cache.add("ns", await cache.embed(text), text.upper())
+
+    assert len(cache) == 2
+    assert cache.lookup("ns", await cache.embed("abre")) is None
+    assert cache.lookup("ns", await cache.embed("navegador")) == "NAVEGADOR"
+
+
+async def test_save_and_restore_round_trip(tmp_path) -> None:
+    """La caché persistida se recupera con el mismo modelo."""
+    cache = _make_cache(tmp_path)
+    cache.add("ns", await cache.embed("abre el navegador"), "Abre el navegador.")
+    cache.save()
+
+    restored = _make_cache(tmp_path)
+    restored._restore()
+    assert restored.lookup("ns", await restored.embed("abre el navegador")) == "Abre el navegador."
+
+
+async def test_disabled_cache_is_a_no_op() -> None:
+    """Desactivada, no calcula embeddings y las operaciones no tienen efecto."""
+    cache = SemanticCache("fake", threshold=0.9, max_entries=2, enabled=False)
+
+    embedding = await cache.embed("abre")
+    cache.add("ns", embedding, "x")
+
+    assert embedding is None
+    assert cache.lookup("ns", embedding) is None
+    assert len(cache) == 0
+
+
+async def test_concurrent_first_use_loads_model_once(monkeypatch) -> None:
+    """Dos consultas simultáneas en el primer uso cargan el modelo una sola vez y no pierden entradas."""
+    loads = []
+
+    def fake_sentence_transformer(name, device):
+        loads.append(name)
+        time.sleep(0.05)  # Ventana para que el otro hilo llegue a la carga
+        return _FakeEncoder()
+
+    monkeypatch.setattr(semantic_cache, "SentenceTransformer", fake_sentence_transformer)
+    cache = SemanticCache("fake", threshold=0.99, max_entries=4)
+
+    first, second = await asyncio.gather(cache.embed("abre"), cache.embed("cierra"))
+    cache.add("ns", first, "ABRE")
+    cache.add("ns", second, "CIERRA")
+    await cache.warmup()
+
+    assert loads == ["fake"]
+    assert cache.lookup("ns", await cache.embed("abre")) == "ABRE"
+    assert cache.lookup("ns", await cache.embed("cierra")) == "CIERRA"
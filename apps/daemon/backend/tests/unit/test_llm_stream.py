@@ -0,0 +1,115 @@
+"""Pruebas unitarias del refinamiento LLM en streaming (SSE e iteración en hilo)."""
+
+import json
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from v2m.orchestration.llm_workflow import LLMWorkflow
+from v2m.shared.utils.aio import iterate_in_thread
+
+
+class _StreamingService:
+    """Servicio LLM falso que emite el texto palabra a palabra."""
+
+    def __init__(self, fail_after: int | None = None) -> None:
+        self._fail_after = fail_after
+
+    async def process_text_stream(self, text: str):
+        for i, word in enumerate(text.split(" ")):
+            if i == self._fail_after:
+                raise RuntimeError("backend caído")
+            yield word if i == 0 else f" {word}"
+
+
+def _workflow(service) -> LLMWorkflow:
+    workflow = LLMWorkflow()
+    workflow._llm_service = service
+    workflow._clipboard = MagicMock()
+    workflow._notifications = MagicMock()
+    return workflow
+
+
+def _parse(events: list[str]) -> list[tuple[str | None, dict]]:
+    parsed = []
+    for raw in events:
+        lines = raw.rstrip("\n").split("\n")
+        event = lines[0].removeprefix("event: ") if lines[0].startswith("event: ") else None
+        parsed.append((event, json.loads(lines[-1].removeprefix("data: "))))
+    return parsed
+
+
+async def test_process_text_stream_emits_chunks_then_done() -> None:
+    """Cada fragmento es un evento `data` y el final copia el texto completo."""
+    workflow = _workflow(_StreamingService())
+
+    events = _parse([e async for e in workflow.process_text_stream("hola que\ntal")])
+
+    assert events[:2] == [(None, {"text": "hola"}), (None, {"text": " que\ntal"})]
+    assert events[-1][0] == "done"
+    assert events[-1][1]["text"] == "hola que\ntal"
+    workflow._clipboard.copy.assert_called_once_with("hola que\ntal")
+
+
+async def test_process_text_stream_falls_back_to_original_text() -> None:
+    """Si el backend falla a mitad del stream se copia el texto original."""
+    workflow = _workflow(_StreamingService(fail_after=1))
+
+    events = _parse([e async for e in workflow.process_text_stream("hola que tal")])
+
+    event, response = events[-1]
+    assert (event, response["text"]) == ("done", "hola que tal")
+    assert response["backend"].endswith("(fallback)")
+    workflow._clipboard.copy.assert_called_once_with("hola que tal")
+
+
+async def test_iterate_in_thread_preserves_order_and_errors() -> None:
+    """Los elementos llegan en orden desde otro hilo y las excepciones se propagan."""
+    threads = set()
+
+    def produce():
+        for i in range(3):
+            threads.add(threading.get_ident())
+            yield i
+        raise ValueError("fin")
+
+    received = []
+    with pytest.raises(ValueError, match="fin"):
+        async for item in iterate_in_thread(produce):
+            received.append(item)
+
+    assert received == [0, 1, 2]
+    assert threading.get_ident() not in threads
+
+
+async def test_iterate_in_thread_stops_producer_on_early_exit() -> None:
+    """Al abandonar la iteración el productor se detiene y libera el hilo."""
+    produced = []
+
+    def produce():
+        for i in range(1000):
+            produced.append(i)
+            time.sleep(0.001)
+            yield i
+
+    chunks = iterate_in_thread(produce)
+    async for item in chunks:
+        if item == 1:
+            break
+    await chunks.aclose()
+
+    assert len(produced) < 1000
+
+
+async def test_iterate_in_thread_propagates_contextvars() -> None:
+    """El productor ve los contextvars del consumidor (p. ej. ids de solicitud)."""
+    import contextvars
+
+    request_id = contextvars.ContextVar("request_id", default=None)
+    request_id.set("req-1")
+
+    items = [item async for item in iterate_in_thread(lambda: iter([request_id.get()]))]
+
+    assert items == ["req-1"]
@@ -0,0 +1,112 @@
+"""Pruebas unitarias del punto de entrada (arranque en frío)."""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import v2m.main
+from v2m.main import _send_http_command
+
+
+def test_cli_import_does_not_load_config() -> None:
+    """Importar `v2m.main` (--help, comandos del cliente) no carga config ni logging."""
+    code = "import sys, v2m.main; print(sorted(m for m in sys.modules if m.startswith('v2m.shared')))"
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env)
+
+    assert result.stdout.strip() == "[]"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    # Cierra la conexión tras responder sin avisar (como el timeout de keep-alive)
+    drop_after_response = False
+
+    def setup(self) -> None:
+        super().setup()
+        type(self).connections += 1
+
+    def do_GET(self) -> None:
+        status = 200 if self.path == "/status" else 404
+        body = json.dumps({"state": "idle"}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.close_connection = self.drop_after_response
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server_port():
+    """Servidor HTTP local que imita `/status` del daemon; devuelve su puerto."""
+    _Handler.connections = 0
+    _Handler.drop_after_response = False
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1]
+    if v2m.main._conn is not None:
+        v2m.main._conn.close()
+        v2m.main._conn = None
+    server.shutdown()
+    server.server_close()
+
+
+def test_send_http_command_prints_json(server_port, capsys) -> None:
+    """El comando imprime el JSON del daemon tal cual lo recibe."""
+    _send_http_command("status", server_port)
+
+    assert json.loads(capsys.readouterr().out) == {"state": "idle"}
+
+
+def test_send_http_command_exits_on_http_error(server_port, capsys) -> None:
+    """Un estado HTTP de error termina con código 1, como `raise_for_status`."""
+    with pytest.raises(SystemExit) as exc:
+        _send_http_command("health", server_port)
+
+    assert exc.value.code == 1
+    assert "404" in capsys.readouterr().out
+
+
+def test_send_http_command_exits_when_daemon_is_down(capsys) -> None:
+    """Sin servidor escuchando se informa que el daemon no está corriendo."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    with pytest.raises(SystemExit):
+        _send_http_command("status", port)
+
+    assert "No se pudo conectar" in capsys.readouterr().out
+
+
+def test_send_http_command_reuses_connection(server_port, capsys) -> None:
+    """Comandos sucesivos en el mismo proceso comparten la conexión keep-alive."""
+    _send_http_command("status", server_port)
+    _send_http_command("status", server_port)
+
+    assert capsys.readouterr().out.count("idle") == 2
+    assert _Handler.connections == 1
+
+
+def test_send_http_command_reconnects_after_server_close(server_port, capsys) -> None:
+    """Si el servidor cerró la conexión reutilizada, se reintenta con una nueva."""
+    _Handler.drop_after_response = True
+
+    _send_http_command("status", server_port)
+    _send_http_command("status", server_port)
+
+    assert capsys.readouterr().out.count("idle") == 2
+    assert _Handler.connections == 2
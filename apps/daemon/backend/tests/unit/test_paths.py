@@ -0,0 +1,29 @@
+"""Pruebas de `get_secure_runtime_dir`."""
+
+from pathlib import Path
+
+import pytest
+
+from v2m.shared.utils.paths import get_secure_runtime_dir
+
+
+@pytest.fixture
+def fresh_cache():
+    """Aísla la caché de `get_secure_runtime_dir` del resto de la suite."""
+    get_secure_runtime_dir.cache_clear()
+    yield
+    get_secure_runtime_dir.cache_clear()
+
+
+def test_runtime_dir_is_created_once_and_cached(tmp_path: Path, monkeypatch, fresh_cache) -> None:
+    """El directorio se crea con 0700 y las llamadas siguientes no vuelven a tocar el disco."""
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+
+    runtime_dir = get_secure_runtime_dir("v2m_test")
+
+    assert runtime_dir == tmp_path / "v2m_test"
+    assert runtime_dir.stat().st_mode & 0o777 == 0o700
+
+    runtime_dir.rmdir()
+    assert get_secure_runtime_dir("v2m_test") is runtime_dir
+    assert not runtime_dir.exists()
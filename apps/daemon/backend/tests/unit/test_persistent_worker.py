@@ -64,3 +64,189 @@ def test_worker_sync_init(mock_whisper_model):
 
     mock_class.assert_called_once()
     assert worker._model is not None
+
+
+@pytest.mark.asyncio
+async def test_worker_submit_latest_drops_superseded(mock_whisper_model):
+    import asyncio
+
+    worker = PersistentWhisperWorker(model_size="tiny", keep_warm=True)
+    await worker.initialize()
+
+    # Mientras el worker está ocupado, dos provisionales esperan turno: solo corre la última
+    async with worker._lock:
+        older = asyncio.create_task(worker.submit_latest(lambda model: "old"))
+        newer = asyncio.create_task(worker.submit_latest(lambda model: "new"))
+        await asyncio.sleep(0)
+
+    assert await older is None
+    assert await newer == "new"
+    # run_inference no participa del reemplazo
+    assert await worker.run_inference(lambda model: "final") == "final"
+
+
+@pytest.mark.asyncio
+async def test_worker_transcribe_stream_yields_before_decoding_ends(mock_whisper_model):
+    import threading
+
+    _mock_class, mock_instance = mock_whisper_model
+    first_consumed = threading.Event()
+
+    def segments():
+        yield "seg-1"
+        # El segundo segmento solo se decodifica después de consumir el primero
+        assert first_consumed.wait(timeout=5)
+        yield "seg-2"
+
+    mock_instance.transcribe.return_value = (segments(), None)
+    worker = PersistentWhisperWorker(model_size="tiny", keep_warm=True)
+    await worker.initialize()
+
+    received = []
+    async for segment in worker.transcribe_stream("audio", beam_size=1):
+        received.append(segment)
+        first_consumed.set()
+
+    assert received == ["seg-1", "seg-2"]
+    mock_instance.transcribe.assert_called_once_with("audio", beam_size=1)
+    assert not worker._lock.locked()
+
+
+def test_worker_auto_compute_type_follows_device(mock_whisper_model):
+    mock_class, _mock_instance = mock_whisper_model
+
+    assert PersistentWhisperWorker(model_size="tiny", device="cuda").compute_type == "int8_float16"
+    assert PersistentWhisperWorker(model_size="tiny", device="cpu", compute_type="float32").compute_type == "float32"
+
+    worker = PersistentWhisperWorker(model_size="tiny", device="cpu")
+    worker.initialize_sync()
+
+    assert worker.compute_type == "int8"
+    assert mock_class.call_args.kwargs["compute_type"] == "int8"
+    assert mock_class.call_args.kwargs["cpu_threads"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_worker_transcribe_passes_contiguous_float32(mock_whisper_model):
+    import numpy as np
+
+    _mock_class, mock_instance = mock_whisper_model
+    mock_instance.transcribe.return_value = (iter(()), None)
+    worker = PersistentWhisperWorker(model_size="tiny", keep_warm=True)
+    await worker.initialize()
+
+    buffer = np.zeros(32, dtype=np.float32)
+    await worker.transcribe(buffer)
+    assert mock_instance.transcribe.call_args.args[0] is buffer
+
+    await worker.transcribe(np.zeros(64, dtype=np.float64)[::2])
+    audio = mock_instance.transcribe.call_args.args[0]
+    assert audio.dtype == np.float32
+    assert audio.flags.c_contiguous
+
+
+@pytest.mark.asyncio
+async def test_worker_transcribe_batched_pipeline(mock_whisper_model):
+    _mock_class, mock_instance = mock_whisper_model
+
+    with patch("v2m.features.transcription.persistent_model.BatchedInferencePipeline") as mock_pipeline_class:
+        pipeline = mock_pipeline_class.return_value
+        pipeline.model = mock_instance
+        pipeline.transcribe.return_value = (iter(["seg"]), "info")
+        worker = PersistentWhisperWorker(model_size="tiny", keep_warm=True, batch_size=8)
+        await worker.initialize()
+
+        assert await worker.transcribe("audio", vad_filter=True) == (["seg"], "info")
+        pipeline.transcribe.return_value = (iter([]), "info")
+        await worker.transcribe("audio", vad_filter=True)
+
+    mock_pipeline_class.assert_called_once_with(mock_instance)
+    pipeline.transcribe.assert_called_with("audio", batch_size=8, vad_filter=True)
+    mock_instance.transcribe.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_jobs_on_one_dedicated_thread(mock_whisper_model):
+    import threading
+
+    worker = PersistentWhisperWorker(model_size="tiny", keep_warm=True)
+    await worker.initialize()
+
+    names = {await worker.run_inference(lambda model: threading.current_thread().name) for _ in range(3)}
+    assert names == {"whisper_worker"}
+
+    def fail(model):
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        await worker.run_inference(fail)
+    # El hilo sobrevive a una excepción del trabajo
+    assert await worker.run_inference(lambda model: "ok") == "ok"
+
+
+def test_worker_sync_init_falls_back_to_cpu_without_cuda(mock_whisper_model):
+    from v2m.shared.utils.env import CudaInfo
+
+    mock_class, _mock_instance = mock_whisper_model
+    no_cuda = CudaInfo(has_torch=True, available=False, device_names=())
+
+    with patch("v2m.features.transcription.persistent_model.cuda_info", return_value=no_cuda):
+        worker = PersistentWhisperWorker(model_size="tiny", device="cuda", keep_warm=True)
+        worker.initialize_sync()
+
+    assert (worker.device, worker.compute_type) == ("cpu", "int8")
+    assert mock_class.call_args.kwargs["device"] == "cpu"
+
+
+def test_worker_sync_init_warms_up_with_silence(mock_whisper_model):
+    import numpy as np
+
+    from v2m.features.transcription.persistent_model import WARMUP_SAMPLES
+
+    _mock_class, mock_instance = mock_whisper_model
+    mock_instance.transcribe.return_value = (iter([]), None)
+
+    worker = PersistentWhisperWorker(model_size="tiny", keep_warm=True)
+    worker.initialize_sync()
+
+    audio = mock_instance.transcribe.call_args.args[0]
+    assert audio.dtype == np.float32 and audio.shape == (WARMUP_SAMPLES,)
+    assert not audio.any()
+
+
+def test_worker_warmup_failure_keeps_model(mock_whisper_model):
+    _mock_class, mock_instance = mock_whisper_model
+    mock_instance.transcribe.side_effect = RuntimeError("cuda kernel")
+
+    worker = PersistentWhisperWorker(model_size="tiny", keep_warm=True)
+    worker.initialize_sync()
+
+    assert worker._model is mock_instance
+
+
+@pytest.mark.asyncio
+async def test_worker_preload_blocks_concurrent_lazy_load(mock_whisper_model):
+    import asyncio
+    import threading
+
+    mock_class, _mock_instance = mock_whisper_model
+    loading = threading.Event()
+    release = threading.Event()
+
+    def slow_load(*args, **kwargs):
+        loading.set()
+        assert release.wait(timeout=5)
+        return MagicMock()
+
+    mock_class.side_effect = slow_load
+    worker = PersistentWhisperWorker(model_size="tiny", keep_warm=True)
+
+    preload = asyncio.create_task(worker.preload())
+    await asyncio.to_thread(loading.wait, 5)
+    inference = asyncio.create_task(worker.run_inference(lambda model: model))
+    await asyncio.sleep(0.05)
+    release.set()
+
+    await preload
+    assert await inference is worker._model
+    mock_class.assert_called_once()
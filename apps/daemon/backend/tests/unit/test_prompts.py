@@ -0,0 +1,23 @@
+"""Pruebas unitarias de la carga de prompts del sistema (load_prompt)."""
+
+from unittest.mock import patch
+
+from v2m.shared.prompts import load_prompt
+
+
+def test_load_prompt_reads_file_once(tmp_path) -> None:
+    """El archivo se lee una sola vez; las llamadas siguientes comparten el mismo str."""
+    (tmp_path / "prompts").mkdir()
+    (tmp_path / "prompts" / "refine_system.txt").write_text("Eres un editor.", encoding="utf-8")
+    load_prompt.cache_clear()
+
+    with patch("v2m.shared.prompts.BASE_DIR", tmp_path):
+        first = load_prompt("refine_system")
+        (tmp_path / "prompts" / "refine_system.txt").unlink()
+        second = load_prompt("refine_system")
+        missing = load_prompt("no_existe")
+
+    load_prompt.cache_clear()
+    assert first == "Eres un editor."
+    assert second is first
+    assert missing is None
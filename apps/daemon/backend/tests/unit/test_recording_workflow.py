@@ -0,0 +1,70 @@
+"""Pruebas unitarias del workflow de grabación (cierre y notificaciones)."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from v2m.orchestration import recording_workflow
+from v2m.orchestration.recording_workflow import RecordingWorkflow
+from v2m.shared.config import config
+
+
+def _workflow(monkeypatch, tmp_path, stop_delay: float) -> RecordingWorkflow:
+    monkeypatch.setattr(config.paths, "recording_flag", tmp_path / "v2m_recording.pid")
+
+    async def stop() -> str:
+        await asyncio.sleep(stop_delay)
+        return "hola mundo"
+
+    workflow = RecordingWorkflow()
+    workflow._transcriber = MagicMock()
+    workflow._transcriber.stop = stop
+    workflow._clipboard = MagicMock()
+    workflow._notifications = MagicMock()
+    workflow._is_recording = True
+    return workflow
+
+
+@pytest.mark.asyncio
+async def test_stop_skips_processing_notice_when_fast(monkeypatch, tmp_path) -> None:
+    """Si el texto llega antes del umbral solo se notifica el resultado."""
+    workflow = _workflow(monkeypatch, tmp_path, stop_delay=0)
+
+    response = await workflow.stop()
+
+    assert response.text == "hola mundo"
+    titles = [c.args[0] for c in workflow._notifications.notify.call_args_list]
+    assert titles == ["✅ whisper - copiado"]
+    workflow._clipboard.copy.assert_called_once_with("hola mundo")
+
+
+@pytest.mark.asyncio
+async def test_stop_notifies_processing_when_slow(monkeypatch, tmp_path) -> None:
+    """Un cierre lento avisa "procesando" antes del resultado, sin cancelarse."""
+    monkeypatch.setattr(recording_workflow, "PROCESSING_NOTICE_DELAY", 0.01)
+    workflow = _workflow(monkeypatch, tmp_path, stop_delay=0.1)
+
+    response = await workflow.stop()
+
+    assert response.text == "hola mundo"
+    titles = [c.args[0] for c in workflow._notifications.notify.call_args_list]
+    assert titles == ["⚡ v2m procesando", "✅ whisper - copiado"]
+
+
+@pytest.mark.asyncio
+async def test_session_adapter_delegates_to_broadcast_fn() -> None:
+    """Con broadcast, `emit_event` es la propia función; sin ella, no hace nada."""
+    from v2m.orchestration.recording_workflow import WebSocketSessionAdapter
+
+    events = []
+
+    async def broadcast(event_type, data) -> None:
+        events.append((event_type, data))
+
+    adapter = WebSocketSessionAdapter(broadcast)
+    assert adapter.emit_event is broadcast
+    await adapter.emit_event("heartbeat", {"state": "recording"})
+    await WebSocketSessionAdapter().emit_event("heartbeat", {})
+
+    assert events == [("heartbeat", {"state": "recording"})]
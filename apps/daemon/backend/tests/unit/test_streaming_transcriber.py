@@ -6,6 +6,7 @@ Producer task reads audio into queue, Consumer task processes VAD and Whisper in
 """
 
 import asyncio
+import itertools
 from unittest.mock import AsyncMock, MagicMock
 
 import numpy as np
@@ -13,13 +14,26 @@ import pytest
 
 from v2m.features.audio.streaming_transcriber import StreamingTranscriber
 
+# Seeded once per module: reproducible runs, but successive calls still draw different audio
+_RNG = np.random.default_rng(0)
+
+
+def _generate_speech_chunks(count: int, duration_samples: int = 1600) -> list[np.ndarray]:
+    """Generate `count` mock audio chunks with enough energy to be detected as speech.
+
+    One seeded float32 batch (no float64 intermediate); each chunk is a row view.
+    """
+    # Simulate speech with random noise far above ENERGY_SPEECH_THRESHOLD (RMS 0.01):
+    # random() * 1.6 - 0.8 is Uniform(-0.8, 0.8) -> RMS approx 0.8/sqrt(3) = 0.46
+    batch = _RNG.random((count, duration_samples), dtype=np.float32)
+    batch *= 1.6
+    batch -= 0.8
+    return list(batch)
+
 
 def _generate_speech_chunk(duration_samples: int = 16000) -> np.ndarray:
-    """Generate a mock audio chunk with enough energy to be detected as speech."""
-    # Simulate speech with random noise above the energy threshold
-    # Threshold is 0.4.
-    # Uniform(-0.8, 0.8) -> RMS approx 0.8/sqrt(3) = 0.46 > 0.4
-    return np.random.uniform(-0.8, 0.8, duration_samples).astype(np.float32)
+    """Generate a single mock speech chunk."""
+    return _generate_speech_chunks(1, duration_samples)[0]
 
 
 def _generate_silence_chunk(duration_samples: int = 16000) -> np.ndarray:
@@ -50,6 +64,7 @@ def mock_worker():
             return ([segment], info)
 
     worker.run_inference = fake_inference
+    worker.submit_latest = fake_inference
     return worker
 
 
@@ -75,7 +90,13 @@ def create_mock_recorder(chunks: list[np.ndarray], delay_ms: float = 5):
         except StopIteration:
             return np.array([], dtype=np.float32)
 
+    def read_into(out):
+        chunk = read()
+        out[: len(chunk)] = chunk
+        return len(chunk)
+
     recorder.read_chunk = read
+    recorder.read_chunk_into = read_into
     recorder.start = MagicMock()
     recorder.stop = MagicMock()
     return recorder
@@ -85,7 +106,7 @@ def create_mock_recorder(chunks: list[np.ndarray], delay_ms: float = 5):
 def mock_recorder_speech():
     """Recorder with 2 seconds of speech audio."""
     # 2 seconds of speech at 16kHz, split into 100ms chunks = 20 chunks
-    chunks = [_generate_speech_chunk(1600) for _ in range(20)]
+    chunks = _generate_speech_chunks(20)
     return create_mock_recorder(chunks, delay_ms=5)
 
 
@@ -93,7 +114,7 @@ def mock_recorder_speech():
 def mock_recorder_speech_then_silence():
     """Recorder with speech followed by 1.5s silence (triggers commit at 1000ms)."""
     # 1 second speech (10 chunks * 100ms each)
-    speech = [_generate_speech_chunk(1600) for _ in range(10)]
+    speech = _generate_speech_chunks(10)
     # 1.5 second silence (15 chunks * 100ms each) - triggers commit at 1000ms
     silence = [_generate_silence_chunk(1600) for _ in range(15)]
     return create_mock_recorder(speech + silence, delay_ms=5)
@@ -148,6 +169,7 @@ async def test_streaming_emits_partials(mock_worker, mock_session, mock_recorder
             return ([seg], info)
 
     mock_worker.run_inference = fake_infer
+    mock_worker.submit_latest = fake_infer
 
     await streamer.start()
     # Need to wait >0.5s for segment_duration check + PROVISIONAL_INTERVAL
@@ -199,7 +221,7 @@ async def test_context_window_builds(mock_worker, mock_session, mock_recorder_sp
     # Patch silence threshold to be faster than test execution speed (0.1s)
     streamer._silence_commit_ms = 100
 
-    assert streamer._context_window == ""
+    assert streamer._build_context_prompt() == ""
 
     await streamer.start()
     await asyncio.sleep(1.5)  # Wait for commit
@@ -207,7 +229,8 @@ async def test_context_window_builds(mock_worker, mock_session, mock_recorder_sp
 
     # Context should contain transcribed text after commit
     # Note: context is updated on _infer_final commits, not just on stop
-    assert "hello world" in streamer._context_window, f"Expected 'hello world' in context: '{streamer._context_window}'"
+    context = streamer._build_context_prompt()
+    assert "hello world" in context, f"Expected 'hello world' in context: '{context}'"
 
 
 @pytest.mark.asyncio
@@ -227,7 +250,7 @@ async def test_no_crash_on_empty_audio(mock_worker, mock_session):
 async def test_queue_backpressure(mock_worker, mock_session):
     """Test that audio queue buffers chunks when Consumer is slow (no data loss)."""
     # Generate many chunks quickly
-    chunks = [_generate_speech_chunk(1600) for _ in range(50)]
+    chunks = _generate_speech_chunks(50)
     recorder = create_mock_recorder(chunks, delay_ms=1)  # Fast producer
 
     # Slow inference to simulate backpressure
@@ -270,7 +293,7 @@ async def test_queue_backpressure(mock_worker, mock_session):
 @pytest.mark.asyncio
 async def test_producer_consumer_isolation(mock_worker, mock_session):
     """Test that Producer continues even when Consumer is processing."""
-    chunks = [_generate_speech_chunk(1600) for _ in range(30)]
+    chunks = _generate_speech_chunks(30)
     recorder = create_mock_recorder(chunks, delay_ms=2)
 
     inference_started = asyncio.Event()
@@ -309,3 +332,181 @@ async def test_producer_consumer_isolation(mock_worker, mock_session):
 
     # Producer filled queue independently of Consumer state
     # (exact assertion depends on timing, but architecture is validated)
+
+
+@pytest.mark.asyncio
+async def test_drain_audio_batch_keeps_order(mock_worker, mock_session):
+    """Test that the Consumer drains queued chunks in order, bounded by VAD_BATCH."""
+    from v2m.features.audio.streaming_transcriber import VAD_BATCH
+
+    streamer = StreamingTranscriber(mock_worker, mock_session, create_mock_recorder([]))
+    for i in range(VAD_BATCH + 2):
+        streamer._audio_queue.put_nowait(np.full(16, i, dtype=np.float32))
+    streamer._audio_queue.put_nowait(np.array([], dtype=np.float32))
+
+    batch = streamer._drain_audio_batch()
+
+    assert [int(c[0]) for c in batch] == list(range(VAD_BATCH))
+    assert streamer._audio_queue.qsize() == 3
+
+
+def test_silero_windows_carry_context_and_state(mock_worker, mock_session):
+    """Test that Silero runs per 512-sample window, threading context, state and leftovers."""
+    from v2m.features.audio.streaming_transcriber import VAD_CONTEXT_SAMPLES
+
+    streamer = StreamingTranscriber(mock_worker, mock_session, create_mock_recorder([]))
+    inputs = []
+
+    def fake_run(_outputs, feeds):
+        inputs.append(feeds["input"].copy())
+        return np.array([[0.9]], dtype=np.float32), feeds["state"] + 1
+
+    streamer._vad_session = MagicMock()
+    streamer._vad_session.run.side_effect = fake_run
+    streamer._speech_threshold = 0.5
+
+    chunk = np.arange(1100, dtype=np.float32)
+
+    assert streamer._detect_speech(chunk) is True
+    assert len(inputs) == 2  # 1100 samples -> 2 ventanas + 76 de sobrante
+    assert len(streamer._vad_carry) == 1100 - 1024
+    np.testing.assert_array_equal(inputs[1][0, :VAD_CONTEXT_SAMPLES], chunk[512 - VAD_CONTEXT_SAMPLES : 512])
+    assert streamer._vad_state[0, 0, 0] == 2.0
+
+
+def test_segment_buffer_grows_and_returns_view(mock_worker, mock_session):
+    """Test that the segment buffer is appended in place and grows past its capacity."""
+    streamer = StreamingTranscriber(mock_worker, mock_session, create_mock_recorder([]))
+    streamer._seg_buf = np.empty(1000, dtype=np.float32)
+
+    streamer._append_to_segment(np.full(600, 1.0, dtype=np.float32))
+    streamer._append_to_segment(np.full(600, 2.0, dtype=np.float32))
+
+    audio = streamer._segment_audio()
+    assert len(audio) == 1200
+    assert audio[599] == 1.0 and audio[1199] == 2.0
+    assert np.shares_memory(audio, streamer._seg_buf)
+
+
+def test_read_windows_never_alias(mock_worker, mock_session):
+    """Test that Producer read windows are carved from the slab without reuse."""
+    from v2m.features.audio.streaming_transcriber import READ_SLAB_BATCHES
+
+    streamer = StreamingTranscriber(mock_worker, mock_session, create_mock_recorder([]))
+    windows = []
+    for _ in range(READ_SLAB_BATCHES + 2):
+        out = streamer._next_read_window()
+        streamer._read_pos += len(out)
+        windows.append(out)
+
+    # El slab se renovó al agotarse y ninguna vista comparte memoria con otra
+    assert windows[-1].base is not windows[0].base
+    for a, b in itertools.combinations(windows, 2):
+        assert not np.shares_memory(a, b)
+
+
+def test_drain_recorder_stops_on_short_read(mock_worker, mock_session):
+    """Test that the Producer drains full batches and stops at the first short read."""
+    streamer = StreamingTranscriber(mock_worker, mock_session, create_mock_recorder([]))
+    full = streamer._read_batch_samples
+    reads = iter([full, full, 100, full])
+    streamer.recorder.read_chunk_into = MagicMock(side_effect=lambda out: next(reads))
+
+    streamer._drain_recorder()
+
+    # Dos lotes completos + uno parcial; la cuarta lectura no se intenta
+    assert [len(c) for c in streamer._audio_queue.pop_batch(8)] == [full, full, 100]
+    assert streamer.recorder.read_chunk_into.call_count == 3
+
+
+async def test_inference_kwargs_are_precomputed(mock_worker, mock_session):
+    """Test that transcribe() receives the frozen per-mode kwargs plus the prompt."""
+    streamer = StreamingTranscriber(mock_worker, mock_session, create_mock_recorder([]))
+    model = MagicMock()
+    model.transcribe.return_value = (iter([]), MagicMock())
+
+    async def run_inference(func):
+        return func(model)
+
+    streamer.worker.submit_latest = run_inference
+    await streamer._infer_provisional(_generate_speech_chunk(1600))
+
+    _, kwargs = model.transcribe.call_args
+    assert kwargs == {"initial_prompt": None, **streamer._prov_kw}
+    assert kwargs["beam_size"] == 1
+    with pytest.raises(TypeError):
+        streamer._final_kw["beam_size"] = 1
+
+
+async def test_provisional_prefix_extends_prompt(mock_worker, mock_session):
+    """Test that the frozen provisional prefix is appended to the (bounded) prompt."""
+    from v2m.features.audio.streaming_transcriber import CONTEXT_WINDOW_CHARS
+
+    streamer = StreamingTranscriber(mock_worker, mock_session, create_mock_recorder([]))
+    streamer._update_context_window("contexto previo")
+    model = MagicMock()
+    model.transcribe.return_value = (iter([]), MagicMock())
+
+    async def run_inference(func):
+        return func(model)
+
+    streamer.worker.submit_latest = run_inference
+    await streamer._infer_provisional(_generate_speech_chunk(1600), "hola " * 100)
+
+    prompt = model.transcribe.call_args.kwargs["initial_prompt"]
+    assert len(prompt) <= CONTEXT_WINDOW_CHARS
+    assert prompt.endswith("hola")
+
+
+def test_pre_roll_tracks_samples_and_fills_segment(mock_worker, mock_session):
+    """Test that the pre-roll keeps a running sample total and is copied in order."""
+    from v2m.features.audio.streaming_transcriber import PRE_ROLL_CHUNKS
+
+    streamer = StreamingTranscriber(mock_worker, mock_session, create_mock_recorder([]))
+    chunks = [np.full(100 + i, i, dtype=np.float32) for i in range(PRE_ROLL_CHUNKS + 2)]
+    for chunk in chunks:
+        streamer._pre_roll_buffer.append(chunk)
+
+    kept = chunks[-PRE_ROLL_CHUNKS:]
+    assert streamer._pre_roll_buffer.samples_total == sum(c.size for c in kept)
+
+    streamer._append_pre_roll()
+    np.testing.assert_array_equal(streamer._segment_audio(), np.concatenate(kept))
+
+
+def test_silence_floor_skips_silero(mock_worker, mock_session):
+    """Test that chunks below the amplitude floor never reach the Silero session."""
+    streamer = StreamingTranscriber(mock_worker, mock_session, create_mock_recorder([]))
+    streamer._vad_session = MagicMock()
+    streamer._vad_session.run.return_value = (np.array([[0.9]], dtype=np.float32), streamer._vad_state)
+    streamer._speech_threshold = 0.5
+
+    assert streamer._detect_speech(np.full(1024, 0.001, dtype=np.float32)) is False
+    streamer._vad_session.run.assert_not_called()
+
+    assert streamer._detect_speech(_generate_speech_chunk(1024)) is True
+    assert streamer._vad_session.run.call_count == 2
+
+    # Volver al silencio reinicia el stream de Silero (ya no es contiguo)
+    streamer._vad_state.fill(1.0)
+    assert streamer._detect_speech(_generate_silence_chunk(1024)) is False
+    assert not streamer._vad_state.any()
+
+
+async def test_long_final_segment_uses_batched_transcribe(mock_worker, mock_session):
+    """Test that segments longer than a Whisper window go through worker.transcribe when batching."""
+    from v2m.features.audio.streaming_transcriber import WHISPER_WINDOW_SAMPLES
+
+    streamer = StreamingTranscriber(mock_worker, mock_session, create_mock_recorder([]))
+    streamer._batch_long_finals = True
+    segment = MagicMock()
+    segment.text = " texto largo"
+    streamer.worker.transcribe = AsyncMock(return_value=([segment], MagicMock()))
+    streamer.worker.run_inference = AsyncMock(return_value=([segment], MagicMock()))
+
+    assert await streamer._infer_final(_generate_speech_chunk(WHISPER_WINDOW_SAMPLES + 1600)) == "texto largo"
+    streamer.worker.transcribe.assert_awaited_once()
+    assert streamer.worker.transcribe.call_args.kwargs["beam_size"] == streamer._final_kw["beam_size"]
+
+    await streamer._infer_final(_generate_speech_chunk(16000))
+    streamer.worker.run_inference.assert_awaited_once()
@@ -0,0 +1,17 @@
+"""Pruebas unitarias de las utilidades de texto."""
+
+from v2m.shared.utils.text import preview
+
+
+def test_preview_keeps_short_text_untouched() -> None:
+    """Un texto que cabe se devuelve sin "..." (y es el mismo objeto)."""
+    text = "hola mundo"
+
+    assert preview(text) is text
+    assert preview("x" * 80) == "x" * 80
+
+
+def test_preview_truncates_long_text() -> None:
+    """Un texto largo se recorta al límite y se marca con "..."."""
+    assert preview("x" * 81) == "x" * 80 + "..."
+    assert preview("abcdef", limit=3) == "abc..."